@@ -0,0 +1,268 @@
+"""
+SPECTRA Component D — Cross-worker WebSocket broadcast bus (WS_BUS_ENABLED=true).
+
+Lets Component A and Component C sit on different uvicorn workers / nodes:
+  • One Redis pub/sub channel per session (session:{id}:ws); a worker is
+    subscribed while it holds at least one local socket for the session
+  • Every broadcast is delivered to local sockets directly, then published
+    with this worker's id and the message type (so receivers never re-parse
+    the payload); receivers deliver to their own sockets only and ignore
+    their own messages
+  • Workers announce join / leave on the channel (and answer joins with
+    "here"), so each worker knows which sessions have remote sockets and
+    skips the bus when all of a session's connections are local
+  • Redis down → local delivery only; the reader replaces a dropped pub/sub
+    connection, re-subscribes every joined session and re-announces this
+    worker once Redis answers again
+
+No ws_handler import — the local delivery callable is passed to start().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app import redis_client
+
+logger = logging.getLogger("spectra.bus")
+
+WORKER_ID = settings.worker_id or uuid.uuid4().hex[:12]
+
+# Reader poll timeout (also bounds how long stop() can wait for the reader)
+_POLL_S = 1.0
+
+_MSG = "msg"
+_JOIN = "join"
+_HERE = "here"
+_LEAVE = "leave"
+
+# session_id → ids of other workers holding sockets for it (only tracked for
+# sessions this worker is subscribed to)
+_remote: dict[str, set[str]] = {}
+
+# Sessions with at least one local socket, updated synchronously by join() /
+# leave() — a scheduled _leave() re-checks it so a quick reconnect wins
+_local: set[str] = set()
+
+# deliver(session_id, msg_type, payload)
+_deliver: Optional[Callable[[str, str, str], Awaitable[None]]] = None
+_pubsub: Optional[aioredis.client.PubSub] = None
+_reader: Optional[asyncio.Task] = None
+_lock = asyncio.Lock()
+
+
+def enabled() -> bool:
+    return settings.ws_bus_enabled and _deliver is not None
+
+
+def _channel(session_id: str) -> str:
+    return f"session:{session_id}:ws"
+
+
+def _session_of(channel: str) -> str:
+    return channel.split(":", 2)[1]
+
+
+def _envelope(kind: str, payload: str = "") -> str:
+    return f"{WORKER_ID}\n{kind}\n{payload}"
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle
+# ---------------------------------------------------------------------------
+
+async def start(deliver: Callable[[str, str, str], Awaitable[None]]) -> None:
+    """Enable the bus. ``deliver(session_id, msg_type, payload)`` queues to local sockets."""
+    global _deliver
+    if not settings.ws_bus_enabled:
+        return
+    _deliver = deliver
+    logger.info("Broadcast bus enabled (worker %s)", WORKER_ID)
+
+
+async def stop() -> None:
+    global _deliver, _pubsub, _reader
+    if _pubsub is not None:
+        for session_id in list(_remote):
+            await _publish(session_id, _envelope(_LEAVE))
+    # Detach first: a cancel that lands inside redis-py's read timeout can be
+    # swallowed, and the reader also exits once it sees _pubsub is gone.
+    pubsub, _pubsub = _pubsub, None
+    if _reader is not None:
+        _reader.cancel()
+        try:
+            await _reader
+        except (asyncio.CancelledError, Exception):
+            pass
+        _reader = None
+    await _close_quietly(pubsub)
+    _remote.clear()
+    _local.clear()
+    _deliver = None
+
+
+# ---------------------------------------------------------------------------
+# Membership (called by ws_handler on first / last local socket)
+# ---------------------------------------------------------------------------
+
+async def join(session_id: str) -> None:
+    """Subscribe to the session channel and announce this worker."""
+    global _pubsub
+    if not enabled():
+        return
+    _local.add(session_id)
+    if session_id in _remote:
+        return
+    async with _lock:
+        if session_id in _remote or session_id not in _local:
+            return
+        if _pubsub is None:
+            _pubsub = redis_client.pubsub()
+            if _pubsub is None:
+                return
+        try:
+            await _pubsub.subscribe(_channel(session_id))
+        except Exception as exc:
+            logger.warning("Bus subscribe failed for %s: %s", session_id, exc)
+            return
+        _remote[session_id] = set()
+        _ensure_reader()
+    await _publish(session_id, _envelope(_JOIN))
+
+
+def leave(session_id: str) -> None:
+    """Unsubscribe once the last local socket is gone (scheduled, non-blocking)."""
+    _local.discard(session_id)
+    if session_id in _remote:
+        asyncio.get_running_loop().create_task(_leave(session_id))
+
+
+async def _leave(session_id: str) -> None:
+    async with _lock:
+        # A socket for the session may have connected since leave() was called
+        if session_id in _local or _remote.pop(session_id, None) is None or _pubsub is None:
+            return
+        try:
+            await _pubsub.unsubscribe(_channel(session_id))
+        except Exception as exc:
+            logger.debug("Bus unsubscribe failed for %s: %s", session_id, exc)
+        # Inside the lock, so a re-join's announcement can't overtake it
+        await _publish(session_id, _envelope(_LEAVE))
+
+
+def needs_publish(session_id: str) -> bool:
+    """False when every connection for the session is on this worker."""
+    if not enabled():
+        return False
+    remote = _remote.get(session_id)
+    # Not subscribed → no local sockets; other workers may have some.
+    return remote is None or bool(remote)
+
+
+# ---------------------------------------------------------------------------
+# Publish / receive
+# ---------------------------------------------------------------------------
+
+async def publish(session_id: str, msg_type: str, payload: str) -> None:
+    """Fan a serialised WS message out to the other workers."""
+    await _publish(session_id, _envelope(_MSG, f"{msg_type}\n{payload}"))
+
+
+async def _publish(session_id: str, data: str) -> None:
+    await redis_client.publish(_channel(session_id), data)
+
+
+def _ensure_reader() -> None:
+    global _reader
+    if _reader is None or _reader.done():
+        _reader = asyncio.create_task(_read_loop())
+
+
+async def _read_loop() -> None:
+    while True:
+        try:
+            while _pubsub is not None and _pubsub.subscribed:
+                message = await _pubsub.get_message(timeout=_POLL_S)
+                if message is None or message.get("type") != "message":
+                    continue
+                try:
+                    await _handle(_session_of(message["channel"]), message["data"])
+                except Exception:
+                    logger.exception("Bus message handling failed")
+            return  # nothing subscribed — join() starts a new reader
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Bus reader lost its Redis connection (%s) — re-subscribing", exc)
+        await _resubscribe()
+
+
+async def _resubscribe() -> None:
+    """Replace the dead PubSub and re-subscribe every joined session.
+
+    Retries every REDIS_PROBE_INTERVAL_MS until Redis accepts the
+    subscription (i.e. once the breaker's probe would close it again),
+    then re-announces this worker so remote membership is re-learned.
+    """
+    global _pubsub
+    interval = settings.redis_probe_interval_ms / 1000
+    while True:
+        await asyncio.sleep(interval)
+        async with _lock:
+            old = _pubsub
+            sessions = list(_remote)
+            if not sessions:
+                _pubsub = None
+                await _close_quietly(old)
+                return
+            fresh = redis_client.pubsub()
+            if fresh is None:
+                continue
+            try:
+                await fresh.subscribe(*(_channel(s) for s in sessions))
+            except Exception as exc:
+                logger.debug("Bus re-subscribe failed: %s", exc)
+                await _close_quietly(fresh)
+                continue
+            _pubsub = fresh
+            for session_id in sessions:
+                _remote[session_id] = set()
+        await _close_quietly(old)
+        logger.info("Bus re-subscribed %d sessions", len(sessions))
+        for session_id in sessions:
+            await _publish(session_id, _envelope(_JOIN))
+        return
+
+
+async def _close_quietly(pubsub: Optional[aioredis.client.PubSub]) -> None:
+    if pubsub is None:
+        return
+    try:
+        await pubsub.aclose()
+    except Exception:
+        pass
+
+
+async def _handle(session_id: str, data: str) -> None:
+    origin, kind, payload = data.split("\n", 2)
+    if origin == WORKER_ID:
+        return
+    remote = _remote.get(session_id)
+    if kind == _MSG:
+        msg_type, payload = payload.split("\n", 1)
+        await _deliver(session_id, msg_type, payload)
+    elif remote is None:
+        return
+    elif kind == _JOIN:
+        remote.add(origin)
+        await _publish(session_id, _envelope(_HERE))
+    elif kind == _HERE:
+        remote.add(origin)
+    elif kind == _LEAVE:
+        remote.discard(origin)
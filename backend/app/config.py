@@ -15,6 +15,10 @@ class Settings(BaseSettings):
 
     # Component B (ORACLE brain)
     component_b_url: str = "http://localhost:8001"
+    # Stream Contract 3 from Component B (/api/oracle/respond/stream):
+    # oracle_speech_partial is broadcast per completed sentence and
+    # ui_commands are pushed as soon as they parse.
+    oracle_streaming: bool = False
 
     # CORS — comma-separated origins
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
@@ -33,6 +37,64 @@ class Settings(BaseSettings):
     # Game
     game_duration: int = 300  # overridden to 90 when demo_mode is True
 
+    # Game clock: "countdown" persists time_remaining every second;
+    # "deadline" stores an absolute epoch deadline once at /start and
+    # derives time_remaining on read.
+    timer_mode: str = "countdown"
+
+    # Per-session actors: in-memory authoritative GameState, ordered mailbox,
+    # write-behind persistence to Redis.
+    actor_mode: bool = False
+    actor_mailbox_size: int = 256
+    actor_flush_interval_ms: int = 500
+    actor_idle_timeout: int = 300  # seconds without events before an actor stops
+
+    # Write-behind GameState cache (used when actor_mode is off): dirty
+    # sessions are flushed together at most every state_cache_flush_ms.
+    state_cache_enabled: bool = False
+    state_cache_flush_ms: int = 250
+    state_cache_idle_timeout: int = 120  # seconds before an idle session is evicted
+
+    # Contract 4 timeline storage: "zset" (JSON members scored by t) or
+    # "stream" (XADD capped at timeline_max_entries, compact fields,
+    # adaptations kept in a hash keyed by stream entry ID).
+    timeline_backend: str = "zset"
+    timeline_max_entries: int = 2000
+
+    # Redis circuit breaker: consecutive connection failures / timeouts before
+    # failing over to the in-memory store, health-probe interval, and the
+    # per-command socket timeout that bounds how long one failure can take.
+    redis_breaker_failures: int = 2
+    redis_probe_interval_ms: int = 1000
+    redis_timeout_ms: int = 500
+
+    # Per-connection outbound WS queue: messages queued per socket before it
+    # is treated as a slow consumer, and the longest a single send may take.
+    ws_send_queue_size: int = 64
+    ws_send_timeout: float = 5.0
+
+    # Speech turns: one in flight per session. Speech arriving mid-turn is
+    # queued (FIFO of turn_queue_size, oldest dropped), merged into one turn,
+    # or superseded by the newest; with merge / supersede it can also cancel
+    # a turn still waiting on Component B.
+    turn_policy: str = "merge"
+    turn_queue_size: int = 4
+    turn_cancel_in_flight: bool = True
+
+    # Max emotion_update broadcasts per second per session; frames arriving
+    # faster are coalesced (newest wins). 0 = forward every frame.
+    emotion_update_max_hz: float = 4.0
+
+    # Cross-worker WebSocket broadcast over Redis pub/sub — needed when
+    # running more than one uvicorn worker / node. worker_id defaults to a
+    # random id per process.
+    ws_bus_enabled: bool = False
+    worker_id: str = ""
+
+    # In-memory fallback (Redis down): sessions expire after session_ttl and
+    # the least recently used are evicted beyond this count.
+    memory_store_max_sessions: int = 1000
+
     # Tavus CVI
     tavus_api_key: str = ""
     tavus_persona_id: str = "p53b88f7ef1e"
@@ -49,6 +111,14 @@ class Settings(BaseSettings):
     def cors_origin_list(self) -> list[str]:
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
 
+    @property
+    def deadline_clock(self) -> bool:
+        return self.timer_mode.lower() == "deadline"
+
+    @property
+    def timeline_stream(self) -> bool:
+        return self.timeline_backend.lower() == "stream"
+
     @property
     def effective_game_duration(self) -> int:
         return 90 if self.demo_mode else self.game_duration
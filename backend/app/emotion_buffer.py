@@ -0,0 +1,192 @@
+"""
+SPECTRA Component D — Array-backed emotion ring buffer.
+
+Replaces the ``list[EmotionSignal]`` window kept for Contract 2 snapshots:
+  • Fixed-capacity float arrays per emotion plus timestamps — no list copies
+    on overflow, no pydantic objects held per frame
+  • Running sums per emotion, so window means (avg_stress_30s) are O(1)
+  • Index access from the newest frame, so the 3-vs-3 trend windows are O(1)
+  • Compact text form (one ``ts,stress,focus,confusion,confidence,neutral,
+    dominant,face`` record per frame) for persistence
+
+Frames go in as EmotionSignal objects and come out as Contract 1 dicts; the
+module deliberately has no app imports.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterator, Optional
+
+FIELDS: tuple[str, ...] = ("stress", "focus", "confusion", "confidence", "neutral")
+
+# Maximum readings kept in the buffer (≈ 30 seconds at 1 reading/s)
+BUFFER_SIZE = 30
+
+_FRAME_SEP = ";"
+_VALUE_SEP = ","
+
+
+def _num(value: float) -> str:
+    # Shortest repr that round-trips exactly: a reloaded window must give
+    # the same means and trends as the one that was saved.
+    return repr(float(value))
+
+
+def encode_frame(signal: Any) -> str:
+    """Compact one-line record for a single Contract 1 frame (EmotionSignal)."""
+    e = signal.emotions
+    return _VALUE_SEP.join((
+        str(signal.timestamp),
+        *(_num(getattr(e, name)) for name in FIELDS),
+        signal.dominant,
+        "1" if signal.face_detected else "0",
+    ))
+
+
+def decode_frame(record: str) -> dict[str, Any]:
+    """Inverse of :func:`encode_frame`, as a Contract 1 dict."""
+    ts, *values, dominant, face = record.split(_VALUE_SEP)
+    return _frame_dict(int(ts), [float(v) for v in values], dominant, face == "1")
+
+
+def _frame_dict(ts: int, values: list[float], dominant: str, face: bool) -> dict[str, Any]:
+    return {
+        "timestamp": ts,
+        "emotions": dict(zip(FIELDS, values)),
+        "dominant": dominant,
+        "face_detected": face,
+    }
+
+
+class EmotionRingBuffer:
+    """Fixed-capacity window of the most recent emotion frames."""
+
+    def __init__(self, capacity: int = BUFFER_SIZE) -> None:
+        self.capacity = capacity
+        self._ts = array("q", bytes(8 * capacity))
+        self._values = {name: array("d", bytes(8 * capacity)) for name in FIELDS}
+        self._sums = dict.fromkeys(FIELDS, 0.0)
+        self._dominant: list[str] = [""] * capacity
+        self._face = array("b", bytes(capacity))
+        self._head = 0  # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Oldest → newest, as Contract 1 dicts."""
+        for back in range(self._size - 1, -1, -1):
+            yield self._frame_at(self._index(back))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EmotionRingBuffer):
+            return NotImplemented
+        return self.dumps() == other.dumps()
+
+    def __repr__(self) -> str:
+        return f"EmotionRingBuffer(size={self._size}, capacity={self.capacity})"
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def push(self, signal: Any) -> None:
+        """Append an EmotionSignal, overwriting the oldest frame when full."""
+        e = signal.emotions
+        self._push(
+            signal.timestamp,
+            [getattr(e, name) for name in FIELDS],
+            signal.dominant,
+            signal.face_detected,
+        )
+
+    def _push(self, ts: int, values: list[float], dominant: str, face: bool) -> None:
+        i = self._head
+        full = self._size == self.capacity
+        for name, value in zip(FIELDS, values):
+            column = self._values[name]
+            if full:
+                self._sums[name] -= column[i]
+            self._sums[name] += value
+            column[i] = value
+        self._ts[i] = ts
+        self._dominant[i] = dominant
+        self._face[i] = 1 if face else 0
+        self._head = (i + 1) % self.capacity
+        if not full:
+            self._size += 1
+        if self._head == 0:
+            # Once per lap, re-sum exactly so float drift stays bounded.
+            for name in FIELDS:
+                self._sums[name] = sum(self._values[name][: self._size])
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self._sums = dict.fromkeys(FIELDS, 0.0)
+
+    # ------------------------------------------------------------------
+    # O(1) statistics
+    # ------------------------------------------------------------------
+
+    def mean(self, name: str) -> float:
+        """Mean of ``name`` over the whole window (running sum)."""
+        if not self._size:
+            return 0.0
+        return self._sums[name] / self._size
+
+    def recent_mean(self, name: str, count: int, offset: int = 0) -> float:
+        """Mean of ``count`` frames ending ``offset`` frames before the newest."""
+        column = self._values[name]
+        return sum(column[self._index(offset + k)] for k in range(count)) / count
+
+    def last(self) -> Optional[dict[str, Any]]:
+        return self._frame_at(self._index(0)) if self._size else None
+
+    # ------------------------------------------------------------------
+    # Compact serialisation
+    # ------------------------------------------------------------------
+
+    def dumps(self) -> str:
+        records = []
+        for back in range(self._size - 1, -1, -1):
+            i = self._index(back)
+            records.append(_VALUE_SEP.join((
+                str(self._ts[i]),
+                *(_num(self._values[name][i]) for name in FIELDS),
+                self._dominant[i],
+                str(self._face[i]),
+            )))
+        return _FRAME_SEP.join(records)
+
+    @classmethod
+    def loads(cls, data: str, capacity: int = BUFFER_SIZE) -> "EmotionRingBuffer":
+        buf = cls(capacity)
+        for record in data.split(_FRAME_SEP) if data else ():
+            ts, *values, dominant, face = record.split(_VALUE_SEP)
+            buf._push(int(ts), [float(v) for v in values], dominant, face == "1")
+        return buf
+
+    @classmethod
+    def from_records(cls, records: list[str], capacity: int = BUFFER_SIZE) -> "EmotionRingBuffer":
+        """Build from :func:`encode_frame` records, oldest first."""
+        return cls.loads(_FRAME_SEP.join(records[-capacity:]), capacity)
+
+    # ------------------------------------------------------------------
+
+    def _index(self, back: int) -> int:
+        """Array index of the frame ``back`` steps before the newest."""
+        return (self._head - 1 - back) % self.capacity
+
+    def _frame_at(self, i: int) -> dict[str, Any]:
+        return _frame_dict(
+            self._ts[i],
+            [self._values[name][i] for name in FIELDS],
+            self._dominant[i],
+            bool(self._face[i]),
+        )
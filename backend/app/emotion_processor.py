@@ -2,9 +2,10 @@
 SPECTRA Component D — Emotion processing.
 
 Responsibilities:
-  • Maintain a rolling buffer of the last 30 emotion readings (~30 s)
+  • Summarise the last 30 emotion readings (~30 s), kept outside GameState
+    in session:{id}:emotion and loaded as a ring buffer (emotion_buffer.py)
   • Compute trend  (rising_stress / falling_stress / rising_focus / falling_focus / stable)
-  • Compute avg_stress_30s
+  • Compute avg_stress_30s  (O(1) from the buffer's running sums)
   • Detect adaptation type by diffing old vs. new UI commands
   • Build Contract 4 timeline entries
 """
@@ -14,13 +15,13 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from app.emotion_buffer import EmotionRingBuffer
 from app.models import (
     AdaptationType,
     Complexity,
     EmotionSignal,
     EmotionSnapshot,
     EmotionTrend,
-    GameState,
     Phase,
     PreviousUIState,
     TimelineEntry,
@@ -30,9 +31,6 @@ from app.models import (
 
 logger = logging.getLogger("spectra.emotion")
 
-# Maximum readings kept in the buffer (≈ 30 seconds at 1 reading/s)
-BUFFER_SIZE = 30
-
 # Number of recent readings used for trend calculation
 TREND_WINDOW = 5
 
@@ -41,26 +39,14 @@ TREND_THRESHOLD = 0.1
 
 
 class EmotionProcessor:
-    """Stateless helper — operates on the emotion_buffer inside GameState."""
-
-    # ------------------------------------------------------------------
-    # Buffer management
-    # ------------------------------------------------------------------
-
-    @staticmethod
-    def push_to_buffer(state: GameState, signal: EmotionSignal) -> None:
-        """Append a reading to the buffer, trimming to BUFFER_SIZE."""
-        state.emotion_buffer.append(signal)
-        if len(state.emotion_buffer) > BUFFER_SIZE:
-            state.emotion_buffer = state.emotion_buffer[-BUFFER_SIZE:]
-        state.last_emotion = signal
+    """Stateless helper — operates on a session's emotion window."""
 
     # ------------------------------------------------------------------
     # Trend computation
     # ------------------------------------------------------------------
 
     @staticmethod
-    def compute_trend(buffer: list[EmotionSignal]) -> EmotionTrend:
+    def compute_trend(buffer: EmotionRingBuffer) -> EmotionTrend:
         """Compare readings [0-2] vs [2-4] of the last TREND_WINDOW readings.
 
         Uses overlapping windows per spec: first 3 readings vs last 3 readings
@@ -73,18 +59,12 @@ class EmotionProcessor:
         if len(buffer) < TREND_WINDOW:
             return EmotionTrend.stable
 
-        window = buffer[-TREND_WINDOW:]
-        # Spec: compare readings [0-2] vs [2-4]
-        first_half = window[:3]   # indices 0, 1, 2
-        second_half = window[2:]  # indices 2, 3, 4
-
-        first_stress = sum(r.emotions.stress for r in first_half) / len(first_half)
-        second_stress = sum(r.emotions.stress for r in second_half) / len(second_half)
-        stress_delta = second_stress - first_stress
-
-        first_focus = sum(r.emotions.focus for r in first_half) / len(first_half)
-        second_focus = sum(r.emotions.focus for r in second_half) / len(second_half)
-        focus_delta = second_focus - first_focus
+        # Spec: compare readings [0-2] vs [2-4] of the window, i.e. the 3
+        # newest readings vs the 3 ending two readings earlier.
+        half = 3
+        offset = TREND_WINDOW - half
+        stress_delta = buffer.recent_mean("stress", half) - buffer.recent_mean("stress", half, offset)
+        focus_delta = buffer.recent_mean("focus", half) - buffer.recent_mean("focus", half, offset)
 
         # Stress takes priority over focus
         if stress_delta > TREND_THRESHOLD:
@@ -103,22 +83,21 @@ class EmotionProcessor:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def compute_avg_stress(buffer: list[EmotionSignal]) -> float:
+    def compute_avg_stress(buffer: EmotionRingBuffer) -> float:
         """Mean stress over the full buffer (up to 30 s)."""
-        if not buffer:
-            return 0.0
-        return sum(r.emotions.stress for r in buffer) / len(buffer)
+        return buffer.mean("stress")
 
     # ------------------------------------------------------------------
     # Build EmotionSnapshot (for Contract 2)
     # ------------------------------------------------------------------
 
     @classmethod
-    def build_snapshot(cls, state: GameState) -> EmotionSnapshot:
+    def build_snapshot(cls, buffer: EmotionRingBuffer) -> EmotionSnapshot:
+        last = buffer.last()
         return EmotionSnapshot(
-            current=state.last_emotion,
-            trend=cls.compute_trend(state.emotion_buffer),
-            avg_stress_30s=round(cls.compute_avg_stress(state.emotion_buffer), 4),
+            current=EmotionSignal.model_validate(last) if last else None,
+            trend=cls.compute_trend(buffer),
+            avg_stress_30s=round(cls.compute_avg_stress(buffer), 4),
         )
 
     # ------------------------------------------------------------------
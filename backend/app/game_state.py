@@ -6,28 +6,32 @@ Manages per-session state:
   • Phase transitions  (infiltrate → vault → escape → debrief)
   • Score updates
   • Conversation history
-  • Timer lifecycle (async background task per session)
+  • Timer lifecycle (shared timer wheel, see timer_wheel.py)
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import time
 import uuid
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from app.config import settings
 from app.models import ConversationEntry, GameState, GameUpdate, Phase
 from app import redis_client
+from app import session_actor
+from app import state_cache
+from app.timer_wheel import TimerScheduler
 
 logger = logging.getLogger("spectra.game")
 
+T = TypeVar("T")
+
 # Phase ordering for transitions
 PHASE_ORDER: list[Phase] = [Phase.infiltrate, Phase.vault, Phase.escape, Phase.debrief]
 
-# Keeps track of running timer tasks so they can be cancelled on session end
-_timer_tasks: dict[str, asyncio.Task] = {}
-
 
 # ---------------------------------------------------------------------------
 # Session CRUD
@@ -40,17 +44,81 @@ async def create_session() -> GameState:
         session_id=session_id,
         time_remaining=settings.effective_game_duration,
     )
-    await redis_client.save_game_state(state)
+    await save_state(state)
     logger.info("Session created: %s (duration=%ds)", session_id, state.time_remaining)
     return state
 
 
 async def get_state(session_id: str) -> Optional[GameState]:
+    """Read-only view of a session's state.
+
+    In actor / cache mode this is a copy of the in-memory state, so callers
+    must go through :func:`update_state` to change anything.
+    """
+    if settings.actor_mode:
+        state = session_actor.peek_state(session_id)
+        if state is not None:
+            return state
+    elif settings.state_cache_enabled:
+        return await state_cache.get(session_id)
     return await redis_client.load_game_state(session_id)
 
 
 async def save_state(state: GameState) -> None:
-    await redis_client.save_game_state(state)
+    if settings.state_cache_enabled and not settings.actor_mode:
+        await state_cache.put(state)
+    else:
+        await redis_client.save_game_state(state)
+
+
+async def update_state(
+    session_id: str,
+    fn: Callable[[GameState], T],
+    batch: Optional[redis_client.WriteBatch] = None,
+) -> Optional[T]:
+    """Apply ``fn`` to the session's state, persist it and return fn's result.
+
+    In actor mode ``fn`` runs inside the session actor (ordered, write-behind);
+    with the state cache it mutates the cached object and marks it dirty;
+    otherwise this is a plain load → mutate → save, where the save joins
+    ``batch`` if one is given.  Returns None if the session does not exist.
+    """
+    if settings.actor_mode:
+        return await session_actor.call(session_id, fn)
+    if settings.state_cache_enabled:
+        state = await state_cache.get_live(session_id)
+        if state is None:
+            return None
+        result = fn(state)
+        await state_cache.mark_dirty(session_id)
+        return result
+    state = await redis_client.load_game_state(session_id)
+    if state is None:
+        return None
+    result = fn(state)
+    if batch is not None:
+        batch.save_game_state(state)
+    else:
+        await redis_client.save_game_state(state)
+    return result
+
+
+def time_remaining(state: GameState) -> int:
+    """Seconds left on the game clock.
+
+    In deadline mode this is derived from ``state.deadline``; otherwise the
+    persisted ``time_remaining`` countdown is authoritative.
+    """
+    if state.deadline is not None:
+        return max(0, math.ceil(state.deadline - time.time()))
+    return state.time_remaining
+
+
+def freeze_clock(state: GameState) -> None:
+    """Stop a deadline clock: store what was left and clear the deadline."""
+    if state.deadline is not None:
+        state.time_remaining = time_remaining(state)
+        state.deadline = None
 
 
 # ---------------------------------------------------------------------------
@@ -72,6 +140,7 @@ def advance_phase(state: GameState) -> Phase:
     logger.info("Session %s advanced to phase: %s", state.session_id, state.phase.value)
     if state.phase == Phase.debrief:
         state.is_active = False
+        freeze_clock(state)
     return state.phase
 
 
@@ -103,51 +172,116 @@ def add_to_history(state: GameState, role: str, text: str) -> None:
 # Timer
 # ---------------------------------------------------------------------------
 
+# session_id → epoch deadline for sessions timed in deadline mode
+_deadlines: dict[str, float] = {}
+
+
+async def _tick_batch(remaining: dict[str, int]) -> dict[str, int]:
+    """Persist one second of countdown for every timed session at once.
+
+    Returns the sessions that are still active with their remaining seconds;
+    the scheduler drops the rest. In deadline mode nothing is written — the
+    remaining time is derived from the stored deadline and the session ends
+    via ``stop_timer`` or expiry. If the batched read fails, every session
+    is kept and this second is not persisted.
+    """
+    if settings.deadline_clock:
+        now = time.time()
+        return {
+            session_id: (
+                max(0, math.ceil(_deadlines[session_id] - now))
+                if session_id in _deadlines
+                else seconds
+            )
+            for session_id, seconds in remaining.items()
+        }
+
+    if settings.actor_mode or settings.state_cache_enabled:
+        def _tick(seconds: int) -> Callable[[GameState], bool]:
+            def apply(state: GameState) -> bool:
+                if not state.is_active:
+                    return False
+                state.time_remaining = seconds
+                state.is_active = seconds > 0
+                return True
+            return apply
+
+        ids = list(remaining)
+        results = await asyncio.gather(
+            *(update_state(sid, _tick(remaining[sid])) for sid in ids)
+        )
+        return {sid: remaining[sid] for sid, ok in zip(ids, results) if ok}
+
+    states = await redis_client.load_game_states(list(remaining))
+    if states is None:
+        logger.warning("Timer tick not persisted for %d sessions (state read failed)", len(remaining))
+        return dict(remaining)
+    alive: list[GameState] = []
+    for session_id, state in states.items():
+        if not state.is_active:
+            continue
+        state.time_remaining = remaining[session_id]
+        if state.time_remaining <= 0:
+            state.is_active = False
+        alive.append(state)
+    await redis_client.save_game_states(alive)
+    return {s.session_id: remaining[s.session_id] for s in alive}
+
+
+_scheduler = TimerScheduler(_tick_batch)
+
+
+def _forgetting_deadline(on_end):
+    """Wrap ``on_end`` so a deadline timer that runs out drops its entry."""
+    async def end(session_id: str) -> None:
+        _deadlines.pop(session_id, None)
+        await on_end(session_id)
+    return end
+
+
 async def start_timer(
     session_id: str,
     on_tick,
     on_end,
 ) -> None:
-    """Start a per-session background timer.
+    """Register a session with the shared timer scheduler.
 
     Args:
         session_id: the session to time.
         on_tick: async callback(session_id, time_remaining) called every second.
         on_end: async callback(session_id) called when timer hits 0.
     """
-    if session_id in _timer_tasks:
+    if session_id in _scheduler:
         logger.warning("Timer already running for session %s", session_id)
         return
-
-    async def _run() -> None:
-        logger.info("Timer started for session %s", session_id)
-        try:
-            while True:
-                await asyncio.sleep(1)
-                state = await get_state(session_id)
-                if state is None or not state.is_active:
-                    break
-                state.time_remaining = max(0, state.time_remaining - 1)
-                await save_state(state)
-                await on_tick(session_id, state.time_remaining)
-                if state.time_remaining <= 0:
-                    state.is_active = False
-                    await save_state(state)
-                    await on_end(session_id)
-                    break
-        except asyncio.CancelledError:
-            logger.info("Timer cancelled for session %s", session_id)
-        except Exception:
-            logger.exception("Timer error for session %s", session_id)
-        finally:
-            _timer_tasks.pop(session_id, None)
-
-    _timer_tasks[session_id] = asyncio.create_task(_run())
+    state = await get_state(session_id)
+    if state is None:
+        duration = settings.effective_game_duration
+    elif settings.deadline_clock:
+        def _set_deadline(s: GameState) -> float:
+            if s.deadline is None:
+                s.deadline = time.time() + s.time_remaining
+            return s.deadline
+
+        deadline = await update_state(session_id, _set_deadline)
+        if deadline is None:  # the session ended meanwhile
+            return
+        _deadlines[session_id] = deadline
+        duration = max(0, math.ceil(deadline - time.time()))
+        on_end = _forgetting_deadline(on_end)
+    else:
+        duration = state.time_remaining
+    _scheduler.add(session_id, duration, on_tick, on_end)
 
 
 async def stop_timer(session_id: str) -> None:
-    """Cancel the timer for a session if running."""
-    task = _timer_tasks.pop(session_id, None)
-    if task and not task.done():
-        task.cancel()
+    """Cancel the timer for a session if running (freezing a deadline clock)."""
+    if _deadlines.pop(session_id, None) is not None:
+        await update_state(session_id, freeze_clock)
+    if _scheduler.remove(session_id):
         logger.info("Timer stopped for session %s", session_id)
+
+
+async def close_timers() -> None:
+    """Stop the scheduler task. Called at FastAPI shutdown."""
+    await _scheduler.close()
@@ -8,18 +8,24 @@ SPECTRA Component D — FastAPI application entry point.
 
 from __future__ import annotations
 
-import json
 import logging
 import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
 from app.config import settings
-from app.models import EmotionSignal
+from app.models import EmotionSignal, WSEmotionBatch, WSSubscribe, WSUISync
+from app import broadcast_bus
+from app import game_state as gsm
 from app import orchestrator
 from app import redis_client
+from app import session_actor
+from app import state_cache
+from app import turn_scheduler
+from app import ws_codec
 from app import ws_handler
 from app.routes.session import router as session_router
 from app.routes.timeline import router as timeline_router
@@ -52,14 +58,23 @@ async def lifespan(app: FastAPI):
     logger.info("  REDIS_URL  = %s", settings.redis_url)
     logger.info("  COMP_B_URL = %s", settings.component_b_url)
     logger.info("  CORS       = %s", settings.cors_origin_list)
-    logger.info("  TIMER      = %ds", settings.effective_game_duration)
+    logger.info("  TIMER      = %ds (%s)", settings.effective_game_duration, settings.timer_mode)
+    logger.info("  ACTORS     = %s", settings.actor_mode)
+    logger.info("  STATE_CACHE= %s", settings.state_cache_enabled)
+    logger.info("  WS_BUS     = %s", settings.ws_bus_enabled)
     logger.info("=" * 60)
     await redis_client.init_redis()
+    await broadcast_bus.start(ws_handler.deliver_local)
     await orchestrator.init_http_client()
     yield
     # ---- shutdown ----
     logger.info("Shutting down …")
+    await gsm.close_timers()
+    await turn_scheduler.close_all()
+    await session_actor.close_all()
+    await state_cache.flush_all()
     await orchestrator.close_http_client()
+    await broadcast_bus.stop()
     await redis_client.close_redis()
 
 
@@ -94,7 +109,13 @@ app.include_router(llm_proxy_router)
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "mock_mode": settings.mock_mode, "demo_mode": settings.demo_mode}
+    return {
+        "status": "ok",
+        "mock_mode": settings.mock_mode,
+        "demo_mode": settings.demo_mode,
+        "redis": redis_client.health(),
+        "turns": turn_scheduler.stats(),
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -105,18 +126,30 @@ async def health():
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """Single WS endpoint for both Component A and Component C.
 
+    JSON text frames by default; clients offering the spectra.msgpack.v1
+    subprotocol send and receive MessagePack binary frames instead.
+
     Incoming message types:
       • emotion_data   → emotion processing pipeline
-      • player_speech  → orchestration loop
+      • emotion_batch  → same, several frames in one pipelined write
+      • player_speech  → orchestration loop (queued on the session's turn
+                         worker — this loop never waits for Component B)
+      • subscribe      → limit which outgoing types this socket receives
+      • ui_sync        → switch to ui_delta (full ui_update if behind)
     """
     await ws_handler.connect(session_id, websocket)
     try:
         while True:
-            raw = await websocket.receive_text()
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
             try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
-                logger.warning("Invalid JSON on WS from session %s", session_id)
+                msg = ws_codec.decode(frame)
+            except ValueError:
+                logger.warning("Invalid WS frame from session %s", session_id)
+                continue
+            if not isinstance(msg, dict):
+                logger.warning("Invalid WS message from session %s", session_id)
                 continue
 
             msg_type = msg.get("type")
@@ -137,17 +170,48 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                 except Exception:
                     logger.exception("Error processing emotion_data for %s", session_id)
 
+            elif msg_type == "emotion_batch":
+                try:
+                    frames = WSEmotionBatch.model_validate(msg).frames
+                except ValidationError:
+                    logger.warning("Invalid emotion_batch from session %s", session_id)
+                    continue
+                logger.info(
+                    "[WS ← client] emotion_batch  session=%s  frames=%d  last_stress=%.2f",
+                    session_id,
+                    len(frames),
+                    frames[-1].emotions.stress,
+                )
+                try:
+                    await orchestrator.handle_emotion_batch(session_id, frames)
+                except Exception:
+                    logger.exception("Error processing emotion_batch for %s", session_id)
+
             elif msg_type == "player_speech":
                 text = msg.get("text", "")
                 logger.info("[WS ← client] player_speech  session=%s  text=%r", session_id, text[:80])
                 if text:
-                    try:
-                        await orchestrator.handle_player_speech(session_id, text)
-                    except Exception:
-                        logger.exception("Error processing player_speech for %s", session_id)
+                    turn_scheduler.submit(session_id, text)
                 else:
                     logger.warning("Empty player_speech from session %s", session_id)
 
+            elif msg_type == "subscribe":
+                try:
+                    sub = WSSubscribe.model_validate(msg)
+                except ValidationError:
+                    logger.warning("Invalid subscribe from session %s: %r", session_id, msg)
+                    continue
+                ws_handler.subscribe(session_id, websocket, sub.types)
+
+            elif msg_type == "ui_sync":
+                try:
+                    sync = WSUISync.model_validate(msg)
+                    await orchestrator.handle_ui_sync(session_id, websocket, sync.version)
+                except ValidationError:
+                    logger.warning("Invalid ui_sync from session %s: %r", session_id, msg)
+                except Exception:
+                    logger.exception("Error processing ui_sync for %s", session_id)
+
             elif msg_type == "client_event":
                 logger.debug("[WS ← client] client_event  session=%s  name=%s", session_id, msg.get("name"))
 
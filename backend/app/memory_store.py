@@ -0,0 +1,203 @@
+"""
+SPECTRA Component D — Bounded in-memory fallback store.
+
+Stands in for the Redis keys when Redis is unavailable:
+  • Keys are grouped per session (``session:{id}:...``); a session expires
+    SESSION_TTL seconds after its last write, like the Redis EXPIREs
+  • At most MEMORY_STORE_MAX_SESSIONS sessions are kept — least recently
+    used sessions are evicted first
+  • Timelines are kept sorted by score (bisect insert, bisected range reads)
+    and capped at TIMELINE_MAX_ENTRIES, dropping the oldest entries
+  • Emotion windows are capped lists, as in Redis (RPUSH + LTRIM)
+  • Sessions written since the last take_dirty() are tracked, so
+    redis_client can copy them back once Redis recovers
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("spectra.memstore")
+
+# Expired sessions are swept at most this often (seconds); reads also check
+# expiry lazily, so this only bounds how long dead sessions hold memory.
+_SWEEP_INTERVAL = 5.0
+
+
+def _score(item: tuple[float, str]) -> float:
+    return item[0]
+
+
+@dataclass
+class _Session:
+    expires_at: float
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+class MemoryStore:
+    """TTL + LRU bounded key store with the few Redis types redis_client uses."""
+
+    def __init__(self, ttl: float, max_sessions: int, max_timeline: int) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_timeline = max_timeline
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._next_sweep = 0.0
+        self._dirty: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------
+    # Strings (state, ui_prev)
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        session = self._read(key)
+        return session.values.get(key) if session else None
+
+    def set(self, key: str, value: str) -> None:
+        self._write(key).values[key] = value
+
+    # ------------------------------------------------------------------
+    # Timelines — (score, member) pairs kept sorted by score
+    # ------------------------------------------------------------------
+
+    def timeline_add(self, key: str, score: float, member: str) -> None:
+        entries: list[tuple[float, str]] = self._write(key).values.setdefault(key, [])
+        bisect.insort_right(entries, (score, member), key=_score)
+        if len(entries) > self.max_timeline:
+            del entries[: len(entries) - self.max_timeline]
+
+    def timeline_range(
+        self,
+        key: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> list[str]:
+        session = self._read(key)
+        entries: list[tuple[float, str]] = session.values.get(key, []) if session else []
+        lo = 0 if start is None else bisect.bisect_left(entries, start, key=_score)
+        hi = len(entries) if end is None else bisect.bisect_right(entries, end, key=_score)
+        return [member for _, member in entries[lo:hi]]
+
+    def timeline_update_latest(self, key: str, fn: Callable[[str], str]) -> None:
+        """Replace the highest-scored member with ``fn(member)``."""
+        session = self._read(key)
+        entries = session.values.get(key) if session else None
+        if entries:
+            score, member = entries[-1]
+            entries[-1] = (score, fn(member))
+            self._write(key)
+
+    # ------------------------------------------------------------------
+    # Capped lists (emotion window)
+    # ------------------------------------------------------------------
+
+    def list_push(self, key: str, value: str, maxlen: int) -> None:
+        items: list[str] = self._write(key).values.setdefault(key, [])
+        items.append(value)
+        del items[:-maxlen]
+
+    def list_range(self, key: str) -> list[str]:
+        session = self._read(key)
+        return list(session.values.get(key, [])) if session else []
+
+    # ------------------------------------------------------------------
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            sid = _session_id(key)
+            session = self._sessions.get(sid)
+            if session is None:
+                continue
+            session.values.pop(key, None)
+            if not session.values:
+                del self._sessions[sid]
+
+    def clear(self) -> None:
+        self._sessions.clear()
+        self._dirty.clear()
+
+    # ------------------------------------------------------------------
+    # Re-sync support
+    # ------------------------------------------------------------------
+
+    def take_dirty(self) -> set[str]:
+        """Return (and reset) the sessions written since the last call."""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def mark_dirty(self, session_ids: set[str]) -> None:
+        """Put sessions back after a failed re-sync."""
+        self._dirty.update(sid for sid in session_ids if sid in self._sessions)
+
+    def is_dirty(self, session_id: str) -> bool:
+        return session_id in self._dirty
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def export(self, session_id: str) -> dict[str, Any]:
+        """Copy of every live key of one session (timelines as (score, member))."""
+        session = self._sessions.get(session_id)
+        if session is None or session.expires_at <= time.monotonic():
+            return {}
+        return {k: list(v) if isinstance(v, list) else v for k, v in session.values.items()}
+
+    def drop_session(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._dirty.discard(session_id)
+
+    # ------------------------------------------------------------------
+    # Expiry / eviction
+    # ------------------------------------------------------------------
+
+    def _read(self, key: str) -> Optional[_Session]:
+        sid = _session_id(key)
+        session = self._sessions.get(sid)
+        if session is None:
+            return None
+        if session.expires_at <= time.monotonic():
+            del self._sessions[sid]
+            return None
+        self._sessions.move_to_end(sid)
+        return session
+
+    def _write(self, key: str) -> _Session:
+        now = time.monotonic()
+        sid = _session_id(key)
+        session = self._read(key)
+        if session is None:
+            self._sweep(now)
+            session = self._sessions[sid] = _Session(expires_at=0.0)
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                self._dirty.discard(evicted)
+                logger.warning("In-memory store full — evicted session %s", evicted)
+        session.expires_at = now + self.ttl
+        self._dirty.add(sid)
+        return session
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL
+        expired = [sid for sid, s in self._sessions.items() if s.expires_at <= now]
+        for sid in expired:
+            del self._sessions[sid]
+            self._dirty.discard(sid)
+        if expired:
+            logger.debug("In-memory store expired %d sessions", len(expired))
+
+
+def _session_id(key: str) -> str:
+    """``session:{id}:kind[:sub]`` → ``id`` (other keys group under themselves)."""
+    parts = key.split(":", 2)
+    return parts[1] if len(parts) > 2 and parts[0] == "session" else key
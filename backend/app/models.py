@@ -10,7 +10,7 @@ Contract 4: Timeline Entry          (D → Redis)
 from __future__ import annotations
 
 from enum import Enum
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -171,15 +171,19 @@ class TimelineEntry(BaseModel):
 # ---------------------------------------------------------------------------
 
 class GameState(BaseModel):
+    """Per-session game state.
+
+    The emotion window is stored separately (session:{id}:emotion, see
+    redis_client.push_emotion_frame) so this blob stays a few hundred bytes.
+    """
     session_id: str
     phase: Phase = Phase.infiltrate
     time_remaining: int = 300
+    deadline: Optional[float] = None  # epoch seconds (deadline clock mode)
     decisions_made: int = 0
     current_score: int = 0
     conversation_history: list[ConversationEntry] = []
     is_active: bool = True
-    last_emotion: Optional[EmotionSignal] = None
-    emotion_buffer: list[EmotionSignal] = []
 
 
 # ---------------------------------------------------------------------------
@@ -191,11 +195,29 @@ class WSEmotionData(BaseModel):
     data: EmotionSignal
 
 
+class WSEmotionBatch(BaseModel):
+    """Several Contract 1 frames in one message (micro-batching senders)."""
+    type: Literal["emotion_batch"] = "emotion_batch"
+    frames: list[EmotionSignal] = Field(min_length=1, max_length=100)
+
+
 class WSPlayerSpeech(BaseModel):
     type: Literal["player_speech"] = "player_speech"
     text: str
 
 
+class WSSubscribe(BaseModel):
+    """Restrict this connection to the listed outgoing types (None = all)."""
+    type: Literal["subscribe"] = "subscribe"
+    types: Optional[list[str]] = None
+
+
+class WSUISync(BaseModel):
+    """Opt in to ui_delta; ``version`` is the last UI version the client holds."""
+    type: Literal["ui_sync"] = "ui_sync"
+    version: int = 0
+
+
 # ---------------------------------------------------------------------------
 # WebSocket Messages — Outgoing (backend → browser)
 # ---------------------------------------------------------------------------
@@ -203,12 +225,54 @@ class WSPlayerSpeech(BaseModel):
 class WSUIUpdate(BaseModel):
     type: Literal["ui_update"] = "ui_update"
     data: UICommands
+    version: Optional[int] = None
+
+
+class WSUIDelta(BaseModel):
+    """Changed top-level UICommands fields, applied on top of ``base_version``."""
+    type: Literal["ui_delta"] = "ui_delta"
+    version: int
+    base_version: int
+    changes: dict[str, Any]
 
 
 class WSOracleSpeech(BaseModel):
+    """A complete ORACLE reply.
+
+    ``turn_id`` is set when the reply was streamed as oracle_speech_partial
+    first; None means no partials of this reply were sent.
+    """
     type: Literal["oracle_speech"] = "oracle_speech"
     text: str
     voice_style: str
+    turn_id: Optional[str] = None
+
+
+class WSOracleSpeechPartial(BaseModel):
+    """One completed sentence of a reply still being generated (seq from 0).
+
+    The full reply follows as oracle_speech with the same turn_id once the
+    turn is applied.  If the turn is abandoned (stream failure, cancelled by
+    newer speech) no oracle_speech carries that turn_id — the next one has a
+    different turn_id or none.
+    """
+    type: Literal["oracle_speech_partial"] = "oracle_speech_partial"
+    turn_id: str
+    seq: int
+    text: str
+
+
+class WSEmotionUpdate(BaseModel):
+    type: Literal["emotion_update"] = "emotion_update"
+    data: EmotionSignal
+
+
+class WSGameStateUpdate(BaseModel):
+    type: Literal["game_state_update"] = "game_state_update"
+    current_score: int
+    decisions_made: int
+    phase: str
+    time_remaining: int
 
 
 class WSTimerTick(BaseModel):
@@ -232,9 +296,14 @@ class WSGameEnd(BaseModel):
 # ---------------------------------------------------------------------------
 
 class PreviousUIState(BaseModel):
-    """Stores previous UI commands + voice_style for adaptation detection."""
+    """Last UI commands + voice_style sent to the session.
+
+    Used for adaptation detection and as the base of ui_delta messages;
+    ``version`` increments on every oracle turn.
+    """
     ui_commands: UICommands
     voice_style: VoiceStyle = VoiceStyle.neutral
+    version: int = 0
 
 
 class SessionCreated(BaseModel):
@@ -0,0 +1,172 @@
+"""
+SPECTRA Component D — Incremental Contract 3 parser for streamed replies.
+
+Component B's /api/oracle/respond/stream sends Claude's raw output — the
+Contract 3 JSON text — as it is generated. Contract3Stream reads it chunk
+by chunk:
+  • oracle_response.text is decoded as it arrives and handed out one
+    completed sentence at a time (sentence end = . ! ? … then whitespace;
+    the rest is flushed when the string closes)
+  • ui_commands is parsed as soon as its object closes, ahead of the rest
+    of the reply
+  • result() validates the whole body once the stream ends (markdown code
+    fences around the JSON are tolerated, as in Component B)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.models import OracleResponse, UICommands
+
+logger = logging.getLogger("spectra.oracle_stream")
+
+_ORACLE_RESPONSE = re.compile(r'"oracle_response"\s*:\s*\{')
+_TEXT = re.compile(r'"text"\s*:\s*"')
+_UI_COMMANDS = re.compile(r'"ui_commands"\s*:\s*\{')
+_SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s+')
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class Contract3Stream:
+    """Feed streamed Contract 3 text; collect sentences and early ui_commands."""
+
+    def __init__(self) -> None:
+        self._buf = ""
+        # oracle_response.text: scan position in _buf, decoded chars, chars
+        # already handed out as sentences
+        self._text_pos: Optional[int] = None
+        self._text: list[str] = []
+        self._text_done = False
+        self._emitted = 0
+        # ui_commands: brace-matching state
+        self._ui_start: Optional[int] = None
+        self._ui_pos = 0
+        self._ui_depth = 0
+        self._ui_in_string = False
+        self._ui_done = False
+        self._ui: Optional[UICommands] = None
+
+    @property
+    def text(self) -> str:
+        """oracle_response.text decoded so far."""
+        return "".join(self._text)
+
+    def feed(self, chunk: str) -> list[str]:
+        """Add a chunk; return the sentences it completed (may be empty)."""
+        self._buf += chunk
+        self._scan_ui_commands()
+        return self._scan_text()
+
+    def take_ui_commands(self) -> Optional[UICommands]:
+        """ui_commands, once parsed — returned a single time."""
+        ui, self._ui = self._ui, None
+        return ui
+
+    def result(self) -> OracleResponse:
+        """Validate the complete body (raises ValueError / ValidationError)."""
+        start, end = self._buf.find("{"), self._buf.rfind("}")
+        if start < 0 or end < start:
+            raise ValueError("no JSON object in streamed response")
+        return OracleResponse.model_validate_json(self._buf[start:end + 1])
+
+    # -- oracle_response.text ------------------------------------------------
+
+    def _scan_text(self) -> list[str]:
+        if self._text_done:
+            return []
+        if self._text_pos is None:
+            obj = _ORACLE_RESPONSE.search(self._buf)
+            key = obj and _TEXT.search(self._buf, obj.end())
+            if not key:
+                return []
+            self._text_pos = key.end()
+
+        buf, pos = self._buf, self._text_pos
+        while pos < len(buf):
+            c = buf[pos]
+            if c == '"':
+                self._text_done = True
+                pos += 1
+                break
+            if c != "\\":
+                self._text.append(c)
+                pos += 1
+                continue
+            # Escape sequence — wait for the rest of it if it is split
+            if pos + 1 >= len(buf):
+                break
+            if buf[pos + 1] != "u":
+                self._text.append(_ESCAPES.get(buf[pos + 1], buf[pos + 1]))
+                pos += 2
+                continue
+            size = 6
+            if pos + 6 <= len(buf) and 0xD800 <= int(buf[pos + 2:pos + 6], 16) < 0xDC00:
+                size = 12  # surrogate pair
+            if pos + size > len(buf):
+                break
+            self._text.append(json.loads(f'"{buf[pos:pos + size]}"'))
+            pos += size
+        self._text_pos = pos
+        return self._sentences()
+
+    def _sentences(self) -> list[str]:
+        pending = self.text[self._emitted:]
+        out: list[str] = []
+        start = 0
+        for m in _SENTENCE_END.finditer(pending):
+            out.append(pending[start:m.end()].strip())
+            start = m.end()
+        if self._text_done:
+            out.append(pending[start:].strip())
+            start = len(pending)
+        self._emitted += start
+        return [s for s in out if s]
+
+    # -- ui_commands ---------------------------------------------------------
+
+    def _scan_ui_commands(self) -> None:
+        if self._ui_done:
+            return
+        if self._ui_start is None:
+            m = _UI_COMMANDS.search(self._buf)
+            if not m:
+                return
+            self._ui_start = self._ui_pos = m.end() - 1
+
+        buf, pos, escaped = self._buf, self._ui_pos, False
+        while pos < len(buf):
+            c = buf[pos]
+            pos += 1
+            if self._ui_in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    self._ui_in_string = False
+            elif c == '"':
+                self._ui_in_string = True
+            elif c == "{":
+                self._ui_depth += 1
+            elif c == "}":
+                self._ui_depth -= 1
+                if self._ui_depth == 0:
+                    self._ui_done = True
+                    self._parse_ui_commands(buf[self._ui_start:pos])
+                    return
+        if escaped:
+            pos -= 1  # re-read the backslash with the character it escapes
+        self._ui_pos = pos
+
+    def _parse_ui_commands(self, raw: str) -> None:
+        try:
+            self._ui = UICommands.model_validate_json(raw)
+        except ValidationError as exc:
+            logger.warning("Streamed ui_commands did not validate — waiting for the full reply: %s", exc)
@@ -6,6 +6,9 @@ This module ties everything together:
   2. Player speech → build Contract 2 → call Component B → parse Contract 3
      → apply game updates → detect adaptation → broadcast WS messages
   3. Mock mode for testing without Component B
+  4. Streaming (ORACLE_STREAMING): sentences of the reply go out as
+     oracle_speech_partial and ui_commands as ui_update while Component B
+     is still generating
 """
 
 from __future__ import annotations
@@ -14,9 +17,11 @@ import asyncio
 import json
 import logging
 import time
-from typing import Optional
+import uuid
+from typing import AsyncIterator, Optional
 
 import httpx
+from fastapi import WebSocket
 
 from app.config import settings
 from app.emotion_processor import EmotionProcessor
@@ -33,13 +38,18 @@ from app.models import (
     PreviousUIState,
     UICommands,
     VoiceStyle,
+    WSEmotionUpdate,
     WSGameEnd,
+    WSGameStateUpdate,
     WSOracleSpeech,
+    WSOracleSpeechPartial,
     WSPhaseChange,
+    WSUIDelta,
     WSUIUpdate,
 )
 from app import game_state as gsm
 from app import redis_client
+from app.oracle_stream import Contract3Stream
 from app import ws_handler
 
 logger = logging.getLogger("spectra.orchestrator")
@@ -47,6 +57,10 @@ logger = logging.getLogger("spectra.orchestrator")
 # Async HTTP client — reused across requests
 _http_client: Optional[httpx.AsyncClient] = None
 
+# session_id → turn_id of a streamed reply awaiting apply_turn (its partials
+# were broadcast; the final oracle_speech carries the same turn_id)
+_stream_turns: dict[str, str] = {}
+
 
 async def init_http_client() -> None:
     global _http_client
@@ -138,12 +152,20 @@ def _fallback_oracle_response() -> OracleResponse:
 # ---------------------------------------------------------------------------
 
 async def handle_emotion_data(session_id: str, signal: EmotionSignal) -> None:
-    """Process a Contract 1 emotion reading.
+    """Process a single Contract 1 emotion reading (see handle_emotion_batch)."""
+    await handle_emotion_batch(session_id, [signal])
+
+
+async def handle_emotion_batch(session_id: str, signals: list[EmotionSignal]) -> None:
+    """Process one or more Contract 1 emotion readings.
 
-    1. Push to buffer
-    2. Build a Contract 4 timeline entry and store in Redis
+    1. Push to the emotion window (stored apart from GameState, which is
+       only read here — never rewritten per frame)
+    2. Build Contract 4 timeline entries and store in Redis
     3. (oracle-only mode) Emotion → buffer only; UI updates come from oracle-brain, not here
-    4. Save updated state
+
+    A batch costs the same as one frame: one state read, one pipelined
+    round trip (multi-value RPUSH + multi-member ZADD) and one broadcast.
     """
     ts_start = time.monotonic()
 
@@ -151,42 +173,38 @@ async def handle_emotion_data(session_id: str, signal: EmotionSignal) -> None:
     if state is None or not state.is_active:
         return
 
-    # 1 — update buffer (emotion data still needed for Contract 2 snapshots)
-    EmotionProcessor.push_to_buffer(state, signal)
+    signals = sorted(signals, key=lambda s: s.timestamp)
+    latest = signals[-1]
 
-    # 2 — Contract 4 timeline entry (still recorded for debrief)
-    entry = EmotionProcessor.build_timeline_entry(signal, state.phase)
-    await redis_client.append_timeline(session_id, entry)
+    # 1 + 2 — emotion window (still needed for Contract 2 snapshots) and
+    #         Contract 4 timeline entries (debrief), in one pipelined round trip
+    entries = [EmotionProcessor.build_timeline_entry(s, state.phase) for s in signals]
+    async with redis_client.batch() as writes:
+        writes.push_emotion_frames(session_id, signals)
+        writes.append_timeline_many(session_id, entries)
 
     # 3 — Broadcast emotion data to frontend so its local emotionEngine can
     #     drive real-time UI changes (color_mood, complexity) between oracle turns.
-    await ws_handler.broadcast(session_id, {
-        "type": "emotion_update",
-        "data": {
-            "timestamp": signal.timestamp,
-            "emotions": signal.emotions.model_dump(),
-            "dominant": signal.dominant,
-            "face_detected": signal.face_detected,
-        },
-    })
+    #     Rate-capped per session: bursts are coalesced, newest frame wins.
+    await ws_handler.broadcast_latest(
+        session_id, WSEmotionUpdate(data=latest), settings.emotion_update_max_hz
+    )
     logger.debug(
         "[emotion broadcast] session=%s  stress=%.2f  focus=%.2f  dominant=%s",
         session_id,
-        signal.emotions.stress,
-        signal.emotions.focus,
-        signal.dominant,
+        latest.emotions.stress,
+        latest.emotions.focus,
+        latest.dominant,
     )
 
-    # 4 — persist state
-    await gsm.save_state(state)
-
     elapsed = (time.monotonic() - ts_start) * 1000
     logger.debug(
-        "Emotion processed for %s in %.1fms  dominant=%s  stress=%.2f",
+        "Emotion processed for %s in %.1fms  frames=%d  dominant=%s  stress=%.2f",
         session_id,
         elapsed,
-        signal.dominant,
-        signal.emotions.stress,
+        len(signals),
+        latest.dominant,
+        latest.emotions.stress,
     )
 
 
@@ -203,27 +221,48 @@ async def handle_player_speech(session_id: str, text: str) -> None:
     4. Apply game updates
     5. Detect adaptation → annotate timeline
     6. Broadcast WS messages
+
+    Split in two for turn_scheduler: prepare_turn (1–3) writes no state and
+    may be cancelled at any await; apply_turn (4–6) must run to completion.
     """
     ts_start = time.monotonic()
+    oracle_resp = await prepare_turn(session_id, text)
+    if oracle_resp is not None:
+        await apply_turn(session_id, text, oracle_resp, ts_start)
+
+
+async def prepare_turn(session_id: str, text: str) -> Optional[OracleResponse]:
+    """Phases 1–3: build Contract 2 and get Contract 3 (None = turn dropped).
+
+    Writes no game state, so it is safe to cancel, e.g. when newer speech
+    supersedes this turn.  It is not side-effect free, though: with
+    ORACLE_STREAMING it broadcasts oracle_speech_partial sentences and an
+    early ui_update as the reply arrives, and those stay sent if the turn is
+    cancelled (clients drop them when the next oracle_speech has a different
+    turn_id).
+    """
+    _stream_turns.pop(session_id, None)  # left by a turn that was never applied
     logger.info("▶ [PHASE 1/6] player_speech received  session=%s  text=%r", session_id, text[:80])
 
     state = await gsm.get_state(session_id)
     if state is None:
         logger.error("✗ [PHASE 1/6] DROPPED — no state in Redis for session %s", session_id)
-        return
+        return None
     if state.phase == Phase.debrief:
         logger.info("✗ [PHASE 1/6] DROPPED — game already ended (debrief phase)  session=%s", session_id)
-        return
+        return None
+    emotion_window = await redis_client.load_emotion_window(session_id)
     logger.info(
         "✔ [PHASE 1/6] state OK  session=%s  phase=%s  time=%ds  active=%s  emotion_buffer_size=%d",
-        session_id, state.phase.value, state.time_remaining, state.is_active, len(state.emotion_buffer),
+        session_id, state.phase.value, gsm.time_remaining(state), state.is_active, len(emotion_window),
     )
 
-    # Record player's message in history
+    # Record player's message in history (on this read-only copy; the
+    # authoritative state is updated once the turn completes)
     gsm.add_to_history(state, "player", text)
 
     # ----- Step 2: Build Contract 2 -----
-    snapshot = EmotionProcessor.build_snapshot(state)
+    snapshot = EmotionProcessor.build_snapshot(emotion_window)
     logger.info(
         "▶ [PHASE 2/6] building Contract 2  session=%s  has_emotion=%s  trend=%s  avg_stress=%.2f",
         session_id,
@@ -234,7 +273,7 @@ async def handle_player_speech(session_id: str, text: str) -> None:
     context = OracleContext(
         game_state=GameStateSnapshot(
             phase=state.phase,
-            time_remaining=state.time_remaining,
+            time_remaining=gsm.time_remaining(state),
             decisions_made=state.decisions_made,
             current_score=state.current_score,
         ),
@@ -249,7 +288,11 @@ async def handle_player_speech(session_id: str, text: str) -> None:
     oracle_resp: OracleResponse
     if settings.mock_mode:
         oracle_resp = _mock_oracle_response()
+        if settings.oracle_streaming:
+            oracle_resp = await _consume_stream(session_id, _chunked(oracle_resp.model_dump_json()))
         logger.info("✔ [PHASE 3/6] MOCK response used")
+    elif settings.oracle_streaming:
+        oracle_resp = await _stream_component_b(session_id, context)
     else:
         oracle_resp = await _call_component_b(context)
     logger.info(
@@ -258,17 +301,14 @@ async def handle_player_speech(session_id: str, text: str) -> None:
         oracle_resp.ui_commands.complexity.value,
         oracle_resp.oracle_response.text[:80],
     )
+    return oracle_resp
 
-    # ----- Step 4: Apply game updates -----
-    gsm.add_to_history(state, "oracle", oracle_resp.oracle_response.text)
-    phase_advanced = gsm.apply_game_update(state, oracle_resp.game_update)
-    logger.info(
-        "▶ [PHASE 4/6] game update applied  score_delta=%s  advance_phase=%s  new_phase=%s",
-        oracle_resp.game_update.score_delta,
-        oracle_resp.game_update.advance_phase,
-        state.phase.value,
-    )
 
+async def apply_turn(
+    session_id: str, text: str, oracle_resp: OracleResponse, ts_start: float
+) -> None:
+    """Phases 4–6: apply Contract 3 to state, annotate, broadcast."""
+    turn_id = _stream_turns.pop(session_id, None)
     # ----- Step 4: Detect adaptation -----
     prev_ui = await redis_client.load_prev_ui(session_id)
     adaptation = EmotionProcessor.detect_adaptation(
@@ -276,37 +316,56 @@ async def handle_player_speech(session_id: str, text: str) -> None:
         oracle_resp.ui_commands,
         oracle_resp.oracle_response.voice_style,
     )
-    if adaptation:
-        await redis_client.update_latest_timeline_adaptation(session_id, adaptation)
-        logger.info("Adaptation detected for %s: %s", session_id, adaptation)
 
-    # Save new UI + voice_style as prev for next comparison
-    await redis_client.save_prev_ui(
-        session_id,
-        PreviousUIState(
-            ui_commands=oracle_resp.ui_commands,
-            voice_style=oracle_resp.oracle_response.voice_style,
-        ),
+    ui_version = (prev_ui.version if prev_ui else 0) + 1
+
+    # ----- Step 4: Apply game updates; state + adaptation + prev UI in one round trip -----
+    def _apply_turn(s: GameState) -> tuple[bool, GameState]:
+        gsm.add_to_history(s, "player", text)
+        gsm.add_to_history(s, "oracle", oracle_resp.oracle_response.text)
+        advanced = gsm.apply_game_update(s, oracle_resp.game_update)
+        return advanced, s.model_copy()
+
+    async with redis_client.batch() as writes:
+        applied = await gsm.update_state(session_id, _apply_turn, batch=writes)
+        if applied is None:
+            logger.error("✗ [PHASE 4/6] DROPPED — session %s vanished mid-turn", session_id)
+            return
+        if adaptation:
+            writes.annotate_latest_timeline(session_id, adaptation)
+        # Save new UI + voice_style as prev for next comparison (and ui_delta base)
+        writes.save_prev_ui(
+            session_id,
+            PreviousUIState(
+                ui_commands=oracle_resp.ui_commands,
+                voice_style=oracle_resp.oracle_response.voice_style,
+                version=ui_version,
+            ),
+        )
+    phase_advanced, state = applied
+    logger.info(
+        "▶ [PHASE 4/6] game update applied  score_delta=%s  advance_phase=%s  new_phase=%s",
+        oracle_resp.game_update.score_delta,
+        oracle_resp.game_update.advance_phase,
+        state.phase.value,
     )
 
-    # ----- Step 5: Persist state -----
-    await gsm.save_state(state)
+    if adaptation:
+        logger.info("Adaptation detected for %s: %s", session_id, adaptation)
 
     # ----- Step 5a: Broadcast game state update -----
     await ws_handler.broadcast(
         session_id,
-        {
-            "type": "game_state_update",
-            "current_score": state.current_score,
-            "decisions_made": state.decisions_made,
-            "phase": state.phase.value,
-            "time_remaining": state.time_remaining,
-        },
+        WSGameStateUpdate(
+            current_score=state.current_score,
+            decisions_made=state.decisions_made,
+            phase=state.phase.value,
+            time_remaining=gsm.time_remaining(state),
+        ),
     )
 
     # ----- Step 5/6: Broadcast WS messages -----
-    from app import ws_handler as _wsh
-    conn_count = len(_wsh._connections.get(session_id, set()))
+    conn_count = ws_handler.connection_count(session_id)
     logger.info(
         "▶ [PHASE 5/6] broadcasting oracle_speech  session=%s  ws_connections=%d  text=%r",
         session_id, conn_count, oracle_resp.oracle_response.text[:80],
@@ -322,13 +381,19 @@ async def handle_player_speech(session_id: str, text: str) -> None:
         WSOracleSpeech(
             text=oracle_resp.oracle_response.text,
             voice_style=oracle_resp.oracle_response.voice_style.value,
+            turn_id=turn_id,
         ),
     )
     logger.info("✔ [PHASE 5/6] oracle_speech broadcast sent")
 
+    # Full ui_update for plain sockets, ui_delta for sockets that sent ui_sync
     await ws_handler.broadcast(
         session_id,
-        WSUIUpdate(data=oracle_resp.ui_commands),
+        WSUIUpdate(data=oracle_resp.ui_commands, version=ui_version),
+    )
+    await ws_handler.broadcast(
+        session_id,
+        ui_delta(prev_ui, oracle_resp.ui_commands, ui_version),
     )
 
     # Phase change notification
@@ -337,8 +402,9 @@ async def handle_player_speech(session_id: str, text: str) -> None:
             session_id,
             WSPhaseChange(phase=state.phase.value),
         )
-        # If game reached debrief, send game_end
+        # If game reached debrief, stop the clock and send game_end
         if state.phase == Phase.debrief:
+            await gsm.stop_timer(session_id)
             await ws_handler.broadcast(
                 session_id,
                 WSGameEnd(final_score=state.current_score, session_id=session_id),
@@ -365,6 +431,35 @@ async def handle_player_speech(session_id: str, text: str) -> None:
     )
 
 
+# ---------------------------------------------------------------------------
+# Delta-encoded UI updates
+# ---------------------------------------------------------------------------
+
+def ui_delta(prev: Optional[PreviousUIState], ui: UICommands, version: int) -> WSUIDelta:
+    """Top-level UICommands fields that differ from the last version sent.
+
+    With no previous version every field is included (base_version 0).
+    """
+    new = ui.model_dump(mode="json")
+    if prev is None:
+        return WSUIDelta(version=version, base_version=0, changes=new)
+    old = prev.ui_commands.model_dump(mode="json")
+    changes = {k: v for k, v in new.items() if old.get(k) != v}
+    return WSUIDelta(version=version, base_version=prev.version, changes=changes)
+
+
+async def handle_ui_sync(session_id: str, ws: WebSocket, version: int) -> None:
+    """Switch a socket to ui_delta; send a full ui_update if it is behind."""
+    ws_handler.enable_ui_delta(session_id, ws)
+    prev = await redis_client.load_prev_ui(session_id)
+    if prev is None or prev.version == version:
+        return
+    logger.info("UI resync  session=%s  client_version=%d  version=%d", session_id, version, prev.version)
+    await ws_handler.send_queued(
+        session_id, ws, WSUIUpdate(data=prev.ui_commands, version=prev.version)
+    )
+
+
 # ---------------------------------------------------------------------------
 # Component B HTTP call
 # ---------------------------------------------------------------------------
@@ -416,6 +511,86 @@ async def _call_component_b(context: OracleContext) -> OracleResponse:
         return _fallback_oracle_response()
 
 
+async def _stream_component_b(session_id: str, context: OracleContext) -> OracleResponse:
+    """POST Contract 2 to Component B's streaming endpoint; broadcast as it parses."""
+    url = f"{settings.component_b_url}/api/oracle/respond/stream"
+    try:
+        if _http_client is None:
+            raise RuntimeError("HTTP client not initialised")
+
+        logger.info("[→ oracle-brain] POST %s (streaming)  text=%r", url, (context.player_input or "")[:60])
+        async with _http_client.stream(
+            "POST",
+            url,
+            content=context.model_dump_json(),
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            resp.raise_for_status()
+            oracle_resp = await _consume_stream(session_id, resp.aiter_text())
+        logger.info(
+            "[← oracle-brain] stream complete  voice_style=%s  score_delta=%s  text=%r",
+            oracle_resp.oracle_response.voice_style.value,
+            oracle_resp.game_update.score_delta,
+            oracle_resp.oracle_response.text[:80],
+        )
+        return oracle_resp
+
+    except httpx.ConnectError:
+        logger.error("Component B unreachable at %s — returning fallback", url)
+        return _fallback_oracle_response()
+    except httpx.HTTPStatusError as exc:
+        logger.error("Component B returned %s — returning fallback", exc.response.status_code)
+        return _fallback_oracle_response()
+    except ValueError as exc:
+        logger.error("Streamed Contract 3 did not parse (%s) — returning fallback", exc)
+        return _fallback_oracle_response()
+    except Exception:
+        logger.exception("Unexpected error streaming from Component B")
+        return _fallback_oracle_response()
+
+
+async def _consume_stream(session_id: str, chunks: AsyncIterator[str]) -> OracleResponse:
+    """Parse a streamed Contract 3, broadcasting sentences and early ui_commands.
+
+    Runs inside prepare_turn, so it may be cancelled part-way; what was
+    already broadcast stays sent (the restarted turn uses a new turn_id).
+    The early ui_update is unversioned and reaches plain sockets only —
+    ui_delta sockets, and the versioned ui_update, follow in apply_turn.
+    """
+    turn_id = uuid.uuid4().hex[:12]
+    parser = Contract3Stream()
+    seq = 0
+    ts_start = time.monotonic()
+    async for chunk in chunks:
+        for sentence in parser.feed(chunk):
+            if seq == 0:
+                logger.info(
+                    "[stream] first sentence after %.0fms  session=%s  turn=%s",
+                    (time.monotonic() - ts_start) * 1000, session_id, turn_id,
+                )
+            await ws_handler.broadcast(
+                session_id, WSOracleSpeechPartial(turn_id=turn_id, seq=seq, text=sentence)
+            )
+            seq += 1
+        ui = parser.take_ui_commands()
+        if ui is not None:
+            await ws_handler.broadcast(session_id, WSUIUpdate(data=ui))
+    result = parser.result()
+    # Only a reply that parsed is tied to its partials; a fallback sent after
+    # a failed stream goes out without this turn_id, so clients drop the
+    # sentences they were given.
+    if seq:
+        _stream_turns[session_id] = turn_id
+    return result
+
+
+async def _chunked(text: str, size: int = 24) -> AsyncIterator[str]:
+    """Mock mode: replay a response as a token stream."""
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+        await asyncio.sleep(0)
+
+
 # ---------------------------------------------------------------------------
 # Timer callbacks (wired up when the timer is started)
 # ---------------------------------------------------------------------------
@@ -432,13 +607,17 @@ async def on_timer_tick(session_id: str, time_remaining: int) -> None:
 
 async def on_timer_end(session_id: str) -> None:
     """Timer hit 0 — advance to debrief phase and end the game."""
-    state = await gsm.get_state(session_id)
+    def _end(s: GameState) -> GameState:
+        # Advance to debrief phase
+        s.phase = Phase.debrief
+        s.is_active = False
+        s.time_remaining = 0
+        s.deadline = None
+        return s.model_copy()
+
+    state = await gsm.update_state(session_id, _end)
     if state is None:
         return
-    # Advance to debrief phase
-    state.phase = Phase.debrief
-    state.is_active = False
-    await gsm.save_state(state)
     logger.info("Timer expired for session %s  final_score=%d", session_id, state.current_score)
     # Notify clients of phase change first, then game end
     await ws_handler.broadcast(
@@ -4,66 +4,263 @@ SPECTRA Component D — Redis client layer.
 Handles:
   • Connection pool lifecycle (startup / shutdown)
   • Game state read / write  (session:{id}:state)
-  • Timeline append / read   (session:{id}:timeline)
+  • Timeline append / read   (session:{id}:timeline — sorted set, or
+                               session:{id}:timeline:stream + :adapt when
+                               TIMELINE_BACKEND=stream)
   • Previous UI commands      (session:{id}:ui_prev)
+  • Emotion window            (session:{id}:emotion — capped list)
   • TTL management
-  • Graceful fallback to in-memory dicts when Redis is unavailable
+  • Pipelined write batches (one round trip for multi-key writes)
+  • Pub/sub for the cross-worker broadcast bus (session:{id}:ws)
+  • Graceful fallback to a bounded in-memory store when Redis is unavailable,
+    via the redis_health circuit breaker (re-sync on recovery)
 """
 
 from __future__ import annotations
 
 import json
 import logging
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
 
 from app.config import settings
-from app.models import GameState, PreviousUIState, TimelineEntry, UICommands
+from app.emotion_buffer import BUFFER_SIZE, EmotionRingBuffer, encode_frame
+from app.memory_store import MemoryStore
+from app import redis_health
+from app.models import EmotionSignal, GameState, PreviousUIState, TimelineEntry, UICommands
 
 logger = logging.getLogger("spectra.redis")
 
+T = TypeVar("T")
+
 # ---------------------------------------------------------------------------
 # In-memory fallback stores (used when Redis is down)
 # ---------------------------------------------------------------------------
-_mem_state: dict[str, str] = {}
-_mem_timeline: dict[str, list[tuple[float, str]]] = {}
-_mem_ui_prev: dict[str, str] = {}
+_mem = MemoryStore(
+    ttl=settings.session_ttl,
+    max_sessions=settings.memory_store_max_sessions,
+    max_timeline=settings.timeline_max_entries,
+)
 
 # ---------------------------------------------------------------------------
 # Module-level connection pool
 # ---------------------------------------------------------------------------
 _pool: Optional[aioredis.Redis] = None
-_redis_available: bool = False
+# Separate client for pub/sub: subscribed connections block on reads, so they
+# must not inherit the per-command socket timeout.
+_pubsub_client: Optional[aioredis.Redis] = None
+
+# ---------------------------------------------------------------------------
+# Server-side scripts
+# ---------------------------------------------------------------------------
+
+# Set `adaptation` on the highest-scored timeline member atomically, in one
+# round trip.  The member JSON is patched as a string (no cjson round trip),
+# so every other field stays byte-identical.  The top-level "adaptation" key
+# and the full extent of its value are found by walking the JSON (strings,
+# escapes and nesting), so labels with , } or quotes — or nested fields added
+# to the entry later — are handled.
+#   KEYS[1] = timeline key   ARGV[1] = JSON-encoded adaptation label
+_ANNOTATE_LATEST_LUA = """
+local function string_end(s, i)
+  local j = i + 1
+  while j <= #s do
+    local c = s:sub(j, j)
+    if c == '\\\\' then j = j + 2
+    elseif c == '"' then return j
+    else j = j + 1 end
+  end
+  return #s
+end
+
+local function value_end(s, i)
+  local c = s:sub(i, i)
+  if c == '"' then return string_end(s, i) end
+  if c == '{' or c == '[' then
+    local depth, j = 0, i
+    while j <= #s do
+      c = s:sub(j, j)
+      if c == '"' then j = string_end(s, j)
+      elseif c == '{' or c == '[' then depth = depth + 1
+      elseif c == '}' or c == ']' then
+        depth = depth - 1
+        if depth == 0 then return j end
+      end
+      j = j + 1
+    end
+    return #s
+  end
+  local j = s:find('[,}%]]', i)
+  return (j or #s + 1) - 1
+end
+
+local function top_level_key(s, key)
+  local depth, j = 0, 1
+  while j <= #s do
+    local c = s:sub(j, j)
+    if c == '"' then
+      if depth == 1 and s:sub(j, j + #key - 1) == key then return j end
+      j = string_end(s, j)
+    elseif c == '{' or c == '[' then depth = depth + 1
+    elseif c == '}' or c == ']' then depth = depth - 1
+    end
+    j = j + 1
+  end
+end
+
+local latest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+if #latest == 0 then return 0 end
+local member, score = latest[1], latest[2]
+local key = '"adaptation":'
+local at = top_level_key(member, key)
+local patched
+if at then
+  local v = at + #key
+  patched = member:sub(1, v - 1) .. ARGV[1] .. member:sub(value_end(member, v) + 1)
+else
+  local close = member:match('.*()}')
+  patched = member:sub(1, close - 1) .. ',' .. key .. ARGV[1] .. member:sub(close)
+end
+if patched ~= member then
+  redis.call('ZREM', KEYS[1], member)
+  redis.call('ZADD', KEYS[1], score, patched)
+end
+return 1
+"""
+
+# Stream backend: record `adaptation` for the newest stream entry, keyed by
+# its entry ID (stream entries are immutable, so nothing is rewritten).
+#   KEYS[1] = stream key   KEYS[2] = adaptation hash
+#   ARGV[1] = adaptation label   ARGV[2] = TTL seconds
+_ANNOTATE_LATEST_STREAM_LUA = """
+local latest = redis.call('XREVRANGE', KEYS[1], '+', '-', 'COUNT', 1)
+if #latest == 0 then return 0 end
+redis.call('HSET', KEYS[2], latest[1][1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# Stream backend: XADD with the entry ID taken from `t` (ms), so XRANGE is a
+# range query on the timeline's own clock.  A frame older than the stream
+# top is clamped onto it (next sequence number) rather than rejected, so
+# range reads must not cap the ID at `end` (see _get_timeline_stream).
+#   KEYS[1] = stream key   ARGV[1] = t   ARGV[2] = MAXLEN   ARGV[3] = TTL
+#   ARGV[4..] = field / value pairs
+_APPEND_STREAM_LUA = """
+local ms, seq = tonumber(ARGV[1]), 0
+local top = redis.call('XREVRANGE', KEYS[1], '+', '-', 'COUNT', 1)
+if #top > 0 then
+  local top_ms, top_seq = string.match(top[1][1], '(%d+)-(%d+)')
+  if tonumber(top_ms) >= ms then
+    ms, seq = tonumber(top_ms), tonumber(top_seq) + 1
+  end
+end
+local id = string.format('%.0f-%.0f', ms, seq)
+redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], id, unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return id
+"""
+
+_annotate_latest: Optional[AsyncScript] = None
+_append_stream: Optional[AsyncScript] = None
+_annotate_latest_stream: Optional[AsyncScript] = None
 
 
 async def init_redis() -> None:
     """Create the async Redis connection pool. Called at FastAPI startup."""
-    global _pool, _redis_available
+    global _pool, _annotate_latest, _append_stream, _annotate_latest_stream
+    timeout = settings.redis_timeout_ms / 1000
+    _pool = aioredis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        max_connections=20,
+        socket_timeout=timeout,
+        socket_connect_timeout=timeout,
+    )
+    _annotate_latest = _pool.register_script(_ANNOTATE_LATEST_LUA)
+    _append_stream = _pool.register_script(_APPEND_STREAM_LUA)
+    _annotate_latest_stream = _pool.register_script(_ANNOTATE_LATEST_STREAM_LUA)
     try:
-        _pool = aioredis.from_url(
-            settings.redis_url,
-            decode_responses=True,
-            max_connections=20,
-        )
         await _pool.ping()
-        _redis_available = True
+        redis_health.reset()
         logger.info("Redis connected at %s", settings.redis_url)
     except Exception as exc:
-        _redis_available = False
+        redis_health.record_failure(exc)
+        redis_health.trip()
         logger.warning("Redis unavailable (%s) — falling back to in-memory storage", exc)
+    # Probing runs either way, so a Redis that comes up later is picked up.
+    redis_health.start(ping=_pool.ping, resync=_resync_from_memory)
 
 
 async def close_redis() -> None:
     """Gracefully close the connection pool. Called at FastAPI shutdown."""
-    global _pool, _redis_available
+    global _pool, _pubsub_client
+    await redis_health.stop()
+    if _pubsub_client:
+        await _pubsub_client.aclose()
+        _pubsub_client = None
     if _pool:
         await _pool.aclose()
         _pool = None
-        _redis_available = False
         logger.info("Redis connection closed")
 
 
+def redis_available() -> bool:
+    """True when calls go to Redis (pool up and circuit closed)."""
+    return _pool is not None and redis_health.available()
+
+
+async def _call(what: str, fn: Callable[[], Awaitable[T]]) -> Optional[T]:
+    """Run one Redis call through the circuit breaker.
+
+    Returns None — without touching the socket — while the circuit is open,
+    and on an outage error (which is counted towards tripping it).  Command
+    errors such as ResponseError are raised to the caller: falling back to
+    memory would not fix them.
+    """
+    if not redis_available():
+        return None
+    started = time.perf_counter()
+    try:
+        result = await fn()
+    except Exception as exc:
+        if not redis_health.is_outage(exc):
+            raise
+        logger.error("Redis %s failed: %s", what, exc)
+        redis_health.record_failure(exc)
+        return None
+    redis_health.record_success(time.perf_counter() - started)
+    return result
+
+
+def pubsub() -> Optional[aioredis.client.PubSub]:
+    """New PubSub on the dedicated pub/sub client (None before init_redis)."""
+    global _pubsub_client
+    if _pool is None:
+        return None
+    if _pubsub_client is None:
+        _pubsub_client = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=settings.redis_timeout_ms / 1000,
+        )
+    return _pubsub_client.pubsub(ignore_subscribe_messages=True)
+
+
+async def publish(channel: str, message: str) -> Optional[int]:
+    """PUBLISH through the circuit breaker; returns the receiver count."""
+    return await _call(f"PUBLISH {channel}", lambda: _pool.publish(channel, message))
+
+
+def health() -> dict[str, Any]:
+    """Breaker / latency snapshot for /health."""
+    return {**redis_health.snapshot(), "pending_resync": _mem.dirty_count}
+
+
 def _state_key(session_id: str) -> str:
     return f"session:{session_id}:state"
 
@@ -72,90 +269,344 @@ def _timeline_key(session_id: str) -> str:
     return f"session:{session_id}:timeline"
 
 
+def _timeline_stream_key(session_id: str) -> str:
+    return f"session:{session_id}:timeline:stream"
+
+
+def _timeline_adapt_key(session_id: str) -> str:
+    return f"session:{session_id}:timeline:adapt"
+
+
 def _ui_prev_key(session_id: str) -> str:
     return f"session:{session_id}:ui_prev"
 
 
+def _emotion_key(session_id: str) -> str:
+    return f"session:{session_id}:emotion"
+
+
+# ---------------------------------------------------------------------------
+# Write batches (pipelined — one network round trip per batch)
+# ---------------------------------------------------------------------------
+
+class WriteBatch:
+    """Collects writes and sends them to Redis in a single pipeline.
+
+    Each queued write carries both its Redis command(s) and the equivalent
+    in-memory fallback, applied instead if Redis is down or the pipeline
+    fails.  Use via ``async with redis_client.batch() as writes:``.
+    """
+
+    def __init__(self, transaction: bool = False) -> None:
+        self.transaction = transaction
+        self._redis_ops: list[Callable[[aioredis.client.Pipeline], None]] = []
+        self._mem_ops: list[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._redis_ops)
+
+    def _add(
+        self,
+        redis_op: Callable[[aioredis.client.Pipeline], None],
+        mem_op: Callable[[], None],
+    ) -> None:
+        self._redis_ops.append(redis_op)
+        self._mem_ops.append(mem_op)
+
+    def save_game_state(self, state: GameState) -> None:
+        key = _state_key(state.session_id)
+        payload = state.model_dump_json()
+        self._add(
+            lambda pipe: pipe.set(key, payload, ex=settings.session_ttl),
+            lambda: _mem.set(key, payload),
+        )
+
+    def append_timeline(self, session_id: str, entry: TimelineEntry) -> None:
+        key = _timeline_key(session_id)
+        payload = entry.model_dump_json()
+        score = float(entry.t)
+
+        if settings.timeline_stream:
+            stream_key = _timeline_stream_key(session_id)
+
+            def redis_op(pipe: aioredis.client.Pipeline) -> None:
+                _queue_stream_append(pipe, stream_key, entry)
+        else:
+            def redis_op(pipe: aioredis.client.Pipeline) -> None:
+                pipe.zadd(key, {payload: score})
+                pipe.expire(key, settings.session_ttl)
+
+        self._add(redis_op, lambda: _mem.timeline_add(key, score, payload))
+
+    def append_timeline_many(self, session_id: str, entries: list[TimelineEntry]) -> None:
+        """Several entries at once — a single multi-member ZADD (zset backend)."""
+        if not settings.timeline_stream:
+            key = _timeline_key(session_id)
+            members = {e.model_dump_json(): float(e.t) for e in entries}
+
+            def redis_op(pipe: aioredis.client.Pipeline) -> None:
+                pipe.zadd(key, members)
+                pipe.expire(key, settings.session_ttl)
+
+            def mem_op() -> None:
+                for payload, score in members.items():
+                    _mem.timeline_add(key, score, payload)
+
+            self._add(redis_op, mem_op)
+            return
+        # Stream IDs are assigned per entry by the append script
+        for entry in entries:
+            self.append_timeline(session_id, entry)
+
+    def push_emotion_frame(self, session_id: str, signal: EmotionSignal) -> None:
+        self.push_emotion_frames(session_id, [signal])
+
+    def push_emotion_frames(self, session_id: str, signals: list[EmotionSignal]) -> None:
+        key = _emotion_key(session_id)
+        records = [encode_frame(s) for s in signals[-BUFFER_SIZE:]]
+
+        def redis_op(pipe: aioredis.client.Pipeline) -> None:
+            pipe.rpush(key, *records)
+            pipe.ltrim(key, -BUFFER_SIZE, -1)
+            pipe.expire(key, settings.session_ttl)
+
+        def mem_op() -> None:
+            for record in records:
+                _mem.list_push(key, record, BUFFER_SIZE)
+
+        self._add(redis_op, mem_op)
+
+    def annotate_latest_timeline(self, session_id: str, adaptation: str) -> None:
+        """Atomic server-side version of :func:`update_latest_timeline_adaptation`."""
+        key = _timeline_key(session_id)
+        label = json.dumps(adaptation)
+
+        if settings.timeline_stream:
+            keys = (_timeline_stream_key(session_id), _timeline_adapt_key(session_id))
+
+            def redis_op(pipe: aioredis.client.Pipeline) -> None:
+                pipe.scripts.add(_annotate_latest_stream)
+                pipe.evalsha(
+                    _annotate_latest_stream.sha, 2, *keys, adaptation, settings.session_ttl
+                )
+        else:
+            def redis_op(pipe: aioredis.client.Pipeline) -> None:
+                # The pipeline SCRIPT LOADs registered scripts before EVALSHA.
+                pipe.scripts.add(_annotate_latest)
+                pipe.evalsha(_annotate_latest.sha, 1, key, label)
+
+        self._add(redis_op, lambda: _mem_annotate_latest(key, adaptation))
+
+    def save_prev_ui(self, session_id: str, prev_state: PreviousUIState) -> None:
+        key = _ui_prev_key(session_id)
+        payload = prev_state.model_dump_json()
+        self._add(
+            lambda pipe: pipe.set(key, payload, ex=settings.session_ttl),
+            lambda: _mem.set(key, payload),
+        )
+
+    async def execute(self) -> None:
+        if not self._redis_ops:
+            return
+
+        async def run() -> list[Any]:
+            async with _pool.pipeline(transaction=self.transaction) as pipe:
+                for op in self._redis_ops:
+                    op(pipe)
+                return await pipe.execute()
+
+        if await _call(f"pipeline ({len(self)} writes)", run) is not None:
+            self._clear()
+            return
+        # fallback
+        for op in self._mem_ops:
+            op()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._redis_ops.clear()
+        self._mem_ops.clear()
+
+
+@asynccontextmanager
+async def batch(transaction: bool = False) -> AsyncIterator[WriteBatch]:
+    """Queue writes inside the block; they are sent in one round trip on exit.
+
+    Nothing is sent if the block raises.
+    """
+    writes = WriteBatch(transaction=transaction)
+    yield writes
+    await writes.execute()
+
+
 # ---------------------------------------------------------------------------
 # Game State
 # ---------------------------------------------------------------------------
 
 async def save_game_state(state: GameState) -> None:
     """Persist the full game state JSON."""
-    key = _state_key(state.session_id)
-    payload = state.model_dump_json()
-    if _redis_available and _pool:
-        try:
-            await _pool.set(key, payload, ex=settings.session_ttl)
-            return
-        except Exception as exc:
-            logger.error("Redis SET failed for %s: %s", key, exc)
-    # fallback
-    _mem_state[key] = payload
+    async with batch() as writes:
+        writes.save_game_state(state)
 
 
 async def load_game_state(session_id: str) -> Optional[GameState]:
     """Load game state; returns None if session doesn't exist."""
     key = _state_key(session_id)
-    raw: Optional[str] = None
-    if _redis_available and _pool:
-        try:
-            raw = await _pool.get(key)
-        except Exception as exc:
-            logger.error("Redis GET failed for %s: %s", key, exc)
+    raw = await _call(f"GET {key}", lambda: _pool.get(key))
     if raw is None:
-        raw = _mem_state.get(key)
+        raw = _mem.get(key)
     if raw is None:
         return None
     return GameState.model_validate_json(raw)
 
 
+async def load_game_states(session_ids: list[str]) -> Optional[dict[str, GameState]]:
+    """Load many game states in one MGET round trip (missing ids are omitted).
+
+    Returns None when the MGET itself fails, so callers can tell "read
+    failed" from "every session is gone".  With the circuit open the
+    in-memory store is the source of truth and is read instead.
+    """
+    keys = [_state_key(sid) for sid in session_ids]
+    raws: Optional[list[Optional[str]]] = None
+    if keys and redis_available():
+        raws = await _call(f"MGET ({len(keys)} states)", lambda: _pool.mget(keys))
+        if raws is None:
+            return None
+    if raws is None:
+        raws = [None] * len(keys)
+    states: dict[str, GameState] = {}
+    for sid, key, raw in zip(session_ids, keys, raws):
+        if raw is None:
+            raw = _mem.get(key)
+        if raw is not None:
+            states[sid] = GameState.model_validate_json(raw)
+    return states
+
+
+async def save_game_states(states: list[GameState]) -> None:
+    """Persist many game states with a single pipelined round trip."""
+    async with batch() as writes:
+        for state in states:
+            writes.save_game_state(state)
+
+
 async def delete_game_state(session_id: str) -> None:
     key = _state_key(session_id)
-    if _redis_available and _pool:
-        try:
-            await _pool.delete(key)
-        except Exception:
-            pass
-    _mem_state.pop(key, None)
+    await _call(f"DEL {key}", lambda: _pool.delete(key))
+    _mem.delete(key)
 
 
 # ---------------------------------------------------------------------------
-# Timeline (Contract 4 — sorted set, score = timestamp)
+# Timeline (Contract 4 — sorted set, score = timestamp; or a capped stream)
 # ---------------------------------------------------------------------------
 
+def _encode_timeline_fields(entry: TimelineEntry) -> dict[str, str]:
+    """Compact stream fields: t / p(hase) / s(tress) / f(ocus) [/ a(daptation)]."""
+    fields = {
+        "t": str(entry.t),
+        "p": entry.phase.value,
+        "s": repr(entry.stress),
+        "f": repr(entry.focus),
+    }
+    if entry.adaptation is not None:
+        fields["a"] = entry.adaptation
+    return fields
+
+
+def _queue_stream_append(pipe: aioredis.client.Pipeline, key: str, entry: TimelineEntry) -> None:
+    args: list[Any] = [entry.t, settings.timeline_max_entries, settings.session_ttl]
+    for name, value in _encode_timeline_fields(entry).items():
+        args += (name, value)
+    pipe.scripts.add(_append_stream)
+    pipe.evalsha(_append_stream.sha, 1, key, *args)
+
+
+def _decode_timeline_fields(fields: dict[str, str], adaptation: Optional[str]) -> dict[str, Any]:
+    """Stream fields → Contract 4 dict (same shape as the ZSET JSON)."""
+    return {
+        "t": int(fields["t"]),
+        "phase": fields["p"],
+        "stress": float(fields["s"]),
+        "focus": float(fields["f"]),
+        "adaptation": adaptation if adaptation is not None else fields.get("a"),
+    }
+
+
 async def append_timeline(session_id: str, entry: TimelineEntry) -> None:
     """Add a Contract 4 entry to the timeline sorted set."""
-    key = _timeline_key(session_id)
-    payload = entry.model_dump_json()
-    if _redis_available and _pool:
-        try:
-            await _pool.zadd(key, {payload: float(entry.t)})
-            await _pool.expire(key, settings.session_ttl)
-            return
-        except Exception as exc:
-            logger.error("Redis ZADD failed for %s: %s", key, exc)
-    # fallback
-    _mem_timeline.setdefault(key, []).append((float(entry.t), payload))
+    async with batch() as writes:
+        writes.append_timeline(session_id, entry)
+
+
+async def get_timeline(
+    session_id: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> list[TimelineEntry]:
+    """Retrieve the timeline sorted by timestamp, optionally limited to
+    ``start <= t <= end`` (epoch ms, inclusive)."""
+    rows = await get_timeline_dicts(session_id, start, end)
+    return [TimelineEntry.model_validate(r) for r in rows]
 
 
-async def get_timeline(session_id: str) -> list[TimelineEntry]:
-    """Retrieve the full timeline sorted by timestamp."""
+async def get_timeline_dicts(
+    session_id: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """Like :func:`get_timeline`, but returns plain Contract 4 dicts without
+    per-entry model validation (for the downsampling query path)."""
+    if settings.timeline_stream and redis_available():
+        rows = await _get_timeline_stream(session_id, start, end)
+        if rows:
+            return rows
+
     key = _timeline_key(session_id)
-    raw_entries: list[str] = []
+    lo = "-inf" if start is None else start
+    hi = "+inf" if end is None else end
+    raw_entries: Optional[list[str]] = None
 
-    if _redis_available and _pool:
-        try:
-            raw_entries = await _pool.zrangebyscore(key, "-inf", "+inf")
-        except Exception as exc:
-            logger.error("Redis ZRANGEBYSCORE failed for %s: %s", key, exc)
+    if not settings.timeline_stream:
+        raw_entries = await _call(f"ZRANGEBYSCORE {key}", lambda: _pool.zrangebyscore(key, lo, hi))
 
     if not raw_entries:
-        mem = _mem_timeline.get(key, [])
-        mem.sort(key=lambda x: x[0])
-        raw_entries = [item[1] for item in mem]
+        raw_entries = _mem.timeline_range(key, start, end)
+
+    return [json.loads(r) for r in raw_entries]
+
 
-    return [TimelineEntry.model_validate_json(r) for r in raw_entries]
+async def _get_timeline_stream(
+    session_id: str,
+    start: Optional[int],
+    end: Optional[int],
+) -> list[dict[str, Any]]:
+    """XRANGE + adaptation HGETALL in one round trip.
+
+    Entry IDs are ``t`` in ms, but late frames are clamped forward onto the
+    stream top, so an ID is never below its ``t``.  The read is therefore
+    bounded by ID only from below; it runs to the top of the (capped) stream
+    so clamped entries with ``t <= end`` are not missed, then filters on ``t``.
+    """
+    key = _timeline_stream_key(session_id)
+
+    async def run() -> list[Any]:
+        async with _pool.pipeline(transaction=False) as pipe:
+            pipe.xrange(key, "-" if start is None else start, "+")
+            pipe.hgetall(_timeline_adapt_key(session_id))
+            return await pipe.execute()
+
+    result = await _call(f"XRANGE {key}", run)
+    if result is None:
+        return []
+    rows, adaptations = result
+    entries = [_decode_timeline_fields(fields, adaptations.get(entry_id)) for entry_id, fields in rows]
+    entries = [
+        e for e in entries
+        if (start is None or e["t"] >= start) and (end is None or e["t"] <= end)
+    ]
+    entries.sort(key=lambda e: e["t"])
+    return entries
 
 
 async def update_latest_timeline_adaptation(
@@ -165,33 +616,39 @@ async def update_latest_timeline_adaptation(
     """Set the `adaptation` field on the most recent timeline entry.
 
     This is called after an ORACLE turn to annotate which emotion reading
-    triggered a UI adaptation.
+    triggered a UI adaptation.  Runs as one atomic Lua call, so it cannot
+    race a concurrent append_timeline.
     """
-    key = _timeline_key(session_id)
+    async with batch() as writes:
+        writes.annotate_latest_timeline(session_id, adaptation)
 
-    if _redis_available and _pool:
-        try:
-            # Get the latest entry (highest score)
-            entries = await _pool.zrange(key, -1, -1, withscores=True)
-            if not entries:
-                return
-            raw_json, score = entries[0]
-            entry = TimelineEntry.model_validate_json(raw_json)
-            # Remove old member, add updated one
-            await _pool.zrem(key, raw_json)
-            entry.adaptation = adaptation
-            await _pool.zadd(key, {entry.model_dump_json(): score})
-            return
-        except Exception as exc:
-            logger.error("Redis timeline adaptation update failed: %s", exc)
 
-    # fallback
-    mem = _mem_timeline.get(key, [])
-    if mem:
-        score, raw_json = mem[-1]
+def _mem_annotate_latest(key: str, adaptation: str) -> None:
+    def annotate(raw_json: str) -> str:
         entry = TimelineEntry.model_validate_json(raw_json)
         entry.adaptation = adaptation
-        mem[-1] = (score, entry.model_dump_json())
+        return entry.model_dump_json()
+
+    _mem.timeline_update_latest(key, annotate)
+
+
+# ---------------------------------------------------------------------------
+# Emotion window (capped list of compact Contract 1 records)
+# ---------------------------------------------------------------------------
+
+async def push_emotion_frame(session_id: str, signal: EmotionSignal) -> None:
+    """Append a reading to the emotion window, keeping the last BUFFER_SIZE."""
+    async with batch() as writes:
+        writes.push_emotion_frame(session_id, signal)
+
+
+async def load_emotion_window(session_id: str) -> EmotionRingBuffer:
+    """Load the emotion window as a ring buffer (empty if none yet)."""
+    key = _emotion_key(session_id)
+    records = await _call(f"LRANGE {key}", lambda: _pool.lrange(key, 0, -1))
+    if not records:
+        records = _mem.list_range(key)
+    return EmotionRingBuffer.from_records(records)
 
 
 # ---------------------------------------------------------------------------
@@ -199,27 +656,15 @@ async def update_latest_timeline_adaptation(
 # ---------------------------------------------------------------------------
 
 async def save_prev_ui(session_id: str, prev_state: PreviousUIState) -> None:
-    key = _ui_prev_key(session_id)
-    payload = prev_state.model_dump_json()
-    if _redis_available and _pool:
-        try:
-            await _pool.set(key, payload, ex=settings.session_ttl)
-            return
-        except Exception as exc:
-            logger.error("Redis SET failed for %s: %s", key, exc)
-    _mem_ui_prev[key] = payload
+    async with batch() as writes:
+        writes.save_prev_ui(session_id, prev_state)
 
 
 async def load_prev_ui(session_id: str) -> Optional[PreviousUIState]:
     key = _ui_prev_key(session_id)
-    raw: Optional[str] = None
-    if _redis_available and _pool:
-        try:
-            raw = await _pool.get(key)
-        except Exception as exc:
-            logger.error("Redis GET failed for %s: %s", key, exc)
+    raw = await _call(f"GET {key}", lambda: _pool.get(key))
     if raw is None:
-        raw = _mem_ui_prev.get(key)
+        raw = _mem.get(key)
     if raw is None:
         return None
     return PreviousUIState.model_validate_json(raw)
@@ -230,14 +675,62 @@ async def delete_session_keys(session_id: str) -> None:
     keys = [
         _state_key(session_id),
         _timeline_key(session_id),
+        _timeline_stream_key(session_id),
+        _timeline_adapt_key(session_id),
         _ui_prev_key(session_id),
+        _emotion_key(session_id),
     ]
-    if _redis_available and _pool:
-        try:
-            await _pool.delete(*keys)
-        except Exception:
-            pass
-    for k in keys:
-        _mem_state.pop(k, None)
-        _mem_timeline.pop(k, None)
-        _mem_ui_prev.pop(k, None)
+    await _call(f"DEL session:{session_id}:*", lambda: _pool.delete(*keys))
+    _mem.delete(*keys)
+
+
+# ---------------------------------------------------------------------------
+# Re-sync after an outage (called by redis_health before closing the circuit)
+# ---------------------------------------------------------------------------
+
+async def _resync_from_memory() -> None:
+    """Copy every session written to the in-memory store back to Redis.
+
+    Loops until no session is left dirty: writes made while a pipeline is in
+    flight still land in memory (the circuit is half-open) and are picked up
+    by the next pass.  A session is dropped from memory once copied, unless
+    it was written again meanwhile.
+    """
+    while True:
+        session_ids = _mem.take_dirty()
+        if not session_ids:
+            return
+        async with _pool.pipeline(transaction=False) as pipe:
+            for sid in session_ids:
+                for key, value in _mem.export(sid).items():
+                    _resync_key(pipe, key, value)
+            try:
+                await pipe.execute()
+            except Exception:
+                _mem.mark_dirty(session_ids)
+                raise
+        for sid in session_ids:
+            if not _mem.is_dirty(sid):
+                _mem.drop_session(sid)
+        logger.info("Re-synced %d sessions from memory to Redis", len(session_ids))
+
+
+def _resync_key(pipe: aioredis.client.Pipeline, key: str, value: Any) -> None:
+    ttl = settings.session_ttl
+    if key.endswith(":timeline"):
+        # Timeline entries written during the outage are merged in.
+        if settings.timeline_stream:
+            stream_key = key + ":stream"
+            for _, payload in value:
+                _queue_stream_append(pipe, stream_key, TimelineEntry.model_validate_json(payload))
+        elif value:
+            pipe.zadd(key, {payload: score for score, payload in value})
+            pipe.expire(key, ttl)
+    elif key.endswith(":emotion"):
+        if value:
+            pipe.rpush(key, *value)
+            pipe.ltrim(key, -BUFFER_SIZE, -1)
+            pipe.expire(key, ttl)
+    else:
+        # state / ui_prev: the in-memory copy is the newest.
+        pipe.set(key, value, ex=ttl)
@@ -0,0 +1,158 @@
+"""
+SPECTRA Component D — Redis circuit breaker + health probe.
+
+Decides whether redis_client talks to Redis or to the in-memory store:
+  • closed   → Redis is used; connection errors / timeouts are counted
+  • open     → REDIS_BREAKER_FAILURES consecutive failures trip the breaker;
+               every call goes straight to the in-memory store (no socket
+               timeouts paid per call)
+  • half_open→ a probe PING succeeded; sessions written to the in-memory
+               store during the outage are re-synced, then the breaker closes
+  • A background probe PINGs every REDIS_PROBE_INTERVAL_MS in every state,
+    keeping a latency EWMA and detecting failures even when idle
+  • snapshot() exposes state, latency and counters for /health
+
+No redis_client import — the ping and re-sync callables are passed to start().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.config import settings
+
+logger = logging.getLogger("spectra.redis.health")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Errors that mean "Redis is unreachable", as opposed to a bad command.
+_OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+
+# Weight of the newest sample in the latency EWMA.
+_EWMA_ALPHA = 0.2
+
+_state: str = OPEN  # until init_redis() has connected
+_failures = 0
+_changed_at = time.time()
+_latency_ms: Optional[float] = None
+_last_error: Optional[str] = None
+_trips = 0
+_recoveries = 0
+_probe_task: Optional[asyncio.Task] = None
+
+
+def available() -> bool:
+    """True when calls should go to Redis."""
+    return _state == CLOSED
+
+
+def is_outage(exc: BaseException) -> bool:
+    return isinstance(exc, _OUTAGE_ERRORS)
+
+
+def record_success(latency_s: float) -> None:
+    global _failures, _latency_ms
+    _failures = 0
+    ms = latency_s * 1000
+    _latency_ms = ms if _latency_ms is None else _latency_ms + _EWMA_ALPHA * (ms - _latency_ms)
+
+
+def record_failure(exc: BaseException) -> None:
+    """Count an outage-type error; trips the breaker at the threshold."""
+    global _failures, _last_error
+    if not is_outage(exc):
+        return
+    _last_error = f"{type(exc).__name__}: {exc}"
+    _failures += 1
+    if _state == CLOSED and _failures >= settings.redis_breaker_failures:
+        trip()
+
+
+def trip() -> None:
+    global _state, _changed_at, _trips
+    if _state == OPEN:
+        return
+    _state, _changed_at = OPEN, time.time()
+    _trips += 1
+    logger.warning("Redis circuit OPEN (%s) — using in-memory store", _last_error)
+
+
+def reset() -> None:
+    """Close the breaker (Redis reachable and in sync)."""
+    global _state, _changed_at, _failures
+    _state, _changed_at, _failures = CLOSED, time.time(), 0
+
+
+def snapshot() -> dict[str, Any]:
+    return {
+        "state": _state,
+        "since": _changed_at,
+        "latency_ms": round(_latency_ms, 3) if _latency_ms is not None else None,
+        "consecutive_failures": _failures,
+        "trips": _trips,
+        "recoveries": _recoveries,
+        "last_error": _last_error,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Background probe
+# ---------------------------------------------------------------------------
+
+def start(ping: Callable[[], Awaitable[Any]], resync: Callable[[], Awaitable[None]]) -> None:
+    """Start the probe loop (idempotent). Called from init_redis()."""
+    global _probe_task
+    if _probe_task is None or _probe_task.done():
+        _probe_task = asyncio.create_task(_probe_loop(ping, resync))
+
+
+async def stop() -> None:
+    global _probe_task, _state
+    if _probe_task is not None:
+        _probe_task.cancel()
+        try:
+            await _probe_task
+        except asyncio.CancelledError:
+            pass
+        _probe_task = None
+    _state = OPEN
+
+
+async def _probe_loop(
+    ping: Callable[[], Awaitable[Any]],
+    resync: Callable[[], Awaitable[None]],
+) -> None:
+    global _state, _changed_at, _recoveries, _last_error
+    interval = settings.redis_probe_interval_ms / 1000
+    while True:
+        await asyncio.sleep(interval)
+        started = time.perf_counter()
+        try:
+            await ping()
+        except Exception as exc:
+            record_failure(exc)
+            continue
+        record_success(time.perf_counter() - started)
+        if _state == CLOSED:
+            continue
+
+        _state, _changed_at = HALF_OPEN, time.time()
+        logger.info("Redis reachable again — re-syncing in-memory sessions")
+        try:
+            await resync()
+        except Exception as exc:
+            _last_error = f"resync failed: {type(exc).__name__}: {exc}"
+            trip()
+            continue
+        reset()
+        _recoveries += 1
+        logger.info("Redis circuit CLOSED (latency %.2f ms)", _latency_ms or 0.0)
+
@@ -45,7 +45,7 @@ async def get_session_state(session_id: str):
     return SessionState(
         session_id=state.session_id,
         phase=state.phase,
-        time_remaining=state.time_remaining,
+        time_remaining=gsm.time_remaining(state),
         current_score=state.current_score,
         decisions_made=state.decisions_made,
         is_active=state.is_active,
@@ -67,4 +67,4 @@ async def start_session(session_id: str):
         on_end=orchestrator.on_timer_end,
     )
     logger.info("REST — timer started for session %s", session_id)
-    return SessionStarted(time_remaining=state.time_remaining)
+    return SessionStarted(time_remaining=gsm.time_remaining(state))
@@ -1,29 +1,63 @@
 """
 SPECTRA Component D — REST route for emotion timeline retrieval.
 
-GET /api/timeline/{session_id} → full timeline array for debrief screen
+GET /api/timeline/{session_id} → timeline array for debrief screen
+
+Optional query parameters:
+  start / end         epoch-ms bounds on t (inclusive)
+  phase               only entries from one phase
+  adaptations_only    only entries that triggered a UI adaptation
+  max_points          downsample to at most this many points
+  method              "lttb" (default) or "minmax"
 """
 
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
 
-from app.models import TimelineEntry
+from app.models import Phase, TimelineEntry
 from app import redis_client
+from app import timeline_query
 
 logger = logging.getLogger("spectra.routes.timeline")
 
 router = APIRouter(prefix="/api/timeline", tags=["timeline"])
 
 
-@router.get("/{session_id}", response_model=list[TimelineEntry])
-async def get_timeline(session_id: str):
-    """Return the full Contract 4 emotion timeline sorted by timestamp.
+@router.get(
+    "/{session_id}",
+    response_class=JSONResponse,
+    responses={200: {"model": list[TimelineEntry]}},
+)
+async def get_timeline(
+    session_id: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    phase: Optional[Phase] = None,
+    adaptations_only: bool = False,
+    max_points: Optional[int] = Query(None, ge=1),
+    method: timeline_query.Method = "lttb",
+):
+    """Return the Contract 4 emotion timeline sorted by timestamp.
 
     Used by Component C's debrief screen to render the emotion curve.
+    Entries are served as stored (plain dicts), without re-validating each
+    one through TimelineEntry.
     """
-    entries = await redis_client.get_timeline(session_id)
-    logger.info("Timeline fetched for %s — %d entries", session_id, len(entries))
-    return entries
+    rows = await redis_client.get_timeline_dicts(session_id, start, end)
+    result = timeline_query.query(
+        rows,
+        phase=phase.value if phase else None,
+        adaptations_only=adaptations_only,
+        max_points=max_points,
+        method=method,
+    )
+    logger.info(
+        "Timeline fetched for %s — %d entries (%d stored)",
+        session_id, len(result), len(rows),
+    )
+    return JSONResponse(result)
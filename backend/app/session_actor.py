@@ -0,0 +1,205 @@
+"""
+SPECTRA Component D — Per-session actors (optional, ACTOR_MODE=true).
+
+Each active session gets one actor that owns its GameState in memory:
+  • Emotion, speech and tick mutations are queued on a bounded mailbox and
+    applied strictly in arrival order — no read-modify-write races
+  • Handlers are plain (synchronous) functions, so each event is atomic
+  • State is persisted write-behind: at most once per flush interval, and
+    immediately when the game ends
+  • Idle actors flush, stop and are dropped from the registry
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+from app.models import GameState
+from app import redis_client
+
+logger = logging.getLogger("spectra.actor")
+
+T = TypeVar("T")
+
+# session_id → running actor
+_actors: dict[str, "SessionActor"] = {}
+
+
+class ActorClosed(Exception):
+    """Raised when a message is sent to an actor that has already stopped."""
+
+
+class SessionActor:
+    """Owns one session's GameState and applies queued mutations in order."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.state: Optional[GameState] = None
+        self._mailbox: asyncio.Queue[tuple[Callable[[GameState], Any], asyncio.Future]] = (
+            asyncio.Queue(maxsize=settings.actor_mailbox_size)
+        )
+        self._dirty = False
+        self._closed = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def call(self, fn: Callable[[GameState], T]) -> Optional[T]:
+        """Queue ``fn(state)`` and wait for its result.
+
+        Blocks (backpressure) when the mailbox is full.  Returns None if the
+        session does not exist.
+        """
+        if self._closed:
+            raise ActorClosed(self.session_id)
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._mailbox.put((fn, fut))
+        if self._closed:
+            self._drain()
+        return await fut
+
+    async def stop(self) -> None:
+        """Stop processing and flush any pending state."""
+        self._closed = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Mailbox loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        try:
+            self.state = await redis_client.load_game_state(self.session_id)
+            if self.state is None:
+                logger.warning("Actor for %s: no such session", self.session_id)
+                return
+            logger.info("Actor started for session %s", self.session_id)
+            while True:
+                try:
+                    fn, fut = await asyncio.wait_for(
+                        self._mailbox.get(), timeout=settings.actor_idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    if self._mailbox.empty():
+                        logger.info("Actor idle, stopping: %s", self.session_id)
+                        return
+                    continue
+                if fut.cancelled():
+                    continue
+                was_active = self.state.is_active
+                try:
+                    fut.set_result(fn(self.state))
+                except Exception as exc:
+                    fut.set_exception(exc)
+                self._mark_dirty(immediate=was_active and not self.state.is_active)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Actor crashed for session %s", self.session_id)
+        finally:
+            self._closed = True
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if _actors.get(self.session_id) is self:
+                del _actors[self.session_id]
+            self._drain()
+            await self._flush()
+
+    def _drain(self) -> None:
+        """Resolve anything left in the mailbox so callers can retry."""
+        while not self._mailbox.empty():
+            _, fut = self._mailbox.get_nowait()
+            if not fut.done():
+                if self.state is None:
+                    fut.set_result(None)
+                else:
+                    fut.set_exception(ActorClosed(self.session_id))
+
+    # ------------------------------------------------------------------
+    # Write-behind persistence
+    # ------------------------------------------------------------------
+
+    def _mark_dirty(self, immediate: bool = False) -> None:
+        self._dirty = True
+        if immediate:
+            self._schedule_flush(0)
+        elif self._flush_handle is None and self._flush_task is None:
+            self._schedule_flush(settings.actor_flush_interval_ms / 1000)
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            if not self._dirty or self.state is None:
+                return
+            self._dirty = False
+            # Serialised synchronously, so the snapshot is never mid-event.
+            await redis_client.save_game_state(self.state)
+        except Exception:
+            self._dirty = True
+            logger.exception("Actor flush failed for session %s", self.session_id)
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+            if self._dirty and not self._closed and self._flush_handle is None:
+                self._schedule_flush(settings.actor_flush_interval_ms / 1000)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+def get_actor(session_id: str) -> SessionActor:
+    """Return the running actor for a session, spawning one if needed."""
+    actor = _actors.get(session_id)
+    if actor is None or actor.closed:
+        actor = SessionActor(session_id)
+        _actors[session_id] = actor
+    return actor
+
+
+def peek_state(session_id: str) -> Optional[GameState]:
+    """Copy of the in-memory state if an actor has it loaded, else None."""
+    actor = _actors.get(session_id)
+    if actor is None or actor.state is None:
+        return None
+    return actor.state.model_copy(deep=True)
+
+
+async def call(session_id: str, fn: Callable[[GameState], T]) -> Optional[T]:
+    """Run ``fn`` inside the session's actor (retrying if it just stopped)."""
+    while True:
+        try:
+            return await get_actor(session_id).call(fn)
+        except ActorClosed:
+            continue
+
+
+async def close_all() -> None:
+    """Stop every actor, flushing state. Called at FastAPI shutdown."""
+    actors = list(_actors.values())
+    await asyncio.gather(*(a.stop() for a in actors), return_exceptions=True)
+    _actors.clear()
+    if actors:
+        logger.info("Stopped %d session actors", len(actors))
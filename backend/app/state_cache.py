@@ -0,0 +1,158 @@
+"""
+SPECTRA Component D — Write-behind GameState cache (STATE_CACHE=true).
+
+Sits in front of redis_client.save_game_state / load_game_state:
+  • Hot sessions are kept in process; reads never touch Redis after the first
+  • Mutations only mark the entry dirty
+  • Dirty entries are flushed together (one pipelined round trip) at most
+    every STATE_CACHE_FLUSH_MS, or immediately on phase change / game end
+  • Entries idle for STATE_CACHE_IDLE_TIMEOUT seconds are flushed and evicted
+  • flush_all() is called from the FastAPI lifespan teardown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.config import settings
+from app.models import GameState, Phase
+from app import redis_client
+
+logger = logging.getLogger("spectra.cache")
+
+
+@dataclass
+class _Entry:
+    state: GameState
+    dirty: bool = False
+    last_access: float = field(default_factory=time.monotonic)
+    # Phase / active flag as last persisted — a change forces a flush.
+    persisted_phase: Optional[Phase] = None
+    persisted_active: bool = True
+
+
+_entries: dict[str, _Entry] = {}
+_flusher: Optional[asyncio.Task] = None
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_flush_loop())
+
+
+def _cache(state: GameState, dirty: bool) -> _Entry:
+    entry = _Entry(
+        state=state,
+        dirty=dirty,
+        persisted_phase=None if dirty else state.phase,
+        persisted_active=False if dirty else state.is_active,
+    )
+    _entries[state.session_id] = entry
+    _ensure_flusher()
+    return entry
+
+
+async def _load(session_id: str) -> Optional[_Entry]:
+    entry = _entries.get(session_id)
+    if entry is None:
+        state = await redis_client.load_game_state(session_id)
+        if state is None:
+            return None
+        # Another coroutine may have cached it while we were loading.
+        entry = _entries.get(session_id) or _cache(state, dirty=False)
+    entry.last_access = time.monotonic()
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Public API (used by game_state)
+# ---------------------------------------------------------------------------
+
+async def get(session_id: str) -> Optional[GameState]:
+    """Return a copy of the cached state (loading it on a miss)."""
+    entry = await _load(session_id)
+    return entry.state.model_copy(deep=True) if entry else None
+
+
+async def get_live(session_id: str) -> Optional[GameState]:
+    """Return the cached state object itself; caller must :func:`mark_dirty`."""
+    entry = await _load(session_id)
+    return entry.state if entry else None
+
+
+async def put(state: GameState) -> None:
+    """Replace the cached state and mark it dirty."""
+    entry = _entries.get(state.session_id)
+    if entry is None:
+        entry = _cache(state, dirty=True)
+    entry.state = state
+    await mark_dirty(state.session_id)
+
+
+async def mark_dirty(session_id: str) -> None:
+    """Flag a mutation; flushes right away on phase change or game end."""
+    entry = _entries.get(session_id)
+    if entry is None:
+        return
+    entry.dirty = True
+    entry.last_access = time.monotonic()
+    if (
+        entry.state.phase != entry.persisted_phase
+        or entry.state.is_active != entry.persisted_active
+    ):
+        await _flush([session_id])
+
+
+async def flush_all() -> None:
+    """Persist every dirty entry and stop the flusher. Called at shutdown."""
+    global _flusher
+    if _flusher is not None:
+        _flusher.cancel()
+        try:
+            await _flusher
+        except asyncio.CancelledError:
+            pass
+        _flusher = None
+    await _flush(list(_entries))
+    logger.info("State cache flushed (%d sessions)", len(_entries))
+
+
+# ---------------------------------------------------------------------------
+# Flushing / eviction
+# ---------------------------------------------------------------------------
+
+async def _flush(session_ids: list[str]) -> None:
+    dirty = [_entries[sid] for sid in session_ids if sid in _entries and _entries[sid].dirty]
+    if not dirty:
+        return
+    for entry in dirty:
+        entry.dirty = False
+        entry.persisted_phase = entry.state.phase
+        entry.persisted_active = entry.state.is_active
+    try:
+        await redis_client.save_game_states([e.state for e in dirty])
+    except Exception:
+        for entry in dirty:
+            entry.dirty = True
+        logger.exception("State cache flush failed for %d sessions", len(dirty))
+
+
+async def _flush_loop() -> None:
+    interval = settings.state_cache_flush_ms / 1000
+    while _entries:
+        await asyncio.sleep(interval)
+        try:
+            await _flush(list(_entries))
+            cutoff = time.monotonic() - settings.state_cache_idle_timeout
+            for sid in [s for s, e in _entries.items() if e.last_access < cutoff]:
+                entry = _entries[sid]
+                if not entry.dirty:
+                    del _entries[sid]
+                    logger.debug("State cache evicted idle session %s", sid)
+        except Exception:
+            logger.exception("State cache flush loop error")
@@ -0,0 +1,126 @@
+"""
+SPECTRA Component D — Timeline queries for the debrief screen.
+
+Works on plain Contract 4 dicts (as returned by
+redis_client.get_timeline_dicts), never on per-entry pydantic models:
+  • Phase filter and adaptation-only filter
+  • Downsampling to a max-points budget:
+      – "lttb"   Largest-Triangle-Three-Buckets over stress + focus
+      – "minmax" per-bucket min / max of stress and focus (keeps every peak)
+  • Entries carrying an adaptation are always kept, on top of the
+    downsampled curve, and count against the budget
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Iterable, Literal, Optional
+
+Method = Literal["lttb", "minmax"]
+
+# Series the debrief chart plots; both drive point selection.
+SERIES: tuple[str, ...] = ("stress", "focus")
+
+Entry = dict[str, Any]
+
+
+def query(
+    entries: Iterable[Entry],
+    *,
+    phase: Optional[str] = None,
+    adaptations_only: bool = False,
+    max_points: Optional[int] = None,
+    method: Method = "lttb",
+) -> list[Entry]:
+    """Filter then downsample a t-sorted timeline."""
+    rows = [
+        e for e in entries
+        if (phase is None or e["phase"] == phase)
+        and (not adaptations_only or e.get("adaptation"))
+    ]
+    if max_points is None or len(rows) <= max_points:
+        return rows
+    return downsample(rows, max_points, method)
+
+
+def downsample(entries: list[Entry], max_points: int, method: Method = "lttb") -> list[Entry]:
+    """Reduce ``entries`` to at most ``max_points``, keeping adaptation points."""
+    if len(entries) <= max_points:
+        return list(entries)
+    adapted = [e for e in entries if e.get("adaptation")]
+    budget = max_points - len(adapted)
+    if budget <= 0:
+        # Adaptations alone fill the budget: keep the most recent ones.
+        return adapted[-max_points:] if max_points > 0 else []
+    rest = [e for e in entries if not e.get("adaptation")]
+    picked = minmax(rest, budget) if method == "minmax" else lttb(rest, budget)
+    return list(heapq.merge(picked, adapted, key=lambda e: e["t"]))
+
+
+# ---------------------------------------------------------------------------
+# Downsampling algorithms
+# ---------------------------------------------------------------------------
+
+def lttb(entries: list[Entry], threshold: int) -> list[Entry]:
+    """Largest-Triangle-Three-Buckets; first and last points are always kept.
+
+    The triangle area is summed over SERIES, so a point that is a spike in
+    either stress or focus wins its bucket.
+    """
+    size = len(entries)
+    if threshold >= size:
+        return list(entries)
+    if threshold < 3:
+        return [entries[0], entries[-1]][:threshold]
+
+    out = [entries[0]]
+    every = (size - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, size)
+
+        # Average of the next bucket (the last point, for the final bucket).
+        nxt = entries[end:next_end]
+        avg_t = sum(e["t"] for e in nxt) / len(nxt)
+        avg = {k: sum(e[k] for e in nxt) / len(nxt) for k in SERIES}
+
+        pa = entries[a]
+        best_area, best = -1.0, start
+        for j in range(start, end):
+            p = entries[j]
+            area = sum(
+                abs((pa["t"] - avg_t) * (p[k] - pa[k]) - (pa["t"] - p["t"]) * (avg[k] - pa[k]))
+                for k in SERIES
+            )
+            if area > best_area:
+                best_area, best = area, j
+        out.append(entries[best])
+        a = best
+    out.append(entries[-1])
+    return out
+
+
+def minmax(entries: list[Entry], threshold: int) -> list[Entry]:
+    """Keep the min and max of every series in equal-count buckets.
+
+    Up to ``2 * len(SERIES)`` points per bucket, so extremes (peak stress,
+    best focus) always survive.  Falls back to LTTB for tiny budgets.
+    """
+    size = len(entries)
+    if threshold >= size:
+        return list(entries)
+    per_bucket = 2 * len(SERIES)
+    buckets = threshold // per_bucket
+    if buckets < 1:
+        return lttb(entries, threshold)
+
+    keep: set[int] = set()
+    for b in range(buckets):
+        lo, hi = size * b // buckets, size * (b + 1) // buckets
+        idx = range(lo, hi)
+        for k in SERIES:
+            keep.add(min(idx, key=lambda j: entries[j][k]))
+            keep.add(max(idx, key=lambda j: entries[j][k]))
+    return [entries[j] for j in sorted(keep)]
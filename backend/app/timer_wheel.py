@@ -0,0 +1,224 @@
+"""
+SPECTRA Component D — Hierarchical timer wheel.
+
+A single scheduler owns every session's countdown instead of one asyncio
+task per session:
+
+  • O(1) schedule / cancel, amortised O(1) per tick
+  • 1-second resolution, three levels (seconds / minutes / hours)
+  • One driver task fires on_tick / on_end callbacks in batches
+  • Per-tick persistence is pipelined (one MGET + one pipelined SET batch)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger("spectra.timer")
+
+TickCallback = Callable[[str, int], Awaitable[None]]
+EndCallback = Callable[[str], Awaitable[None]]
+
+
+class TimerWheel:
+    """Hashed hierarchical timing wheel keyed by session id.
+
+    Each level has ``slots`` buckets; a bucket at level ``n`` spans
+    ``slots ** n`` ticks.  Entries live in the coarsest level that fits their
+    remaining delay and cascade down as the wheel turns, so only the bucket
+    for the current tick is ever scanned.
+    """
+
+    def __init__(self, slots: int = 60, levels: int = 3) -> None:
+        self.slots = slots
+        self.levels = levels
+        self.now: int = 0
+        self._buckets: list[list[set[str]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        # key → (expiry tick, level, slot)
+        self._entries: dict[str, tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def deadline(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key: str, delay: int) -> None:
+        """Schedule ``key`` to expire ``delay`` ticks from now (re-schedules)."""
+        self.cancel(key)
+        self._place(key, self.now + max(1, delay))
+
+    def cancel(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, level, slot = entry
+        self._buckets[level][slot].discard(key)
+        return True
+
+    def advance(self, ticks: int = 1) -> list[str]:
+        """Move the wheel forward and return every key that expired."""
+        expired: list[str] = []
+        for _ in range(ticks):
+            self.now += 1
+            self._cascade()
+            bucket = self._buckets[0][self.now % self.slots]
+            for key in list(bucket):
+                expiry, _, _ = self._entries[key]
+                if expiry <= self.now:
+                    bucket.discard(key)
+                    del self._entries[key]
+                    expired.append(key)
+        return expired
+
+    # ------------------------------------------------------------------
+
+    def _place(self, key: str, expiry: int) -> None:
+        delay = expiry - self.now
+        level = 0
+        span = 1
+        while level < self.levels - 1 and delay >= span * self.slots:
+            span *= self.slots
+            level += 1
+        # Beyond the top level's range: park in its furthest bucket and let
+        # the cascade re-place it when that bucket comes round.
+        expiry_for_slot = min(expiry, self.now + span * (self.slots - 1))
+        slot = (expiry_for_slot // span) % self.slots
+        self._buckets[level][slot].add(key)
+        self._entries[key] = (expiry, level, slot)
+
+    def _cascade(self) -> None:
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self.now % span:
+                break
+            slot = (self.now // span) % self.slots
+            bucket = self._buckets[level][slot]
+            if not bucket:
+                continue
+            moving = list(bucket)
+            bucket.clear()
+            for key in moving:
+                expiry, _, _ = self._entries[key]
+                self._place(key, max(expiry, self.now))
+
+
+@dataclass
+class _Timer:
+    on_tick: TickCallback
+    on_end: EndCallback
+
+
+class TimerScheduler:
+    """Drives a :class:`TimerWheel` from a single asyncio task.
+
+    ``tick_batch`` is awaited once per second with every live session id and
+    its remaining seconds; it returns the sessions that are still active with
+    the seconds to report (the rest are dropped).  Callbacks are then fired
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        tick_batch: Callable[[dict[str, int]], Awaitable[dict[str, int]]],
+        interval: float = 1.0,
+    ) -> None:
+        self._tick_batch = tick_batch
+        self._interval = interval
+        self._wheel = TimerWheel()
+        self._timers: dict[str, _Timer] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._timers
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def remaining(self, session_id: str) -> Optional[int]:
+        expiry = self._wheel.deadline(session_id)
+        if expiry is None:
+            return None
+        return max(0, expiry - self._wheel.now)
+
+    def add(
+        self,
+        session_id: str,
+        duration: int,
+        on_tick: TickCallback,
+        on_end: EndCallback,
+    ) -> None:
+        self._timers[session_id] = _Timer(on_tick, on_end)
+        self._wheel.schedule(session_id, duration)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        logger.info("Timer started for session %s (%ds, %d active)", session_id, duration, len(self))
+
+    def remove(self, session_id: str) -> bool:
+        self._wheel.cancel(session_id)
+        return self._timers.pop(session_id, None) is not None
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_at = loop.time() + self._interval
+        try:
+            while self._timers:
+                await asyncio.sleep(max(0.0, next_at - loop.time()))
+                # Catch up on missed ticks (e.g. event-loop stall) in one go.
+                ticks = 1 + max(0, int((loop.time() - next_at) // self._interval))
+                next_at += ticks * self._interval
+                try:
+                    await self._fire(self._wheel.advance(ticks))
+                except Exception:
+                    logger.exception("Timer batch failed")
+        except asyncio.CancelledError:
+            logger.info("Timer scheduler cancelled (%d sessions)", len(self))
+            raise
+        finally:
+            self._task = None
+
+    async def _fire(self, expired: list[str]) -> None:
+        # Expired sessions are already out of the wheel, so they report 0.
+        remaining = {sid: self.remaining(sid) or 0 for sid in self._timers}
+
+        alive = await self._tick_batch(remaining)
+        for sid in set(remaining) - set(alive):
+            self.remove(sid)
+
+        timers = {sid: self._timers.get(sid) for sid in alive}
+        ending = [sid for sid in expired if sid in alive]
+        for sid in ending:
+            self._timers.pop(sid, None)
+
+        await _gather_logged(
+            timers[sid].on_tick(sid, seconds) for sid, seconds in alive.items() if timers[sid]
+        )
+        await _gather_logged(timers[sid].on_end(sid) for sid in ending if timers[sid])
+
+
+async def _gather_logged(coros: Iterable[Awaitable[None]]) -> None:
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Timer callback failed: %r", result)
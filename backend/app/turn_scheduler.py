@@ -0,0 +1,196 @@
+"""
+SPECTRA Component D — Per-session speech-turn scheduler.
+
+The WS receive loop hands player_speech to submit() and goes straight back
+to reading frames, so emotion data keeps flowing while Component B thinks:
+  • Turns run on one worker task per session — at most one turn in flight
+    per session, and turns start in arrival order
+  • Speech that arrives mid-turn is handled per TURN_POLICY:
+      queue      wait in a bounded FIFO (TURN_QUEUE_SIZE, oldest dropped)
+      merge      join all waiting utterances into one turn (default)
+      supersede  keep only the newest waiting utterance
+  • With merge / supersede and TURN_CANCEL_IN_FLIGHT, newer speech also
+    cancels a turn still waiting on Component B (orchestrator.prepare_turn,
+    which writes no state) and restarts it with the merged / newest text.
+    Once the response is being applied the turn always completes.
+  • stats() counts the Component B calls avoided by merging / superseding
+    waiting utterances (llm_calls_saved) and, separately, the in-flight
+    calls cancelled — those were already made; it is reported on /health
+  • A worker exits as soon as its queue is empty and is dropped from the
+    registry; the next utterance starts a new one
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Optional
+
+from app.config import settings
+from app import orchestrator
+
+logger = logging.getLogger("spectra.turns")
+
+QUEUE = "queue"
+MERGE = "merge"
+SUPERSEDE = "supersede"
+
+# session_id → running worker
+_workers: dict[str, "TurnWorker"] = {}
+
+_stats = {"turns": 0, "merged": 0, "superseded": 0, "cancelled": 0, "dropped": 0}
+
+
+def _merge(*texts: str) -> str:
+    return " ".join(t.strip() for t in texts if t.strip())
+
+
+class TurnWorker:
+    """Runs one session's speech turns, one at a time."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self._queue: deque[str] = deque()
+        self.in_flight: Optional[str] = None
+        self._committing = False
+        self._prepare: Optional[asyncio.Task] = None
+        self._restart = False
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def submit(self, text: str) -> None:
+        policy = settings.turn_policy.lower()
+        if policy != QUEUE and settings.turn_cancel_in_flight and self._cancellable():
+            self._cancel_in_flight(text, policy)
+            return
+        if policy == MERGE and self._queue:
+            self._queue.append(_merge(self._queue.pop(), text))
+            _stats["merged"] += 1
+            return
+        if policy == SUPERSEDE and self._queue:
+            _stats["superseded"] += len(self._queue)
+            self._queue.clear()
+        elif len(self._queue) >= settings.turn_queue_size:
+            dropped = self._queue.popleft()
+            _stats["dropped"] += 1
+            logger.warning(
+                "Turn queue full for %s — dropping oldest utterance %r", self.session_id, dropped[:80]
+            )
+        self._queue.append(text)
+
+    def _cancellable(self) -> bool:
+        return (
+            self.in_flight is not None
+            and not self._committing
+            and self._prepare is not None
+            and not self._prepare.done()
+        )
+
+    def _cancel_in_flight(self, text: str, policy: str) -> None:
+        if policy == MERGE:
+            restart = _merge(self.in_flight, *self._queue, text)
+            _stats["merged"] += len(self._queue)
+        else:
+            restart = text
+            _stats["superseded"] += len(self._queue)
+        _stats["cancelled"] += 1
+        logger.info(
+            "Newer speech for %s — cancelling in-flight turn %r, restarting with %r",
+            self.session_id, self.in_flight[:80], restart[:80],
+        )
+        self._queue.clear()
+        self._queue.append(restart)
+        self._restart = True
+        self._prepare.cancel()
+
+    async def stop(self) -> None:
+        self._queue.clear()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        try:
+            while self._queue:
+                text = self.in_flight = self._queue.popleft()
+                try:
+                    await self._turn(text)
+                except asyncio.CancelledError:
+                    if not self._restart:
+                        raise
+                    self._restart = False
+                except Exception:
+                    logger.exception("Error processing player_speech for %s", self.session_id)
+                finally:
+                    self.in_flight = None
+                    self._prepare = None
+                    self._committing = False
+        finally:
+            # No await between the empty check and this — submit() can't slip in.
+            if _workers.get(self.session_id) is self:
+                del _workers[self.session_id]
+
+    async def _turn(self, text: str) -> None:
+        ts_start = time.monotonic()
+        self._prepare = asyncio.create_task(orchestrator.prepare_turn(self.session_id, text))
+        try:
+            oracle_resp = await self._prepare
+        except asyncio.CancelledError:
+            self._prepare.cancel()
+            raise
+        if oracle_resp is None:
+            return
+        self._committing = True
+        _stats["turns"] += 1
+        await orchestrator.apply_turn(self.session_id, text, oracle_resp, ts_start)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+def submit(session_id: str, text: str) -> None:
+    """Queue a speech turn for the session; never waits for it to run."""
+    worker = _workers.get(session_id)
+    if worker is None:
+        worker = _workers[session_id] = TurnWorker(session_id)
+    elif worker.in_flight is not None:
+        logger.info(
+            "Turn in flight for %s — %s %r (%d waiting)",
+            session_id, settings.turn_policy, text[:80], worker.pending,
+        )
+    worker.submit(text)
+
+
+def busy(session_id: str) -> bool:
+    """True while a turn is running or waiting for the session."""
+    return session_id in _workers
+
+
+def stats() -> dict[str, Any]:
+    """Turn counters; llm_calls_saved = merged + superseded.
+
+    A cancelled turn saves nothing — its Component B call was already made
+    and its replacement makes another — so ``cancelled`` is reported apart.
+    """
+    return {
+        **_stats,
+        "llm_calls_saved": _stats["merged"] + _stats["superseded"],
+        "active_sessions": len(_workers),
+    }
+
+
+async def close_all() -> None:
+    """Cancel every worker (queued turns are discarded). Called at shutdown."""
+    workers = list(_workers.values())
+    await asyncio.gather(*(w.stop() for w in workers), return_exceptions=True)
+    _workers.clear()
+    if workers:
+        logger.info("Stopped %d turn workers", len(workers))
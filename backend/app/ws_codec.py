@@ -0,0 +1,55 @@
+"""
+SPECTRA Component D — WebSocket frame encodings.
+
+  • JSON text frames are the default and what every existing client speaks
+  • Clients that offer the ``spectra.msgpack.v1`` subprotocol (Sec-WebSocket-
+    Protocol) get MessagePack binary frames both ways — same message shapes,
+    ~10–25% fewer bytes and cheaper decoding (bench_ws_codec.py)
+  • msgpack is optional: without it installed the subprotocol is simply
+    never negotiated
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK = "spectra.msgpack.v1"
+
+
+def negotiate(offered: Iterable[str]) -> Optional[str]:
+    """Pick the subprotocol to accept from the client's offer (None = JSON)."""
+    if msgpack is not None and MSGPACK in offered:
+        return MSGPACK
+    return None
+
+
+def pack(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def json_to_msgpack(payload: str) -> bytes:
+    """Re-encode an already-serialised JSON message (bus deliveries)."""
+    return pack(json.loads(payload))
+
+
+def decode(message: dict) -> Any:
+    """Decode one ASGI ``websocket.receive`` event (text or binary frame).
+
+    Raises ValueError for malformed frames.
+    """
+    text = message.get("text")
+    if text is not None:
+        return json.loads(text)
+    data = message.get("bytes")
+    if data is None or msgpack is None:
+        raise ValueError("unsupported frame")
+    try:
+        return msgpack.unpackb(data, raw=False)
+    except Exception as exc:
+        raise ValueError(f"invalid msgpack frame: {exc}") from exc
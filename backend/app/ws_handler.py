@@ -3,7 +3,24 @@ SPECTRA Component D — WebSocket connection manager + message routing.
 
 Supports multiple simultaneous connections per session (Component A + C both
 connect to the same session).  Messages are broadcast to ALL connections in a
-session so both components receive updates.
+session so both components receive updates — across workers too, via
+broadcast_bus when WS_BUS_ENABLED=true.
+
+Each connection has a bounded outbound queue drained by its own writer task,
+so one slow tab never stalls the others or the caller:
+  • broadcast() only enqueues (no socket I/O on the caller's path)
+  • per-type policies: "conflate" (only the newest pending message of that
+    type is sent), "drop" (discarded while the queue is backed up), or
+    "keep" (always queued)
+  • a connection whose queue overflows with "keep" messages, or whose send
+    takes longer than WS_SEND_TIMEOUT, is disconnected as a slow consumer
+  • a connection may declare the types it wants ({"type": "subscribe",
+    "types": [...]}); everything else is never queued for it
+  • a connection that sent ui_sync receives ui_delta instead of ui_update
+  • connections that negotiated spectra.msgpack.v1 (see ws_codec) get binary
+    frames; each encoding is produced at most once per message
+  • broadcast_latest() caps a type's per-session rate — frames arriving
+    faster are coalesced and only the newest is sent
 """
 
 from __future__ import annotations
@@ -11,15 +28,129 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any
+import time
+from collections import deque
+from typing import Any, Optional
 
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+from app.config import settings
+from app import broadcast_bus
+from app import ws_codec
+
 logger = logging.getLogger("spectra.ws")
 
-# session_id → set of active WebSocket connections
-_connections: dict[str, set[WebSocket]] = {}
+CONFLATE = "conflate"
+DROP = "drop"
+KEEP = "keep"
+
+# Outbound policy per message type (anything unlisted is KEEP).
+SEND_POLICY: dict[str, str] = {
+    "timer_tick": CONFLATE,
+    "game_state_update": CONFLATE,
+    "emotion_update": DROP,
+}
+
+# WS close code for slow consumers ("try again later").
+_CLOSE_SLOW_CONSUMER = 1013
+
+
+class Connection:
+    """One WebSocket plus its bounded outbound queue and writer task."""
+
+    def __init__(self, session_id: str, ws: WebSocket, binary: bool = False) -> None:
+        self.session_id = session_id
+        self.ws = ws
+        self.binary = binary  # msgpack frames instead of JSON text
+        self.maxsize = settings.ws_send_queue_size
+        # (type, payload) — payload None means "send the newest conflated value"
+        self._queue: deque[tuple[str, Optional[str | bytes]]] = deque()
+        self._latest: dict[str, str | bytes] = {}
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+        # None = every type; otherwise only these are queued
+        self.interests: Optional[frozenset[str]] = None
+        self.ui_delta = False
+        self._writer = asyncio.create_task(self._run())
+
+    def wants(self, msg_type: str) -> bool:
+        """Whether broadcasts of this type are queued for this connection."""
+        if msg_type == "ui_update" and self.ui_delta:
+            return False
+        if msg_type == "ui_delta":
+            if not self.ui_delta:
+                return False
+            msg_type = "ui_update"  # subscriptions name the full type
+        return self.interests is None or msg_type in self.interests
+
+    def enqueue(self, msg_type: str, payload: str | bytes) -> None:
+        if self._closed:
+            return
+        policy = SEND_POLICY.get(msg_type, KEEP)
+        if policy == CONFLATE:
+            if msg_type not in self._latest:
+                self._queue.append((msg_type, None))
+            self._latest[msg_type] = payload
+        elif policy == DROP and len(self._queue) >= self.maxsize // 2:
+            self.dropped += 1
+            return
+        else:
+            if len(self._queue) >= self.maxsize:
+                self._close_slow(f"send queue full ({self.maxsize})")
+                return
+            self._queue.append((msg_type, payload))
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """Stop the writer (the socket itself is closed by its owner)."""
+        self._closed = True
+        self._queue.clear()
+        self._latest.clear()
+        self._writer.cancel()
+
+    async def _run(self) -> None:
+        timeout = settings.ws_send_timeout
+        try:
+            while True:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                msg_type, payload = self._queue.popleft()
+                if payload is None:
+                    payload = self._latest.pop(msg_type)
+                if isinstance(payload, bytes):
+                    await asyncio.wait_for(self.ws.send_bytes(payload), timeout)
+                else:
+                    await asyncio.wait_for(self.ws.send_text(payload), timeout)
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            self._close_slow(f"send took longer than {timeout}s")
+        except Exception:
+            logger.warning("Removed dead WS from session %s", self.session_id)
+            self._closed = True
+            _unregister(self.session_id, self.ws)
+
+    def _close_slow(self, reason: str) -> None:
+        logger.warning(
+            "Disconnecting slow WS consumer from session %s: %s (dropped %d)",
+            self.session_id, reason, self.dropped,
+        )
+        self.close()
+        _unregister(self.session_id, self.ws)
+        asyncio.get_running_loop().create_task(_close_quietly(self.ws, _CLOSE_SLOW_CONSUMER))
+
+
+# session_id → {WebSocket: Connection} for this worker's sockets
+_connections: dict[str, dict[WebSocket, Connection]] = {}
+
+# broadcast_latest() state, keyed by (session_id, msg_type)
+_last_sent: dict[tuple[str, str], float] = {}
+_pending: dict[tuple[str, str], BaseModel] = {}
+_flushers: dict[tuple[str, str], asyncio.Task] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -27,64 +158,191 @@ _connections: dict[str, set[WebSocket]] = {}
 # ---------------------------------------------------------------------------
 
 async def connect(session_id: str, ws: WebSocket) -> None:
-    """Accept and register a WebSocket for the given session."""
-    await ws.accept()
-    _connections.setdefault(session_id, set()).add(ws)
-    count = len(_connections[session_id])
+    """Accept (negotiating the frame encoding) and register a WebSocket."""
+    subprotocol = ws_codec.negotiate(ws.scope.get("subprotocols", ()))
+    await ws.accept(subprotocol=subprotocol)
+    conns = _connections.setdefault(session_id, {})
+    conns[ws] = Connection(session_id, ws, binary=subprotocol == ws_codec.MSGPACK)
+    count = len(conns)
+    if count == 1:
+        await broadcast_bus.join(session_id)
     logger.info(
-        "WS connected: session=%s  (total connections for session: %d)",
+        "WS connected: session=%s  encoding=%s  (total connections for session: %d)",
         session_id,
+        subprotocol or "json",
         count,
     )
 
 
 def disconnect(session_id: str, ws: WebSocket) -> None:
     """Un-register a WebSocket.  Safe to call if already removed."""
-    conns = _connections.get(session_id)
-    if conns:
-        conns.discard(ws)
-        if not conns:
-            del _connections[session_id]
+    _unregister(session_id, ws)
     logger.info("WS disconnected: session=%s", session_id)
 
 
+def _unregister(session_id: str, ws: WebSocket) -> None:
+    conns = _connections.get(session_id)
+    if not conns:
+        return
+    conn = conns.pop(ws, None)
+    if conn is not None:
+        conn.close()
+    if not conns:
+        del _connections[session_id]
+        broadcast_bus.leave(session_id)
+        _drop_throttles(session_id)
+
+
+def enable_ui_delta(session_id: str, ws: WebSocket) -> None:
+    """Send this connection ui_delta messages instead of full ui_update."""
+    conn = _connections.get(session_id, {}).get(ws)
+    if conn is not None:
+        conn.ui_delta = True
+
+
+def subscribe(session_id: str, ws: WebSocket, types: Optional[list[str]]) -> None:
+    """Limit a connection to the given message types (None = all types)."""
+    conn = _connections.get(session_id, {}).get(ws)
+    if conn is None:
+        return
+    conn.interests = None if types is None else frozenset(types)
+    logger.info(
+        "WS subscribed: session=%s  types=%s",
+        session_id,
+        "all" if types is None else ",".join(sorted(conn.interests)) or "none",
+    )
+
+
 def session_has_connections(session_id: str) -> bool:
     return bool(_connections.get(session_id))
 
 
+def connection_count(session_id: str) -> int:
+    return len(_connections.get(session_id, ()))
+
+
 # ---------------------------------------------------------------------------
 # Broadcasting
 # ---------------------------------------------------------------------------
 
 async def broadcast(session_id: str, message: dict | BaseModel) -> None:
-    """Send a JSON message to every connection in a session."""
-    conns = _connections.get(session_id)
-    if not conns:
+    """Queue a JSON message for every connection in a session (on any worker).
+
+    Never waits on a socket; only the cross-worker publish (when the bus is
+    needed) awaits Redis.  The payload is serialised exactly once and shared
+    by every connection (and the bus); the type comes from the message itself.
+    Outgoing messages are the WS* models in app.models — plain dicts are
+    still accepted but must carry a "type" key.
+    """
+    if isinstance(message, BaseModel):
+        msg_type = getattr(message, "type", "")
+    else:
+        msg_type = message.get("type", "")
+
+    publish = broadcast_bus.needs_publish(session_id)
+    if not publish and not _wanted(session_id, msg_type):
         return
 
     if isinstance(message, BaseModel):
         payload = message.model_dump_json()
     else:
         payload = json.dumps(message)
+    packed = None
+    if _wanted(session_id, msg_type, binary=True):
+        obj = message.model_dump(mode="json") if isinstance(message, BaseModel) else message
+        packed = ws_codec.pack(obj)
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[WS → clients] session=%s  type=%s  payload=%s", session_id, msg_type, payload[:200])
+
+    await deliver_local(session_id, msg_type, payload, packed)
+    if publish:
+        await broadcast_bus.publish(session_id, msg_type, payload)
+
+
+def _wanted(session_id: str, msg_type: str, binary: Optional[bool] = None) -> bool:
+    return any(
+        conn.wants(msg_type) and (binary is None or conn.binary == binary)
+        for conn in _connections.get(session_id, {}).values()
+    )
+
 
-    import json as _json
+async def broadcast_latest(session_id: str, message: BaseModel, max_hz: float) -> None:
+    """Broadcast at most ``max_hz`` messages of this type per session.
+
+    A message arriving inside the interval replaces any pending one and is
+    sent when the interval ends (latest value wins).  ``max_hz <= 0``
+    broadcasts every message.
+    """
+    if max_hz <= 0:
+        await broadcast(session_id, message)
+        return
+    key = (session_id, message.type)
+    wait = _last_sent.get(key, 0.0) + 1.0 / max_hz - time.monotonic()
+    if wait <= 0 and key not in _flushers:
+        _last_sent[key] = time.monotonic()
+        await broadcast(session_id, message)
+        return
+    _pending[key] = message
+    if key not in _flushers:
+        _flushers[key] = asyncio.get_running_loop().create_task(_flush_latest(key, wait))
+
+
+async def _flush_latest(key: tuple[str, str], delay: float) -> None:
     try:
-        _preview = _json.loads(payload)
-        logger.info("[WS → clients] session=%s  type=%s  payload=%s", session_id, _preview.get("type", "?"), payload[:200])
-    except Exception:
+        await asyncio.sleep(delay)
+        message = _pending.pop(key, None)
+        if message is not None:
+            _last_sent[key] = time.monotonic()
+            await broadcast(key[0], message)
+    except asyncio.CancelledError:
         pass
+    except Exception:
+        logger.exception("Coalesced %s broadcast failed for session %s", key[1], key[0])
+    finally:
+        if _flushers.get(key) is asyncio.current_task():
+            del _flushers[key]
 
-    dead: list[WebSocket] = []
-    for ws in conns:
-        try:
-            await ws.send_text(payload)
-        except Exception:
-            dead.append(ws)
 
-    # Clean up dead sockets
-    for ws in dead:
-        conns.discard(ws)
-        logger.warning("Removed dead WS from session %s", session_id)
+def _drop_throttles(session_id: str) -> None:
+    for key in [k for k in _last_sent if k[0] == session_id]:
+        del _last_sent[key]
+    for key in [k for k in _flushers if k[0] == session_id]:
+        _pending.pop(key, None)
+        _flushers.pop(key).cancel()
+
+
+async def deliver_local(
+    session_id: str, msg_type: str, payload: str, packed: Optional[bytes] = None
+) -> None:
+    """Queue an already-serialised message for this worker's sockets only.
+
+    ``packed`` is the msgpack encoding; when omitted (bus deliveries) it is
+    derived from the JSON once, and only if a binary socket wants it.
+    """
+    conns = _connections.get(session_id)
+    if not conns:
+        return
+    for conn in list(conns.values()):
+        if not conn.wants(msg_type):
+            continue
+        if conn.binary:
+            if packed is None:
+                packed = ws_codec.json_to_msgpack(payload)
+            conn.enqueue(msg_type, packed)
+        else:
+            conn.enqueue(msg_type, payload)
+
+
+async def send_queued(session_id: str, ws: WebSocket, message: BaseModel) -> None:
+    """Queue a message for one local connection, in order with its broadcasts."""
+    conn = _connections.get(session_id, {}).get(ws)
+    if conn is None:
+        return
+    if conn.binary:
+        conn.enqueue(message.type, ws_codec.pack(message.model_dump(mode="json")))
+    else:
+        conn.enqueue(message.type, message.model_dump_json())
 
 
 async def send_to(ws: WebSocket, message: dict | BaseModel) -> None:
@@ -102,10 +360,17 @@ async def send_to(ws: WebSocket, message: dict | BaseModel) -> None:
 
 async def close_all(session_id: str) -> None:
     """Force-close all WebSocket connections for a session."""
-    conns = _connections.pop(session_id, set())
-    for ws in conns:
-        try:
-            await ws.close()
-        except Exception:
-            pass
+    conns = _connections.pop(session_id, {})
+    broadcast_bus.leave(session_id)
+    _drop_throttles(session_id)
+    for ws, conn in conns.items():
+        conn.close()
+        await _close_quietly(ws)
     logger.info("Closed all WS connections for session %s", session_id)
+
+
+async def _close_quietly(ws: WebSocket, code: int = 1000) -> None:
+    try:
+        await ws.close(code=code)
+    except Exception:
+        pass
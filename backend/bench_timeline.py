@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Contract 4 timeline backends (ZSET vs Stream) in redis_client.
+
+Needs a running Redis (REDIS_URL, default redis://localhost:6379).  For each
+backend it appends ENTRIES frames per session through the same pipelined
+WriteBatch the orchestrator uses, annotates every ANNOTATE_EVERY-th frame,
+then reads each timeline back (full and a 60 s window) and reports timings
+plus MEMORY USAGE of the timeline keys.
+
+Run:  python bench_timeline.py [sessions] [entries]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from app import redis_client
+from app.config import settings
+from app.models import Phase, TimelineEntry
+
+SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+ENTRIES = int(sys.argv[2]) if len(sys.argv) > 2 else 300  # one 5-minute game at 1 Hz
+ANNOTATE_EVERY = 15
+
+
+def make_entry(t: int, rng: random.Random) -> TimelineEntry:
+    return TimelineEntry(
+        t=t,
+        phase=rng.choice([Phase.infiltrate, Phase.vault, Phase.escape]),
+        stress=round(rng.random(), 2),
+        focus=round(rng.random(), 2),
+    )
+
+
+async def bench(backend: str) -> None:
+    settings.timeline_backend = backend
+    rng = random.Random(42)
+    sessions = [f"bench-{backend}-{i}" for i in range(SESSIONS)]
+    for sid in sessions:
+        await redis_client.delete_session_keys(sid)
+
+    base = int(time.time() * 1000)
+    t0 = time.perf_counter()
+    for n in range(ENTRIES):
+        async with redis_client.batch() as writes:
+            for sid in sessions:
+                writes.append_timeline(sid, make_entry(base + n * 1000, rng))
+                if n % ANNOTATE_EVERY == ANNOTATE_EVERY - 1:
+                    writes.annotate_latest_timeline(sid, "ui_simplified")
+    write_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    counts = [len(await redis_client.get_timeline(sid)) for sid in sessions]
+    read_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for sid in sessions:
+        await redis_client.get_timeline(sid, start=base + 60_000, end=base + 120_000)
+    window_s = time.perf_counter() - t0
+
+    keys = [
+        k for sid in sessions
+        for k in (
+            redis_client._timeline_key(sid),
+            redis_client._timeline_stream_key(sid),
+            redis_client._timeline_adapt_key(sid),
+        )
+    ]
+    mem = sum([await redis_client._pool.memory_usage(k) or 0 for k in keys])
+
+    frames = SESSIONS * ENTRIES
+    print(
+        f"{backend:<7} write {frames / write_s:>9.0f} frames/s | "
+        f"full read {read_s / SESSIONS * 1000:>6.2f} ms | "
+        f"60s window {window_s / SESSIONS * 1000:>6.2f} ms | "
+        f"{mem / frames:>6.1f} B/frame | "
+        f"{sum(counts)}/{frames} entries kept"
+    )
+    for sid in sessions:
+        await redis_client.delete_session_keys(sid)
+
+
+async def main() -> None:
+    await redis_client.init_redis()
+    if not redis_client.redis_available():
+        sys.exit(f"Redis not reachable at {settings.redis_url}")
+    print(f"{SESSIONS} sessions × {ENTRIES} frames")
+    for backend in ("zset", "stream"):
+        await bench(backend)
+    await redis_client.close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark WS frame encodings: JSON text vs MessagePack (spectra.msgpack.v1).
+
+No server needed.  For an inbound Contract 1 frame and each common outbound
+message it reports bytes on the wire plus CPU per frame to encode (as the
+sender does) and to decode (as the receiver does, via ws_codec.decode for
+inbound frames).
+
+Run:  python bench_ws_codec.py [iterations]
+"""
+
+import json
+import sys
+import time
+
+from app import ws_codec
+from app.models import (
+    EmotionScores,
+    EmotionSignal,
+    OptionItem,
+    UICommands,
+    WSEmotionData,
+    WSEmotionUpdate,
+    WSOracleSpeech,
+    WSTimerTick,
+    WSUIUpdate,
+)
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+SIGNAL = EmotionSignal(
+    timestamp=1740153600000,
+    emotions=EmotionScores(stress=0.72, focus=0.15, confusion=0.58, confidence=0.10, neutral=0.05),
+    dominant="stress",
+    face_detected=True,
+)
+
+MESSAGES = {
+    "emotion_data (in)": WSEmotionData(data=SIGNAL),
+    "emotion_update": WSEmotionUpdate(data=SIGNAL),
+    "ui_update": WSUIUpdate(
+        data=UICommands(
+            panels_visible=["main", "stats", "radar"],
+            options=[OptionItem(id=k, label=f"Node {k}") for k in "ABC"],
+        ),
+        version=7,
+    ),
+    "oracle_speech": WSOracleSpeech(
+        text="Easy. Node A is weakest — trace it, then we move.", voice_style="calm_reassuring"
+    ),
+    "timer_tick": WSTimerTick(time_remaining=187),
+}
+
+
+def per_frame_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main() -> None:
+    if ws_codec.msgpack is None:
+        raise SystemExit("msgpack is not installed (pip install msgpack)")
+    print(f"{ITERATIONS} iterations per cell\n")
+    print(f"{'message':<20} {'json B':>7} {'mp B':>6} {'saved':>6}   "
+          f"{'json enc':>9} {'mp enc':>8}   {'json dec':>9} {'mp dec':>8}  (µs/frame)")
+    for name, msg in MESSAGES.items():
+        text = msg.model_dump_json()
+        packed = ws_codec.pack(msg.model_dump(mode="json"))
+        json_enc = per_frame_us(msg.model_dump_json)
+        mp_enc = per_frame_us(lambda: ws_codec.pack(msg.model_dump(mode="json")))
+        json_dec = per_frame_us(lambda: ws_codec.decode({"text": text}))
+        mp_dec = per_frame_us(lambda: ws_codec.decode({"bytes": packed}))
+        size_json = len(text.encode())
+        saved = 1 - len(packed) / size_json
+        print(f"{name:<20} {size_json:>7} {len(packed):>6} {saved:>6.0%}   "
+              f"{json_enc:>9.2f} {mp_enc:>8.2f}   {json_dec:>9.2f} {mp_dec:>8.2f}")
+
+    # Bus deliveries arrive as JSON and are re-packed once per message
+    text = MESSAGES["emotion_update"].model_dump_json()
+    print(f"\nbus json→msgpack re-pack (emotion_update): "
+          f"{per_frame_us(lambda: ws_codec.json_to_msgpack(text)):.2f} µs/frame")
+    # Reference: the stdlib encoder the old dict broadcasts used
+    obj = json.loads(text)
+    print(f"json.dumps(dict) (emotion_update):          {per_frame_us(lambda: json.dumps(obj)):.2f} µs/frame")
+
+
+if __name__ == "__main__":
+    main()
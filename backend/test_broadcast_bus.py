@@ -0,0 +1,157 @@
+"""
+Unit tests for cross-worker broadcast bus membership + delivery rules.
+
+Run:  python -m pytest test_broadcast_bus.py -v
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+import fakeredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app import broadcast_bus as bus
+from app.config import settings
+
+
+class TestBusMembership(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.delivered = []
+        self.published = []
+
+        async def deliver(session_id, msg_type, payload):
+            self.delivered.append((session_id, msg_type, payload))
+
+        async def publish(channel, data):
+            self.published.append((channel, data))
+            return 1
+
+        patches = [
+            mock.patch.object(settings, "ws_bus_enabled", True),
+            mock.patch("app.broadcast_bus.redis_client.publish", publish),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        await bus.start(deliver)
+        # As if join() had subscribed this worker to session "s".
+        bus._remote["s"] = set()
+
+    async def asyncTearDown(self):
+        await bus.stop()
+
+    async def test_all_local_skips_the_bus(self):
+        self.assertFalse(bus.needs_publish("s"))
+
+    async def test_unknown_session_always_publishes(self):
+        self.assertTrue(bus.needs_publish("elsewhere"))
+
+    async def test_remote_join_is_answered_and_tracked(self):
+        await bus._handle("s", "w2\njoin\n")
+        self.assertTrue(bus.needs_publish("s"))
+        self.assertEqual(self.published, [("session:s:ws", f"{bus.WORKER_ID}\nhere\n")])
+        await bus._handle("s", "w2\nleave\n")
+        self.assertFalse(bus.needs_publish("s"))
+
+    async def test_messages_delivered_locally_except_own(self):
+        await bus._handle("s", 'w2\nmsg\nui_update\n{"type": "ui_update"}')
+        await bus._handle("s", f'{bus.WORKER_ID}\nmsg\necho\n{{"type": "echo"}}')
+        self.assertEqual(self.delivered, [("s", "ui_update", '{"type": "ui_update"}')])
+
+    async def test_publish_wraps_payload_with_worker_id(self):
+        await bus.publish("s", "timer_tick", '{"type": "timer_tick"}')
+        self.assertEqual(
+            self.published,
+            [("session:s:ws", f'{bus.WORKER_ID}\nmsg\ntimer_tick\n{{"type": "timer_tick"}}')],
+        )
+
+    async def test_disabled_bus_never_publishes(self):
+        with mock.patch.object(settings, "ws_bus_enabled", False):
+            self.assertFalse(bus.needs_publish("elsewhere"))
+
+
+async def eventually(check, timeout: float = 2.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not check():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+class TestBusOverRedis(unittest.IsolatedAsyncioTestCase):
+    """Real pub/sub round trips against fakeredis (another worker = ``other``)."""
+
+    async def asyncSetUp(self):
+        self.server = fakeredis.FakeServer()
+        self.other = fakeredis.FakeAsyncRedis(server=self.server, decode_responses=True)
+        self.delivered = []
+
+        async def deliver(session_id, msg_type, payload):
+            self.delivered.append((session_id, msg_type, payload))
+
+        def pubsub():
+            client = fakeredis.FakeAsyncRedis(server=self.server, decode_responses=True)
+            return client.pubsub(ignore_subscribe_messages=True)
+
+        async def publish(channel, data):
+            try:
+                return await self.other.publish(channel, data)
+            except RedisConnectionError:
+                return None  # as the circuit breaker would
+
+        patches = [
+            mock.patch.object(settings, "ws_bus_enabled", True),
+            mock.patch.object(settings, "redis_probe_interval_ms", 20),
+            mock.patch.object(bus, "_POLL_S", 0.05),
+            mock.patch("app.broadcast_bus.redis_client.pubsub", pubsub),
+            mock.patch("app.broadcast_bus.redis_client.publish", publish),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        await bus.start(deliver)
+
+    async def asyncTearDown(self):
+        self.server.connected = True
+        await bus.stop()
+        await self.other.aclose()
+
+    async def send_from_other_worker(self, n: int) -> bool:
+        await self.other.publish("session:s:ws", f"w2\nmsg\nui_update\n{{\"n\": {n}}}")
+        return await eventually(lambda: ("s", "ui_update", f'{{"n": {n}}}') in self.delivered)
+
+    async def test_delivery_resumes_after_the_connection_drops(self):
+        await bus.join("s")
+        self.assertTrue(await self.send_from_other_worker(1))
+        dead = bus._pubsub
+
+        with self.assertLogs("spectra.bus", "WARNING") as logs:
+            self.server.connected = False
+            await dead.connection.disconnect()
+            self.assertTrue(await eventually(lambda: logs.output))  # reader noticed
+            await asyncio.sleep(0.1)  # re-subscribe keeps failing meanwhile
+            self.server.connected = True
+
+        self.assertTrue(await eventually(lambda: bus._pubsub is not dead))
+        self.assertTrue(await self.send_from_other_worker(2))
+        self.assertIn("s", bus._remote)
+
+    async def test_reconnect_before_scheduled_leave_keeps_the_subscription(self):
+        await bus.join("s")
+        bus.leave("s")        # last local socket gone — _leave is only scheduled
+        await bus.join("s")   # a new socket for the session connects straight away
+        await asyncio.sleep(0.05)
+        self.assertIn("s", bus._remote)
+        self.assertTrue(await self.send_from_other_worker(1))
+
+    async def test_leave_without_reconnect_unsubscribes(self):
+        await bus.join("s")
+        bus.leave("s")
+        self.assertTrue(await eventually(lambda: "s" not in bus._remote))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Unit tests for the emotion ring buffer + EmotionProcessor statistics, and
+the batched emotion window / timeline writes.
+
+Run:  python -m pytest test_emotion_buffer.py -v
+"""
+
+import random
+import unittest
+from unittest import mock
+
+from app import redis_client
+from app.config import settings
+from app.emotion_buffer import BUFFER_SIZE, EmotionRingBuffer, decode_frame, encode_frame
+from app.emotion_processor import TREND_WINDOW, EmotionProcessor
+from app.models import EmotionSignal, EmotionTrend, GameState, Phase
+
+
+def make_signal(ts: int, stress: float = 0.5, focus: float = 0.5) -> EmotionSignal:
+    return EmotionSignal(
+        timestamp=ts,
+        emotions={
+            "stress": stress,
+            "focus": focus,
+            "confusion": 0.1,
+            "confidence": 0.2,
+            "neutral": 0.3,
+        },
+        dominant="stress" if stress >= focus else "focus",
+        face_detected=ts % 2 == 0,
+    )
+
+
+def naive_trend_deltas(signals):
+    window = signals[-TREND_WINDOW:]
+    first, second = window[:3], window[2:]
+    mean = lambda rs, k: sum(getattr(r.emotions, k) for r in rs) / len(rs)
+    return mean(second, "stress") - mean(first, "stress"), mean(second, "focus") - mean(first, "focus")
+
+
+class TestEmotionRingBuffer(unittest.TestCase):
+
+    def test_keeps_only_capacity_newest_frames(self):
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        for ts in range(100):
+            buf.push(make_signal(ts))
+        self.assertEqual(len(buf), BUFFER_SIZE)
+        self.assertEqual([f["timestamp"] for f in buf], list(range(70, 100)))
+        self.assertEqual(buf.last()["timestamp"], 99)
+
+    def test_running_mean_matches_naive_sum(self):
+        rng = random.Random(7)
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        signals = []
+        for ts in range(250):
+            s = make_signal(ts, stress=round(rng.random(), 4))
+            signals.append(s)
+            buf.push(s)
+            window = signals[-BUFFER_SIZE:]
+            expected = sum(r.emotions.stress for r in window) / len(window)
+            self.assertAlmostEqual(buf.mean("stress"), expected, places=9)
+
+    def test_recent_means_match_trend_windows(self):
+        rng = random.Random(3)
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        signals = [make_signal(ts, rng.random(), rng.random()) for ts in range(40)]
+        for s in signals:
+            buf.push(s)
+        stress_delta, focus_delta = naive_trend_deltas(signals)
+        self.assertAlmostEqual(buf.recent_mean("stress", 3) - buf.recent_mean("stress", 3, 2), stress_delta)
+        self.assertAlmostEqual(buf.recent_mean("focus", 3) - buf.recent_mean("focus", 3, 2), focus_delta)
+
+    def test_dumps_loads_roundtrip(self):
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        for ts in range(45):
+            buf.push(make_signal(ts, stress=ts / 100))
+        restored = EmotionRingBuffer.loads(buf.dumps(), BUFFER_SIZE)
+        self.assertEqual(list(restored), list(buf))
+        self.assertAlmostEqual(restored.mean("stress"), buf.mean("stress"))
+
+    def test_frame_codec_roundtrip(self):
+        s = make_signal(1740153600000, 0.72, 0.15)
+        self.assertEqual(EmotionSignal.model_validate(decode_frame(encode_frame(s))), s)
+
+    def test_roundtrip_keeps_full_precision(self):
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        s = make_signal(1740153600000, 1 / 3, 0.123456789012)
+        buf.push(s)
+        self.assertEqual(EmotionSignal.model_validate(decode_frame(encode_frame(s))), s)
+        self.assertEqual(list(EmotionRingBuffer.loads(buf.dumps())), list(buf))
+
+    def test_empty_buffer(self):
+        buf = EmotionRingBuffer()
+        self.assertEqual(buf.mean("stress"), 0.0)
+        self.assertIsNone(buf.last())
+        self.assertEqual(EmotionRingBuffer.loads(buf.dumps()).dumps(), "")
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_snapshot_uses_newest_frame_and_window_mean(self):
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        for ts in range(10):
+            buf.push(make_signal(ts, stress=0.1 * (ts % 5)))
+        snap = EmotionProcessor.build_snapshot(buf)
+        self.assertEqual(snap.current, make_signal(9, stress=0.4))
+        self.assertAlmostEqual(snap.avg_stress_30s, 0.2)
+
+    def test_empty_window_snapshot(self):
+        snap = EmotionProcessor.build_snapshot(EmotionRingBuffer())
+        self.assertIsNone(snap.current)
+        self.assertEqual(snap.trend, EmotionTrend.stable)
+
+    def test_game_state_no_longer_carries_the_window(self):
+        legacy = {"session_id": "abc", "emotion_buffer": [make_signal(1).model_dump()]}
+        raw = GameState.model_validate(legacy).model_dump_json()
+        self.assertNotIn("emotion", raw)
+
+
+class TestTrend(unittest.TestCase):
+
+    def _buffer(self, values, key="stress"):
+        buf = EmotionRingBuffer(BUFFER_SIZE)
+        for ts, v in enumerate(values):
+            buf.push(make_signal(ts, **{key: v}))
+        return buf
+
+    def test_stable_with_too_few_readings(self):
+        self.assertEqual(EmotionProcessor.compute_trend(self._buffer([0.1, 0.9])), EmotionTrend.stable)
+
+    def test_rising_stress(self):
+        buf = self._buffer([0.1, 0.1, 0.1, 0.6, 0.9])
+        self.assertEqual(EmotionProcessor.compute_trend(buf), EmotionTrend.rising_stress)
+
+    def test_falling_focus(self):
+        buf = self._buffer([0.9, 0.9, 0.8, 0.2, 0.1], key="focus")
+        self.assertEqual(EmotionProcessor.compute_trend(buf), EmotionTrend.falling_focus)
+
+
+class TestBatchedWrites(unittest.IsolatedAsyncioTestCase):
+
+    def _batch(self, signals):
+        writes = redis_client.WriteBatch()
+        entries = [EmotionProcessor.build_timeline_entry(s, Phase.vault) for s in signals]
+        writes.push_emotion_frames("b", signals)
+        writes.append_timeline_many("b", entries)
+        return writes
+
+    def test_one_rpush_and_one_zadd_per_batch(self):
+        signals = [make_signal(ts, stress=ts / 10) for ts in range(5)]
+        pipe = mock.MagicMock()
+        with mock.patch.object(settings, "timeline_backend", "zset"):
+            for op in self._batch(signals)._redis_ops:
+                op(pipe)
+        self.assertEqual(pipe.rpush.call_count, 1)
+        self.assertEqual(len(pipe.rpush.call_args.args), 1 + len(signals))
+        self.assertEqual(pipe.zadd.call_count, 1)
+        self.assertEqual(sorted(pipe.zadd.call_args.args[1].values()), [0, 1, 2, 3, 4])
+
+    async def test_memory_fallback_keeps_every_frame(self):
+        signals = [make_signal(ts) for ts in range(3)]
+        with mock.patch.object(settings, "timeline_backend", "zset"):
+            await self._batch(signals).execute()
+            timeline = await redis_client.get_timeline("b")
+        window = await redis_client.load_emotion_window("b")
+        self.assertEqual([e.t for e in timeline], [0, 1, 2])
+        self.assertEqual([f["timestamp"] for f in window], [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
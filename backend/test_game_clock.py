@@ -0,0 +1,131 @@
+"""
+Unit tests for the deadline game clock: freezing at game end, deadline
+bookkeeping on expiry, and the per-second tick batch.
+
+Run:  python -m pytest test_game_clock.py -v
+"""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from app import game_state as gsm
+from app.config import settings
+from app.models import GameState, Phase
+from app.timer_wheel import TimerScheduler
+
+
+class TestFreezeAtGameEnd(unittest.IsolatedAsyncioTestCase):
+
+    def test_reaching_debrief_freezes_the_deadline(self):
+        state = GameState(session_id="s", phase=Phase.escape, deadline=time.time() + 42.5)
+        gsm.advance_phase(state)
+        self.assertFalse(state.is_active)
+        self.assertIsNone(state.deadline)
+        self.assertEqual(state.time_remaining, 43)
+        self.assertEqual(gsm.time_remaining(state), 43)  # no longer counting down
+
+    def test_advancing_mid_game_keeps_the_clock_running(self):
+        state = GameState(session_id="s", deadline=time.time() + 60)
+        gsm.advance_phase(state)
+        self.assertIsNotNone(state.deadline)
+
+    async def test_stop_timer_freezes_the_stored_state(self):
+        state = GameState(session_id="s", deadline=time.time() + 10)
+
+        async def update_state(session_id, fn, batch=None):
+            return fn(state)
+
+        with mock.patch.object(gsm, "update_state", update_state), \
+                mock.patch.dict(gsm._deadlines, {"s": state.deadline}):
+            await gsm.stop_timer("s")
+            self.assertNotIn("s", gsm._deadlines)
+        self.assertIsNone(state.deadline)
+        self.assertEqual(state.time_remaining, 10)
+
+
+class TestDeadlineTimer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.state = GameState(session_id="s", time_remaining=0)
+
+        async def get_state(session_id):
+            return self.state
+
+        async def update_state(session_id, fn, batch=None):
+            return fn(self.state) if self.state is not None else None
+
+        scheduler = TimerScheduler(gsm._tick_batch, interval=0.01)
+        patches = [
+            mock.patch.object(settings, "timer_mode", "deadline"),
+            mock.patch.object(gsm, "get_state", get_state),
+            mock.patch.object(gsm, "update_state", update_state),
+            mock.patch.object(gsm, "_scheduler", scheduler),
+            mock.patch.dict(gsm._deadlines, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addAsyncCleanup(scheduler.close)
+
+    async def test_expiry_drops_the_deadline(self):
+        ended = []
+
+        async def on_tick(sid, secs):
+            pass
+
+        async def on_end(sid):
+            ended.append(sid)
+
+        await gsm.start_timer("s", on_tick, on_end)
+        self.assertIn("s", gsm._deadlines)
+        for _ in range(100):
+            if ended:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(ended, ["s"])
+        self.assertNotIn("s", gsm._deadlines)
+
+    async def test_session_gone_before_the_deadline_is_set(self):
+        async def update_state(session_id, fn, batch=None):
+            return None
+
+        with mock.patch.object(gsm, "update_state", update_state):
+            await gsm.start_timer("s", mock.AsyncMock(), mock.AsyncMock())
+        self.assertNotIn("s", gsm._deadlines)
+        self.assertNotIn("s", gsm._scheduler)
+
+
+class TestTickBatch(unittest.IsolatedAsyncioTestCase):
+
+    async def test_deadline_ticks_return_remaining_without_mutating_input(self):
+        remaining = {"a": 5, "b": 7}
+        with mock.patch.object(settings, "timer_mode", "deadline"), \
+                mock.patch.dict(gsm._deadlines, {"a": time.time() + 99.2}):
+            alive = await gsm._tick_batch(remaining)
+        self.assertEqual(alive, {"a": 100, "b": 7})
+        self.assertEqual(remaining, {"a": 5, "b": 7})
+
+    async def test_failed_read_keeps_every_timer(self):
+        save = mock.AsyncMock()
+        with mock.patch.object(settings, "timer_mode", "countdown"), \
+                mock.patch.object(gsm.redis_client, "load_game_states", mock.AsyncMock(return_value=None)), \
+                mock.patch.object(gsm.redis_client, "save_game_states", save):
+            alive = await gsm._tick_batch({"a": 5, "b": 0})
+        self.assertEqual(alive, {"a": 5, "b": 0})  # b still gets its on_end
+        save.assert_not_awaited()
+
+    async def test_missing_and_inactive_sessions_are_dropped(self):
+        states = {"a": GameState(session_id="a"), "b": GameState(session_id="b", is_active=False)}
+        save = mock.AsyncMock()
+        with mock.patch.object(settings, "timer_mode", "countdown"), \
+                mock.patch.object(gsm.redis_client, "load_game_states", mock.AsyncMock(return_value=states)), \
+                mock.patch.object(gsm.redis_client, "save_game_states", save):
+            alive = await gsm._tick_batch({"a": 5, "b": 5, "gone": 5})
+        self.assertEqual(alive, {"a": 5})
+        self.assertEqual([s.time_remaining for s in save.await_args.args[0]], [5])
+
+
+if __name__ == "__main__":
+    unittest.main()
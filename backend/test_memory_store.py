@@ -0,0 +1,78 @@
+"""
+Unit tests for the bounded in-memory fallback store.
+
+Run:  python -m pytest test_memory_store.py -v
+"""
+
+import unittest
+from unittest import mock
+
+from app.memory_store import MemoryStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("app.memory_store.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = MemoryStore(ttl=60, max_sessions=3, max_timeline=5)
+
+    def test_sessions_expire_after_ttl(self):
+        self.store.set("session:a:state", "{}")
+        self.clock.now += 59
+        self.assertEqual(self.store.get("session:a:state"), "{}")
+        self.clock.now += 2
+        self.assertIsNone(self.store.get("session:a:state"))
+        self.assertEqual(len(self.store), 0)
+
+    def test_write_refreshes_ttl(self):
+        self.store.set("session:a:state", "1")
+        self.clock.now += 50
+        self.store.timeline_add("session:a:timeline", 1, "x")
+        self.clock.now += 50
+        self.assertEqual(self.store.get("session:a:state"), "1")
+
+    def test_least_recently_used_session_is_evicted(self):
+        for sid in "abc":
+            self.store.set(f"session:{sid}:state", sid)
+        self.store.get("session:a:state")  # a is now most recent
+        self.store.set("session:d:state", "d")
+        self.assertEqual(len(self.store), 3)
+        self.assertIsNone(self.store.get("session:b:state"))
+        self.assertEqual(self.store.get("session:a:state"), "a")
+
+    def test_timeline_sorted_capped_and_ranged(self):
+        key = "session:a:timeline"
+        for score in (5, 1, 4, 2, 3, 7, 6):
+            self.store.timeline_add(key, score, f"m{score}")
+        self.assertEqual(self.store.timeline_range(key), ["m3", "m4", "m5", "m6", "m7"])
+        self.assertEqual(self.store.timeline_range(key, 4, 6), ["m4", "m5", "m6"])
+        self.store.timeline_update_latest(key, str.upper)
+        self.assertEqual(self.store.timeline_range(key, 7), ["M7"])
+
+    def test_list_is_capped(self):
+        for i in range(10):
+            self.store.list_push("session:a:emotion", str(i), 4)
+        self.assertEqual(self.store.list_range("session:a:emotion"), ["6", "7", "8", "9"])
+
+    def test_delete_drops_empty_session(self):
+        self.store.set("session:a:state", "{}")
+        self.store.set("session:a:ui_prev", "{}")
+        self.store.delete("session:a:state")
+        self.assertEqual(len(self.store), 1)
+        self.store.delete("session:a:ui_prev", "session:a:timeline")
+        self.assertEqual(len(self.store), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Unit tests for streamed Contract 3 parsing (sentence extraction, early
+ui_commands) and the orchestrator's streaming broadcast path.
+
+Run:  python -m pytest test_oracle_stream.py -v
+"""
+
+import json
+import time
+import unittest
+from unittest import mock
+
+from app import orchestrator, redis_client
+from app.config import settings
+from app.memory_store import MemoryStore
+from app.models import GameState
+from app.oracle_stream import Contract3Stream
+
+REPLY = {
+    "oracle_response": {
+        "text": 'Good instinct. Node A is "weak" — trace it! Then we move… fast. Go',
+        "voice_style": "calm_reassuring",
+    },
+    "ui_commands": {
+        "complexity": "simplified",
+        "color_mood": "calm",
+        "panels_visible": ["main"],
+        "options": [{"id": "A", "label": "Node {A}", "highlighted": True}],
+        "guidance_level": "high",
+    },
+    "game_update": {"score_delta": 10, "advance_phase": False, "next_prompt": None},
+}
+
+
+def chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+async def stream(text: str = json.dumps(REPLY), size: int = 16):
+    for chunk in chunks(text, size):
+        yield chunk
+
+
+class TestContract3Stream(unittest.TestCase):
+
+    def feed_all(self, text: str, size: int) -> tuple[Contract3Stream, list[str]]:
+        parser, sentences = Contract3Stream(), []
+        for chunk in chunks(text, size):
+            sentences += parser.feed(chunk)
+        return parser, sentences
+
+    def test_sentences_come_out_whole_for_any_chunking(self):
+        body = json.dumps(REPLY)  # ensure_ascii — exercises \\uXXXX escapes
+        for size in (1, 2, 3, 7, 64, len(body)):
+            with self.subTest(size=size):
+                parser, sentences = self.feed_all(body, size)
+                self.assertEqual(sentences, [
+                    "Good instinct.",
+                    'Node A is "weak" — trace it!',
+                    "Then we move…",
+                    "fast.",
+                    "Go",
+                ])
+                self.assertEqual(parser.text, REPLY["oracle_response"]["text"])
+                self.assertEqual(parser.result().game_update.score_delta, 10)
+
+    def test_sentence_is_released_before_the_string_closes(self):
+        parser = Contract3Stream()
+        self.assertEqual(parser.feed('{"oracle_response": {"text": "Stand by. Run'), ["Stand by."])
+        self.assertEqual(parser.feed('ning the bypass'), [])
+        self.assertEqual(parser.feed('.", "voice_style"'), ["Running the bypass."])
+
+    def test_ui_commands_parse_as_soon_as_the_object_closes(self):
+        body = json.dumps(REPLY)
+        cut = body.index('"game_update"')
+        parser = Contract3Stream()
+        for chunk in chunks(body[:cut], 5):
+            parser.feed(chunk)
+        ui = parser.take_ui_commands()
+        self.assertEqual(ui.options[0].label, "Node {A}")
+        self.assertIsNone(parser.take_ui_commands())  # handed out once
+
+    def test_code_fences_and_invalid_bodies(self):
+        parser = Contract3Stream()
+        parser.feed("```json\n" + json.dumps(REPLY) + "\n```")
+        self.assertEqual(parser.result().oracle_response.voice_style.value, "calm_reassuring")
+        truncated = Contract3Stream()
+        truncated.feed(json.dumps(REPLY)[:80])
+        with self.assertRaises(ValueError):
+            truncated.result()
+
+
+class TestStreamingBroadcast(unittest.IsolatedAsyncioTestCase):
+
+    async def test_partials_and_early_ui_update_are_broadcast_in_order(self):
+        with mock.patch("app.orchestrator.ws_handler.broadcast", mock.AsyncMock()) as broadcast:
+            resp = await orchestrator._consume_stream("s", stream())
+
+        sent = [call.args[1] for call in broadcast.await_args_list]
+        self.assertEqual([m.type for m in sent], ["oracle_speech_partial"] * 5 + ["ui_update"])
+        self.assertEqual([m.seq for m in sent[:5]], [0, 1, 2, 3, 4])
+        self.assertEqual(len({m.turn_id for m in sent[:5]}), 1)
+        self.assertIsNone(sent[-1].version)
+        self.assertEqual(resp.ui_commands, sent[-1].data)
+
+
+class TestStreamedTurnIds(unittest.IsolatedAsyncioTestCase):
+    """oracle_speech carries the partials' turn_id only when it completes them."""
+
+    async def asyncSetUp(self):
+        self.broadcast = mock.AsyncMock()
+        patches = [
+            mock.patch("app.orchestrator.ws_handler.broadcast", self.broadcast),
+            mock.patch.object(redis_client, "_mem", MemoryStore(60, 10, 10)),
+            mock.patch.dict(orchestrator._stream_turns, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        await redis_client.save_game_state(GameState(session_id="s"))
+
+    def sent(self, msg_type: str) -> list:
+        return [c.args[1] for c in self.broadcast.await_args_list if c.args[1].type == msg_type]
+
+    async def test_final_speech_completes_the_streamed_turn(self):
+        resp = await orchestrator._consume_stream("s", stream())
+        await orchestrator.apply_turn("s", "hi", resp, time.monotonic())
+        (partial_turn,) = {m.turn_id for m in self.sent("oracle_speech_partial")}
+        (speech,) = self.sent("oracle_speech")
+        self.assertEqual(speech.turn_id, partial_turn)
+        self.assertEqual(orchestrator._stream_turns, {})
+
+    async def test_fallback_after_a_broken_stream_has_no_turn_id(self):
+        with self.assertRaises(ValueError):
+            await orchestrator._consume_stream("s", stream(json.dumps(REPLY)[:120]))
+        self.assertTrue(self.sent("oracle_speech_partial"))
+        fallback = orchestrator._fallback_oracle_response()
+        await orchestrator.apply_turn("s", "hi", fallback, time.monotonic())
+        (speech,) = self.sent("oracle_speech")
+        self.assertIsNone(speech.turn_id)
+
+    async def test_next_turn_forgets_a_turn_that_was_never_applied(self):
+        await orchestrator._consume_stream("s", stream())
+        with mock.patch.object(settings, "mock_mode", True), \
+                mock.patch.object(settings, "oracle_streaming", False):
+            resp = await orchestrator.prepare_turn("s", "hello again")
+        await orchestrator.apply_turn("s", "hello again", resp, time.monotonic())
+        (speech,) = self.sent("oracle_speech")
+        self.assertIsNone(speech.turn_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+"""
+Unit tests for redis_client against fakeredis (with Lua): pipelined write
+batches, annotating the latest timeline entry on both backends, and stream
+range queries.
+
+Run:  python -m pytest test_redis_client.py -v
+"""
+
+import json
+import unittest
+from unittest import mock
+
+import fakeredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+
+from app import redis_client, redis_health
+from app.config import settings
+from app.memory_store import MemoryStore
+from app.models import (
+    EmotionScores,
+    EmotionSignal,
+    GameState,
+    Phase,
+    PreviousUIState,
+    TimelineEntry,
+    UICommands,
+)
+
+
+def entry(t: int, stress: float = 0.5, focus: float = 0.5, adaptation=None) -> TimelineEntry:
+    return TimelineEntry(t=t, phase=Phase.vault, stress=stress, focus=focus, adaptation=adaptation)
+
+
+class RedisTestCase(unittest.IsolatedAsyncioTestCase):
+    backend = "zset"
+
+    async def asyncSetUp(self):
+        self.redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        self.mem = MemoryStore(ttl=60, max_sessions=10, max_timeline=100)
+        patches = [
+            mock.patch("app.redis_client.aioredis.from_url", return_value=self.redis),
+            mock.patch.object(redis_client, "_mem", self.mem),
+            mock.patch.object(settings, "timeline_backend", self.backend),
+            mock.patch.object(redis_health, "_latency_ms", None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        await redis_client.init_redis()
+        self.assertTrue(redis_client.redis_available())
+
+    async def asyncTearDown(self):
+        await redis_client.close_redis()
+
+
+# ---------------------------------------------------------------------------
+# Write batches
+# ---------------------------------------------------------------------------
+
+class TestWriteBatch(RedisTestCase):
+
+    async def test_batch_writes_every_key_in_one_execute(self):
+        state = GameState(session_id="s", current_score=7)
+        signal = EmotionSignal(
+            timestamp=1,
+            emotions=EmotionScores(
+                stress=0.7, focus=0.2, confusion=0.1, confidence=0.3, neutral=0.1
+            ),
+            dominant="stress",
+            face_detected=True,
+        )
+        with mock.patch.object(self.redis, "pipeline", wraps=self.redis.pipeline) as pipeline:
+            async with redis_client.batch() as writes:
+                writes.save_game_state(state)
+                writes.append_timeline("s", entry(1000))
+                writes.push_emotion_frames("s", [signal, signal])
+                writes.save_prev_ui("s", PreviousUIState(ui_commands=UICommands()))
+                self.assertEqual(len(writes), 4)
+                self.assertEqual(await self.redis.dbsize(), 0)  # nothing sent yet
+            self.assertEqual(pipeline.call_count, 1)
+
+        self.assertEqual((await redis_client.load_game_state("s")).current_score, 7)
+        self.assertEqual(len(await redis_client.get_timeline("s")), 1)
+        self.assertEqual(len(await redis_client.load_emotion_window("s")), 2)
+        self.assertIsNotNone(await redis_client.load_prev_ui("s"))
+        self.assertGreater(await self.redis.ttl("session:s:state"), 0)
+        self.assertEqual(self.mem.dirty_count, 0)
+
+    async def test_transactional_batch(self):
+        async with redis_client.batch(transaction=True) as writes:
+            writes.save_game_state(GameState(session_id="s"))
+            writes.append_timeline_many("s", [entry(1), entry(2), entry(3)])
+        self.assertEqual([e.t for e in await redis_client.get_timeline("s")], [1, 2, 3])
+
+    async def test_block_that_raises_sends_nothing(self):
+        with self.assertRaises(RuntimeError):
+            async with redis_client.batch() as writes:
+                writes.save_game_state(GameState(session_id="s"))
+                raise RuntimeError("abort")
+        self.assertEqual(await self.redis.dbsize(), 0)
+
+
+class TestCommandErrors(RedisTestCase):
+
+    async def test_batch_command_error_is_raised(self):
+        await self.redis.set("session:s:emotion", "not a list")
+        signal = EmotionSignal(
+            timestamp=1,
+            emotions=EmotionScores(stress=0.5, focus=0.5, confusion=0, confidence=0.5, neutral=0),
+            dominant="neutral",
+            face_detected=True,
+        )
+        with self.assertRaises(ResponseError):
+            async with redis_client.batch() as writes:
+                writes.push_emotion_frames("s", [signal])
+        # Not an outage: no memory fallback, and the breaker stays closed
+        self.assertEqual(self.mem.dirty_count, 0)
+        self.assertTrue(redis_client.redis_available())
+
+    async def test_failed_mget_is_not_an_empty_result(self):
+        await redis_client.save_game_state(GameState(session_id="s"))
+        with mock.patch.object(self.redis, "mget", side_effect=RedisConnectionError("down")):
+            self.assertIsNone(await redis_client.load_game_states(["s", "t"]))
+        self.assertEqual(list(await redis_client.load_game_states(["s", "t"])), ["s"])
+
+    async def test_read_command_error_is_raised(self):
+        await self.redis.rpush("session:s:state", "not a string")
+        with self.assertRaises(ResponseError):
+            await redis_client.load_game_state("s")
+        self.assertTrue(redis_client.redis_available())
+
+
+# ---------------------------------------------------------------------------
+# Annotating the latest entry
+# ---------------------------------------------------------------------------
+
+class TestAnnotateLatestZset(RedisTestCase):
+
+    async def test_only_the_latest_entry_is_annotated(self):
+        for t in (3000, 1000, 2000):
+            await redis_client.append_timeline("s", entry(t, stress=0.123456789))
+        before = await self.redis.zrange("session:s:timeline", 0, -1)
+        await redis_client.update_latest_timeline_adaptation("s", "simplified")
+        await redis_client.update_latest_timeline_adaptation("s", "calm")
+        after = await self.redis.zrange("session:s:timeline", 0, -1)
+        self.assertEqual(after[:2], before[:2])  # untouched, byte for byte
+        self.assertEqual(after[2], before[2].replace('"adaptation":null', '"adaptation":"calm"'))
+        timeline = await redis_client.get_timeline("s")
+        self.assertEqual([e.adaptation for e in timeline], [None, None, "calm"])
+
+    async def test_labels_with_json_punctuation(self):
+        await redis_client.append_timeline("s", entry(1000))
+        for label in ('tone, calm}', 'say "hi"', '100% focus', "back\\slash"):
+            with self.subTest(label=label):
+                await redis_client.update_latest_timeline_adaptation("s", label)
+                (latest,) = await redis_client.get_timeline("s")
+                self.assertEqual(latest.adaptation, label)
+
+    async def test_nested_member_keeps_the_inner_key(self):
+        member = json.dumps({
+            "t": 1, "extra": {"adaptation": "inner", "list": [1, {"x": "}"}]},
+            "adaptation": None, "phase": "vault",
+        }, separators=(",", ":"))
+        await self.redis.zadd("session:s:timeline", {member: 1})
+        await redis_client.update_latest_timeline_adaptation("s", "calm, then focus")
+        (patched,) = await self.redis.zrange("session:s:timeline", 0, -1)
+        expected = {**json.loads(member), "adaptation": "calm, then focus"}
+        self.assertEqual(json.loads(patched), expected)
+
+    async def test_member_without_the_field_gets_it_appended(self):
+        await self.redis.zadd("session:s:timeline", {'{"t":1,"phase":"vault"}': 1})
+        await redis_client.update_latest_timeline_adaptation("s", "calm")
+        (patched,) = await self.redis.zrange("session:s:timeline", 0, -1)
+        self.assertEqual(json.loads(patched)["adaptation"], "calm")
+
+    async def test_empty_timeline_is_a_no_op(self):
+        await redis_client.update_latest_timeline_adaptation("s", "calm")
+        self.assertEqual(await self.redis.dbsize(), 0)
+
+
+class TestAnnotateLatestStream(RedisTestCase):
+    backend = "stream"
+
+    async def test_only_the_latest_entry_is_annotated(self):
+        for t in (1000, 2000, 3000):
+            await redis_client.append_timeline("s", entry(t))
+        await redis_client.update_latest_timeline_adaptation("s", "tone, calm}")
+        timeline = await redis_client.get_timeline("s")
+        self.assertEqual([e.adaptation for e in timeline], [None, None, "tone, calm}"])
+        self.assertGreater(await self.redis.ttl("session:s:timeline:adapt"), 0)
+
+    async def test_empty_stream_is_a_no_op(self):
+        await redis_client.update_latest_timeline_adaptation("s", "calm")
+        self.assertEqual(await self.redis.dbsize(), 0)
+
+
+# ---------------------------------------------------------------------------
+# Stream backend range queries
+# ---------------------------------------------------------------------------
+
+class TestStreamTimeline(RedisTestCase):
+    backend = "stream"
+
+    async def test_range_round_trip(self):
+        entries = [entry(t, stress=t / 10_000, focus=1 / 3) for t in range(1000, 6000, 1000)]
+        async with redis_client.batch() as writes:
+            writes.append_timeline_many("s", entries)
+        self.assertEqual(await redis_client.get_timeline("s"), entries)
+        self.assertEqual(await redis_client.get_timeline("s", 2000, 4000), entries[1:4])
+        self.assertEqual(await redis_client.get_timeline("s", start=4500), entries[4:])
+        self.assertEqual(await redis_client.get_timeline("s", end=999), [])
+        self.assertEqual(await self.redis.exists("session:s:timeline"), 0)
+
+    async def test_late_frame_is_clamped_onto_the_stream_top(self):
+        for t in (1000, 3000, 2000):
+            await redis_client.append_timeline("s", entry(t))
+        ids = [entry_id for entry_id, _ in await self.redis.xrange("session:s:timeline:stream")]
+        self.assertEqual(ids, ["1000-0", "3000-0", "3000-1"])
+        self.assertEqual([e.t for e in await redis_client.get_timeline("s")], [1000, 2000, 3000])
+        # Its ID sorts after 3000, but its own t still decides membership
+        self.assertEqual([e.t for e in await redis_client.get_timeline("s", 1500, 2500)], [2000])
+        self.assertEqual([e.t for e in await redis_client.get_timeline("s", 3000, 3000)], [3000])
+
+    async def test_late_frame_far_below_the_top_is_in_its_window(self):
+        for t in (1000, 5000, 2000):
+            await redis_client.append_timeline("s", entry(t))
+        rows = await redis_client.get_timeline_dicts("s", 1500, 2500)
+        self.assertEqual([row["t"] for row in rows], [2000])
+
+    async def test_dicts_match_the_zset_shape(self):
+        written = entry(1000, stress=0.72, adaptation="calm")
+        await redis_client.append_timeline("s", written)
+        (row,) = await redis_client.get_timeline_dicts("s")
+        self.assertEqual(row, json.loads(written.model_dump_json()))
+
+
+if __name__ == "__main__":
+    unittest.main()
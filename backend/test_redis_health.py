@@ -0,0 +1,100 @@
+"""
+Unit tests for the Redis circuit breaker and its recovery probe.
+
+Run:  python -m pytest test_redis_health.py -v
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+
+from app import redis_health
+from app.config import settings
+
+
+class TestBreaker(unittest.TestCase):
+
+    def setUp(self):
+        redis_health.reset()
+
+    def tearDown(self):
+        redis_health.trip()
+
+    def test_trips_after_consecutive_outage_errors(self):
+        for _ in range(settings.redis_breaker_failures - 1):
+            redis_health.record_failure(RedisConnectionError("down"))
+            self.assertTrue(redis_health.available())
+        redis_health.record_failure(RedisConnectionError("down"))
+        self.assertFalse(redis_health.available())
+        self.assertEqual(redis_health.snapshot()["state"], redis_health.OPEN)
+
+    def test_success_resets_the_count(self):
+        redis_health.record_failure(RedisConnectionError("down"))
+        redis_health.record_success(0.001)
+        redis_health.record_failure(RedisConnectionError("down"))
+        self.assertEqual(redis_health.available(), settings.redis_breaker_failures > 1)
+
+    def test_command_errors_do_not_trip(self):
+        for _ in range(10):
+            redis_health.record_failure(ResponseError("WRONGTYPE"))
+        self.assertTrue(redis_health.available())
+
+    def test_latency_is_smoothed(self):
+        redis_health.record_success(0.001)
+        redis_health.record_success(0.011)
+        self.assertAlmostEqual(redis_health.snapshot()["latency_ms"], 3.0)
+
+
+class TestRecovery(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        patch = mock.patch.object(settings, "redis_probe_interval_ms", 5)
+        patch.start()
+        self.addCleanup(patch.stop)
+        redis_health.reset()
+        redis_health.record_failure(RedisConnectionError("down"))
+        redis_health.trip()
+
+    async def asyncTearDown(self):
+        await redis_health.stop()
+
+    async def test_probe_resyncs_then_closes(self):
+        up = asyncio.Event()
+        resynced = []
+
+        async def ping():
+            if not up.is_set():
+                raise RedisConnectionError("down")
+            return True
+
+        async def resync():
+            self.assertEqual(redis_health.snapshot()["state"], redis_health.HALF_OPEN)
+            self.assertFalse(redis_health.available())
+            resynced.append(True)
+
+        redis_health.start(ping, resync)
+        await asyncio.sleep(0.03)
+        self.assertFalse(redis_health.available())
+        up.set()
+        await asyncio.sleep(0.03)
+        self.assertTrue(redis_health.available())
+        self.assertEqual(resynced, [True])
+
+    async def test_failed_resync_reopens(self):
+        async def ping():
+            return True
+
+        async def resync():
+            raise RedisConnectionError("lost again")
+
+        redis_health.start(ping, resync)
+        await asyncio.sleep(0.03)
+        self.assertFalse(redis_health.available())
+        self.assertIn("lost again", redis_health.snapshot()["last_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
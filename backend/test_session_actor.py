@@ -0,0 +1,124 @@
+"""
+Unit tests for per-session actors (mailbox ordering, retry after close,
+write-behind flushes).
+
+Run:  python -m pytest test_session_actor.py -v
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app import session_actor
+from app.config import settings
+from app.models import GameState
+
+
+class ActorTestCase(unittest.IsolatedAsyncioTestCase):
+    flush_interval_ms = 10_000  # nothing flushes on its own unless a test lowers it
+
+    async def asyncSetUp(self):
+        self.stored = {"s": GameState(session_id="s")}
+        self.saves: list[GameState] = []
+
+        async def load_game_state(session_id):
+            state = self.stored.get(session_id)
+            return state.model_copy(deep=True) if state else None
+
+        async def save_game_state(state):
+            self.saves.append(state.model_copy(deep=True))
+            self.stored[state.session_id] = state.model_copy(deep=True)
+
+        patches = [
+            mock.patch("app.session_actor.redis_client.load_game_state", load_game_state),
+            mock.patch("app.session_actor.redis_client.save_game_state", save_game_state),
+            mock.patch.object(settings, "actor_flush_interval_ms", self.flush_interval_ms),
+            mock.patch.dict(session_actor._actors, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def asyncTearDown(self):
+        await session_actor.close_all()
+
+
+def score(points: int):
+    def apply(state: GameState) -> int:
+        state.current_score += points
+        return state.current_score
+    return apply
+
+
+class TestMailbox(ActorTestCase):
+
+    async def test_concurrent_calls_apply_in_arrival_order(self):
+        seen = []
+
+        def record(i):
+            def apply(state):
+                seen.append(i)
+                state.decisions_made += 1
+                return state.decisions_made
+            return apply
+
+        results = await asyncio.gather(*(session_actor.call("s", record(i)) for i in range(50)))
+        self.assertEqual(seen, list(range(50)))
+        self.assertEqual(results, list(range(1, 51)))
+
+    async def test_handler_error_is_raised_to_its_caller_only(self):
+        def boom(state):
+            raise ValueError("bad event")
+
+        with self.assertRaises(ValueError):
+            await session_actor.call("s", boom)
+        self.assertEqual(await session_actor.call("s", score(5)), 5)
+
+    async def test_unknown_session_returns_none(self):
+        self.assertIsNone(await session_actor.call("missing", score(1)))
+
+    async def test_call_after_close_retries_on_a_new_actor(self):
+        await session_actor.call("s", score(3))
+        first = session_actor.get_actor("s")
+        await first.stop()
+        with self.assertRaises(session_actor.ActorClosed):
+            await first.call(score(1))
+        # The registry spawns a new actor, which reloads the flushed state
+        self.assertEqual(await session_actor.call("s", score(4)), 7)
+        self.assertIsNot(session_actor.get_actor("s"), first)
+
+
+class TestWriteBehind(ActorTestCase):
+
+    async def test_stop_flushes_pending_state(self):
+        await session_actor.call("s", score(10))
+        self.assertEqual(self.saves, [])  # still inside the flush interval
+        await session_actor.close_all()
+        self.assertEqual([s.current_score for s in self.saves], [10])
+
+    async def test_game_end_flushes_immediately(self):
+        def end(state):
+            state.is_active = False
+
+        await session_actor.call("s", end)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual(len(self.saves), 1)
+        self.assertFalse(self.saves[0].is_active)
+
+
+class TestFlushCoalescing(ActorTestCase):
+    flush_interval_ms = 100
+
+    async def test_burst_of_events_is_one_write(self):
+        await asyncio.gather(*(session_actor.call("s", score(1)) for _ in range(20)))
+        for _ in range(100):
+            if self.saves:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.02)
+        self.assertEqual([s.current_score for s in self.saves], [20])
+
+
+if __name__ == "__main__":
+    unittest.main()
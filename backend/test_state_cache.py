@@ -0,0 +1,132 @@
+"""
+Unit tests for the write-behind GameState cache (coalesced flushes, live
+reads of dirty state, immediate flush on phase change, shutdown flush).
+
+Run:  python -m pytest test_state_cache.py -v
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app import state_cache
+from app.config import settings
+from app.models import GameState, Phase
+
+
+class StateCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    flush_ms = 10_000  # the background flusher stays idle unless a test lowers it
+
+    async def asyncSetUp(self):
+        self.stored = {sid: GameState(session_id=sid) for sid in ("a", "b")}
+        self.loads: list[str] = []
+        self.writes: list[list[GameState]] = []
+        self.fail_writes = False
+
+        async def load_game_state(session_id):
+            self.loads.append(session_id)
+            state = self.stored.get(session_id)
+            return state.model_copy(deep=True) if state else None
+
+        async def save_game_states(states):
+            if self.fail_writes:
+                raise ConnectionError("redis down")
+            self.writes.append([s.model_copy(deep=True) for s in states])
+
+        patches = [
+            mock.patch("app.state_cache.redis_client.load_game_state", load_game_state),
+            mock.patch("app.state_cache.redis_client.save_game_states", save_game_states),
+            mock.patch.object(settings, "state_cache_flush_ms", self.flush_ms),
+            mock.patch.dict(state_cache._entries, clear=True),
+            mock.patch.object(state_cache, "_flusher", None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def asyncTearDown(self):
+        if state_cache._flusher is not None:
+            state_cache._flusher.cancel()
+
+    async def bump(self, session_id: str, times: int = 1) -> GameState:
+        for _ in range(times):
+            state = await state_cache.get_live(session_id)
+            state.current_score += 1
+            await state_cache.mark_dirty(session_id)
+        return state
+
+
+class TestReads(StateCacheTestCase):
+
+    async def test_live_state_is_shared_while_dirty(self):
+        live = await self.bump("a")
+        self.assertIs(await state_cache.get_live("a"), live)
+        self.assertEqual((await state_cache.get("a")).current_score, 1)
+        self.assertEqual(self.loads, ["a"])  # every later read is in process
+        self.assertEqual(self.writes, [])
+
+    async def test_get_returns_a_copy(self):
+        copy = await state_cache.get("a")
+        copy.current_score = 99
+        self.assertEqual((await state_cache.get("a")).current_score, 0)
+
+    async def test_unknown_session(self):
+        self.assertIsNone(await state_cache.get_live("missing"))
+        await state_cache.mark_dirty("missing")
+        self.assertEqual(self.writes, [])
+
+
+class TestFlushing(StateCacheTestCase):
+
+    async def test_phase_change_flushes_immediately(self):
+        live = await state_cache.get_live("a")
+        live.phase = Phase.escape
+        await state_cache.mark_dirty("a")
+        self.assertEqual([[s.phase for s in w] for w in self.writes], [[Phase.escape]])
+        await state_cache.mark_dirty("a")  # same phase again: no extra write
+        self.assertEqual(len(self.writes), 1)
+
+    async def test_flush_all_writes_dirty_sessions_once(self):
+        await self.bump("a", 3)
+        await self.bump("b")
+        await state_cache.get("b")  # reads don't make it clean
+        await state_cache.flush_all()
+        self.assertEqual(len(self.writes), 1)
+        self.assertEqual(
+            sorted((s.session_id, s.current_score) for s in self.writes[0]),
+            [("a", 3), ("b", 1)],
+        )
+        self.assertIsNone(state_cache._flusher)
+        await state_cache.flush_all()  # nothing dirty left
+        self.assertEqual(len(self.writes), 1)
+
+    async def test_failed_write_stays_dirty(self):
+        await self.bump("a")
+        self.fail_writes = True
+        with self.assertLogs("spectra.cache", "ERROR"):
+            await state_cache.flush_all()
+        self.fail_writes = False
+        await state_cache.flush_all()
+        self.assertEqual([[s.current_score for s in w] for w in self.writes], [[1]])
+
+
+class TestCoalescing(StateCacheTestCase):
+    flush_ms = 100
+
+    async def test_many_updates_are_one_write(self):
+        await self.bump("a", 20)
+        await self.bump("b", 5)
+        for _ in range(100):
+            if self.writes:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.02)
+        self.assertEqual(len(self.writes), 1)
+        self.assertEqual(
+            sorted((s.session_id, s.current_score) for s in self.writes[0]),
+            [("a", 20), ("b", 5)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
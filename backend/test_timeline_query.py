@@ -0,0 +1,81 @@
+"""
+Unit tests for timeline range / phase filtering and downsampling.
+
+Run:  python -m pytest test_timeline_query.py -v
+"""
+
+import math
+import unittest
+
+from app import timeline_query
+from app.timeline_query import downsample, lttb, minmax, query
+
+
+def make_timeline(n: int, adapt_every: int = 0) -> list[dict]:
+    phases = ("infiltrate", "vault", "escape")
+    return [
+        {
+            "t": 1740153600000 + i * 1000,
+            "phase": phases[i * len(phases) // n],
+            "stress": round(0.5 + 0.4 * math.sin(i / 7), 4),
+            "focus": round(0.5 + 0.4 * math.cos(i / 11), 4),
+            "adaptation": "ui_simplified" if adapt_every and i % adapt_every == adapt_every - 1 else None,
+        }
+        for i in range(n)
+    ]
+
+
+class TestDownsample(unittest.TestCase):
+
+    def test_lttb_respects_budget_and_keeps_endpoints(self):
+        rows = make_timeline(1000)
+        out = lttb(rows, 100)
+        self.assertEqual(len(out), 100)
+        self.assertIs(out[0], rows[0])
+        self.assertIs(out[-1], rows[-1])
+        self.assertEqual([e["t"] for e in out], sorted(e["t"] for e in out))
+
+    def test_minmax_keeps_global_extremes(self):
+        rows = make_timeline(1000)
+        out = minmax(rows, 80)
+        self.assertLessEqual(len(out), 80)
+        for k in timeline_query.SERIES:
+            self.assertEqual(max(e[k] for e in out), max(e[k] for e in rows))
+            self.assertEqual(min(e[k] for e in out), min(e[k] for e in rows))
+
+    def test_adaptation_points_always_kept(self):
+        rows = make_timeline(900, adapt_every=50)
+        adapted = [e for e in rows if e["adaptation"]]
+        for method in ("lttb", "minmax"):
+            out = downsample(rows, 60, method)
+            self.assertLessEqual(len(out), 60)
+            self.assertTrue(all(e in out for e in adapted), method)
+            self.assertEqual([e["t"] for e in out], sorted(e["t"] for e in out))
+
+    def test_budget_smaller_than_adaptations(self):
+        rows = make_timeline(100, adapt_every=5)
+        out = downsample(rows, 4)
+        self.assertEqual(out, [e for e in rows if e["adaptation"]][-4:])
+
+    def test_small_timeline_is_returned_unchanged(self):
+        rows = make_timeline(10)
+        self.assertEqual(query(rows, max_points=50), rows)
+
+
+class TestFilters(unittest.TestCase):
+
+    def test_phase_filter(self):
+        rows = make_timeline(300)
+        out = query(rows, phase="vault")
+        self.assertTrue(out)
+        self.assertTrue(all(e["phase"] == "vault" for e in out))
+
+    def test_adaptations_only(self):
+        rows = make_timeline(300, adapt_every=30)
+        out = query(rows, adaptations_only=True)
+        self.assertEqual(len(out), 10)
+        self.assertTrue(all(e["adaptation"] for e in out))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for the hierarchical timer wheel (expiry at level boundaries,
+cascading with cancel / re-arm) and the TimerScheduler driver.
+
+Run:  python -m pytest test_timer_wheel.py -v
+"""
+
+import asyncio
+import unittest
+
+from app.timer_wheel import TimerScheduler, TimerWheel
+
+
+def expiry_tick(wheel: TimerWheel, key: str, limit: int = 1000) -> int:
+    """Advance one tick at a time until ``key`` expires; return that tick."""
+    for _ in range(limit):
+        if key in wheel.advance():
+            return wheel.now
+    raise AssertionError(f"{key} never expired")
+
+
+class TestTimerWheel(unittest.TestCase):
+    # 4 slots × 3 levels: levels span 1 / 4 / 16 ticks, range 64 — small
+    # enough to hit every boundary and the beyond-range parking path.
+
+    def test_every_delay_expires_exactly_on_time(self):
+        for start in (0, 3, 15, 17):
+            for delay in range(1, 100):
+                with self.subTest(start=start, delay=delay):
+                    wheel = TimerWheel(slots=4, levels=3)
+                    wheel.advance(start)
+                    wheel.schedule("k", delay)
+                    self.assertEqual(expiry_tick(wheel, "k"), start + delay)
+                    self.assertEqual(len(wheel), 0)
+
+    def test_level_boundaries_on_the_default_wheel(self):
+        wheel = TimerWheel()
+        delays = (59, 60, 61, 3599, 3600, 3601)
+        for delay in delays:
+            wheel.schedule(f"d{delay}", delay)
+        fired = {}
+        while len(fired) < len(delays):
+            for key in wheel.advance():
+                fired[key] = wheel.now
+        self.assertEqual(fired, {f"d{d}": d for d in delays})
+
+    def test_many_keys_share_buckets(self):
+        wheel = TimerWheel(slots=4, levels=3)
+        for i in range(1, 70):
+            wheel.schedule(f"k{i}", i)
+        for tick in range(1, 70):
+            self.assertEqual(wheel.advance(), [f"k{tick}"])
+
+    def test_cancel_after_cascade(self):
+        wheel = TimerWheel(slots=4, levels=3)
+        wheel.schedule("k", 40)
+        wheel.advance(33)  # cascaded out of the top level by now
+        self.assertTrue(wheel.cancel("k"))
+        self.assertFalse(wheel.cancel("k"))
+        self.assertEqual(wheel.advance(30), [])
+
+    def test_re_arm_mid_cascade_uses_the_new_delay(self):
+        wheel = TimerWheel(slots=4, levels=3)
+        wheel.schedule("k", 20)
+        wheel.advance(17)
+        wheel.schedule("k", 5)  # re-arm replaces the old entry
+        self.assertEqual(wheel.deadline("k"), 22)
+        self.assertEqual(expiry_tick(wheel, "k"), 22)
+
+    def test_catch_up_advance_returns_everything_due(self):
+        wheel = TimerWheel(slots=4, levels=3)
+        for i in (2, 9, 30):
+            wheel.schedule(f"k{i}", i)
+        self.assertEqual(sorted(wheel.advance(31)), ["k2", "k30", "k9"])
+
+
+class TestTimerScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_ticks_report_batch_values_and_end_fires_once(self):
+        ticks, ended = [], []
+
+        async def tick_batch(remaining):
+            return {sid: secs * 10 for sid, secs in remaining.items() if sid != "dropped"}
+
+        async def on_tick(sid, secs):
+            ticks.append((sid, secs))
+
+        async def on_end(sid):
+            ended.append(sid)
+
+        scheduler = TimerScheduler(tick_batch, interval=0.01)
+        scheduler.add("s", 2, on_tick, on_end)
+        scheduler.add("dropped", 5, on_tick, on_end)
+        for _ in range(100):
+            if ended:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        self.assertEqual(ticks, [("s", 10), ("s", 0)])
+        self.assertEqual(ended, ["s"])
+        self.assertNotIn("dropped", scheduler)
+
+    async def test_removed_session_gets_no_callbacks(self):
+        calls = []
+
+        async def tick_batch(remaining):
+            return dict(remaining)
+
+        async def record(*args):
+            calls.append(args)
+
+        scheduler = TimerScheduler(tick_batch, interval=0.01)
+        scheduler.add("s", 3, record, record)
+        self.assertTrue(scheduler.remove("s"))
+        await asyncio.sleep(0.05)
+        await scheduler.close()
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
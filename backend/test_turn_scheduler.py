@@ -0,0 +1,168 @@
+"""
+Unit tests for the per-session speech-turn scheduler (ordering, one turn in
+flight, queue / merge / supersede policies, in-flight cancellation).
+
+Run:  python -m pytest test_turn_scheduler.py -v
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app import turn_scheduler
+from app.config import settings
+
+
+class FakeTurns:
+    """Stands in for orchestrator.prepare_turn / apply_turn.
+
+    prepare_turn blocks on ``gate`` (the Component B call); apply_turn
+    records the text of every completed turn.
+    """
+
+    def __init__(self) -> None:
+        self.started: list[tuple[str, str]] = []
+        self.applied: list[str] = []
+        self.cancelled: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        self.gate = asyncio.Event()
+
+    async def prepare_turn(self, session_id: str, text: str):
+        self.started.append((session_id, text))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        finally:
+            self.running -= 1
+        return object()
+
+    async def apply_turn(self, session_id: str, text: str, oracle_resp, ts_start: float) -> None:
+        self.applied.append(text)
+
+
+async def settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class SchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    policy = "queue"
+    cancel_in_flight = False
+
+    async def asyncSetUp(self):
+        self.turns = FakeTurns()
+        patches = [
+            mock.patch("app.turn_scheduler.orchestrator.prepare_turn", self.turns.prepare_turn),
+            mock.patch("app.turn_scheduler.orchestrator.apply_turn", self.turns.apply_turn),
+            mock.patch.object(settings, "turn_policy", self.policy),
+            mock.patch.object(settings, "turn_cancel_in_flight", self.cancel_in_flight),
+            mock.patch.object(settings, "turn_queue_size", 2),
+            mock.patch.dict(turn_scheduler._stats, {k: 0 for k in turn_scheduler._stats}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def asyncTearDown(self):
+        await turn_scheduler.close_all()
+
+    async def speak(self, *texts: str, session_id: str = "s") -> None:
+        for text in texts:
+            turn_scheduler.submit(session_id, text)
+            await settle()
+
+
+class TestQueuePolicy(SchedulerTestCase):
+
+    async def test_submit_returns_before_the_turn_finishes(self):
+        await self.speak("hello")
+        self.assertEqual(self.turns.started, [("s", "hello")])
+        self.assertTrue(turn_scheduler.busy("s"))
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual(self.turns.applied, ["hello"])
+        self.assertFalse(turn_scheduler.busy("s"))
+
+    async def test_one_turn_in_flight_per_session_in_order(self):
+        await self.speak("a", "b", "c")
+        await self.speak("x", session_id="other")
+        self.assertEqual(self.turns.started, [("s", "a"), ("other", "x")])
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual([t for s, t in self.turns.started if s == "s"], ["a", "b", "c"])
+        self.assertEqual(self.turns.max_running, 2)  # one per session
+
+    async def test_full_queue_drops_oldest_waiting(self):
+        await self.speak("a", "b", "c", "d")
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual(self.turns.applied, ["a", "c", "d"])
+        self.assertEqual(turn_scheduler.stats()["dropped"], 1)
+
+    async def test_failed_turn_does_not_stop_the_worker(self):
+        self.turns.gate.set()
+        with mock.patch(
+            "app.turn_scheduler.orchestrator.apply_turn",
+            mock.AsyncMock(side_effect=[RuntimeError("boom"), None]),
+        ) as apply:
+            await self.speak("a", "b")
+            await settle()
+        self.assertEqual(apply.await_count, 2)
+        self.assertFalse(turn_scheduler.busy("s"))
+
+
+class TestMergeAndSupersede(SchedulerTestCase):
+    policy = "merge"
+
+    async def test_waiting_utterances_merge_into_one_turn(self):
+        await self.speak("go left", "no wait", "go right")
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual(self.turns.applied, ["go left", "no wait go right"])
+        self.assertEqual(turn_scheduler.stats()["llm_calls_saved"], 1)
+
+    async def test_supersede_keeps_only_the_newest(self):
+        with mock.patch.object(settings, "turn_policy", "supersede"):
+            await self.speak("a", "b", "c")
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual(self.turns.applied, ["a", "c"])
+        self.assertEqual(turn_scheduler.stats()["superseded"], 1)
+
+
+class TestCancelInFlight(SchedulerTestCase):
+    policy = "merge"
+    cancel_in_flight = True
+
+    async def test_newer_speech_cancels_and_restarts_merged(self):
+        await self.speak("node A", "actually node B")
+        self.assertEqual(self.turns.cancelled, ["node A"])
+        self.turns.gate.set()
+        await settle()
+        self.assertEqual(self.turns.applied, ["node A actually node B"])
+        stats = turn_scheduler.stats()
+        self.assertEqual((stats["cancelled"], stats["turns"], stats["llm_calls_saved"]), (1, 1, 0))
+
+    async def test_committing_turn_is_never_cancelled(self):
+        release = asyncio.Event()
+
+        async def slow_apply(session_id, text, oracle_resp, ts_start):
+            await release.wait()
+            self.turns.applied.append(text)
+
+        self.turns.gate.set()
+        with mock.patch("app.turn_scheduler.orchestrator.apply_turn", slow_apply):
+            await self.speak("a", "b")
+            release.set()
+            await settle()
+        self.assertEqual(self.turns.applied, ["a", "b"])
+        self.assertEqual(self.turns.cancelled, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+"""
+Unit tests for per-connection WS send queues (policies, slow consumers),
+subscriber interest filters, rate-limited emotion_update fan-out and
+ui_delta routing and msgpack sockets.
+
+Run:  python -m pytest test_ws_handler.py -v
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import msgpack
+
+from app import ws_codec, ws_handler
+from app.config import settings
+from app.models import (
+    ColorMood,
+    EmotionScores,
+    EmotionSignal,
+    PreviousUIState,
+    UICommands,
+    WSEmotionUpdate,
+    WSUIUpdate,
+)
+from app.orchestrator import ui_delta
+
+
+class FakeWebSocket:
+    """Records sent frames; ``gate`` (when set) blocks every send."""
+
+    def __init__(self, subprotocols: tuple[str, ...] = ()) -> None:
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.subprotocol = None
+        self.sent: list[str | bytes] = []
+        self.closed_with = None
+        self.gate = None
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        self.subprotocol = subprotocol
+
+    async def send_text(self, payload: str) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(payload)
+
+    send_bytes = send_text
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+    def types(self) -> list[str]:
+        return [json.loads(p)["type"] for p in self.sent]
+
+
+async def settle() -> None:
+    await asyncio.sleep(0.01)
+    # Then some loop turns for the writers — a collector pause can swallow
+    # the whole sleep, and these don't depend on wall time.
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestSendQueues(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(settings, "ws_send_queue_size", 8)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fast, self.slow = FakeWebSocket(), FakeWebSocket()
+        self.slow.gate = asyncio.Event()
+        await ws_handler.connect("s", self.fast)
+        await ws_handler.connect("s", self.slow)
+
+    async def asyncTearDown(self):
+        await ws_handler.close_all("s")
+
+    async def test_slow_socket_does_not_stall_others(self):
+        for i in range(3):
+            await ws_handler.broadcast("s", {"type": "oracle_speech", "text": str(i)})
+        await settle()
+        self.assertEqual(self.fast.types(), ["oracle_speech"] * 3)
+        self.assertEqual(self.slow.sent, [])
+        self.slow.gate.set()
+        await settle()
+        self.assertEqual([json.loads(p)["text"] for p in self.slow.sent], ["0", "1", "2"])
+
+    async def test_conflated_types_send_only_the_newest(self):
+        await ws_handler.broadcast("s", {"type": "ui_update", "n": 0})
+        for remaining in (5, 4, 3):
+            await ws_handler.broadcast("s", {"type": "timer_tick", "time_remaining": remaining})
+            await settle()
+        await ws_handler.broadcast("s", {"type": "phase_change", "n": 1})
+        self.slow.gate.set()
+        await settle()
+        self.assertEqual(self.slow.types(), ["ui_update", "timer_tick", "phase_change"])
+        self.assertEqual(json.loads(self.slow.sent[1])["time_remaining"], 3)
+        self.assertEqual(len(self.fast.sent), 5)
+
+    async def test_droppable_types_are_shed_under_backlog(self):
+        for i in range(20):
+            await ws_handler.broadcast("s", {"type": "emotion_update", "i": i})
+            await settle()
+        self.slow.gate.set()
+        await settle()
+        self.assertLess(len(self.slow.sent), 20)
+        self.assertEqual(len(self.fast.sent), 20)
+        self.assertTrue(ws_handler.session_has_connections("s"))
+
+    async def test_overflowing_consumer_is_disconnected(self):
+        for i in range(settings.ws_send_queue_size + 2):
+            await ws_handler.broadcast("s", {"type": "oracle_speech", "i": i})
+            await settle()
+        self.assertEqual(ws_handler.connection_count("s"), 1)
+        self.assertEqual(self.slow.closed_with, 1013)
+        self.assertEqual(len(self.fast.sent), settings.ws_send_queue_size + 2)
+
+
+def emotion_update(stress: float) -> WSEmotionUpdate:
+    scores = EmotionScores(stress=stress, focus=0.5, confusion=0.1, confidence=0.3, neutral=0.1)
+    return WSEmotionUpdate(
+        data=EmotionSignal(timestamp=0, emotions=scores, dominant="stress", face_detected=True)
+    )
+
+
+class TestFanOut(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.browser, self.pipeline = FakeWebSocket(), FakeWebSocket()
+        await ws_handler.connect("s", self.browser)
+        await ws_handler.connect("s", self.pipeline)
+        ws_handler.subscribe("s", self.pipeline, ["oracle_speech"])
+
+    async def asyncTearDown(self):
+        await ws_handler.close_all("s")
+
+    async def test_subscriber_only_receives_its_types(self):
+        await ws_handler.broadcast("s", {"type": "timer_tick", "time_remaining": 10})
+        await ws_handler.broadcast("s", {"type": "oracle_speech", "text": "hi"})
+        await settle()
+        self.assertEqual(self.browser.types(), ["timer_tick", "oracle_speech"])
+        self.assertEqual(self.pipeline.types(), ["oracle_speech"])
+
+    async def test_unwanted_type_is_not_serialised(self):
+        ws_handler.subscribe("s", self.browser, ["oracle_speech"])
+        with mock.patch("app.ws_handler.json.dumps") as dumps:
+            await ws_handler.broadcast("s", {"type": "timer_tick", "time_remaining": 10})
+        dumps.assert_not_called()
+
+    async def test_burst_is_coalesced_to_newest(self):
+        for i in range(10):
+            await ws_handler.broadcast_latest("s", emotion_update(i / 10), max_hz=20)
+        await settle()
+        self.assertEqual(len(self.browser.sent), 1)
+        await asyncio.sleep(0.06)
+        stresses = [json.loads(p)["data"]["emotions"]["stress"] for p in self.browser.sent]
+        self.assertEqual(stresses, [0.0, 0.9])
+        self.assertEqual(self.pipeline.sent, [])
+
+    async def test_zero_hz_forwards_every_frame(self):
+        for i in range(3):
+            await ws_handler.broadcast_latest("s", emotion_update(i / 10), max_hz=0)
+            await settle()
+        self.assertEqual(len(self.browser.sent), 3)
+
+
+class TestUIDelta(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.plain, self.delta = FakeWebSocket(), FakeWebSocket()
+        await ws_handler.connect("s", self.plain)
+        await ws_handler.connect("s", self.delta)
+        ws_handler.enable_ui_delta("s", self.delta)
+
+    async def asyncTearDown(self):
+        await ws_handler.close_all("s")
+
+    def test_delta_contains_only_changed_fields(self):
+        prev = PreviousUIState(ui_commands=UICommands(), version=3)
+        msg = ui_delta(prev, UICommands(color_mood=ColorMood.intense), 4)
+        self.assertEqual((msg.base_version, msg.version), (3, 4))
+        self.assertEqual(msg.changes, {"color_mood": "intense"})
+
+    def test_first_delta_carries_everything(self):
+        msg = ui_delta(None, UICommands(), 1)
+        self.assertEqual(msg.base_version, 0)
+        self.assertEqual(set(msg.changes), set(UICommands.model_fields))
+
+    async def test_each_socket_gets_its_encoding(self):
+        ui = UICommands()
+        await ws_handler.broadcast("s", WSUIUpdate(data=ui, version=1))
+        await ws_handler.broadcast("s", ui_delta(None, ui, 1))
+        await ws_handler.send_queued("s", self.delta, WSUIUpdate(data=ui, version=1))
+        await settle()
+        self.assertEqual(self.plain.types(), ["ui_update"])
+        self.assertEqual(self.delta.types(), ["ui_delta", "ui_update"])
+
+
+class TestMsgpackSockets(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.text = FakeWebSocket()
+        self.binary = FakeWebSocket(subprotocols=("other", ws_codec.MSGPACK))
+        await ws_handler.connect("s", self.text)
+        await ws_handler.connect("s", self.binary)
+
+    async def asyncTearDown(self):
+        await ws_handler.close_all("s")
+
+    async def test_subprotocol_is_negotiated_per_socket(self):
+        self.assertIsNone(self.text.subprotocol)
+        self.assertEqual(self.binary.subprotocol, ws_codec.MSGPACK)
+
+    async def test_same_message_in_both_encodings(self):
+        await ws_handler.broadcast("s", {"type": "timer_tick", "time_remaining": 9})
+        await ws_handler.deliver_local("s", "oracle_speech", '{"type": "oracle_speech", "text": "hi"}')
+        await settle()
+        self.assertEqual(self.text.types(), ["timer_tick", "oracle_speech"])
+        self.assertEqual(
+            [msgpack.unpackb(p) for p in self.binary.sent],
+            [{"type": "timer_tick", "time_remaining": 9}, {"type": "oracle_speech", "text": "hi"}],
+        )
+
+    def test_decode_text_and_binary_frames(self):
+        msg = {"type": "player_speech", "text": "go"}
+        self.assertEqual(ws_codec.decode({"text": json.dumps(msg)}), msg)
+        self.assertEqual(ws_codec.decode({"bytes": msgpack.packb(msg)}), msg)
+        with self.assertRaises(ValueError):
+            ws_codec.decode({"bytes": b"\xc1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
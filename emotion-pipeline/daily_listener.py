@@ -34,6 +34,10 @@ class TavusEventHandler(EventHandler):
         self.ws_client = ws_client
         self.call_client: CallClient | None = None
         self.last_conversation_id: str | None = None
+        # Reply being echoed sentence by sentence (oracle_speech_partial):
+        # its backend turn_id and the chunks already sent
+        self._echo_turn: str | None = None
+        self._echo_sent: list[str] = []
 
     def set_call_client(self, client: CallClient) -> None:
         self.call_client = client
@@ -48,15 +52,17 @@ class TavusEventHandler(EventHandler):
         if conversation_id:
             self.last_conversation_id = str(conversation_id)
 
-    def send_echo(self, text: str, emotion_tag: str | None = None) -> None:
+    def _ready(self, tag: str) -> bool:
         if not self.call_client:
-            logging.error("[send_echo] FAILED — CallClient not set")
-            return
+            logging.error("[%s] FAILED — CallClient not set", tag)
+            return False
         if not self.last_conversation_id:
-            logging.error("[send_echo] FAILED — conversation_id unknown")
-            return
+            logging.error("[%s] FAILED — conversation_id unknown", tag)
+            return False
+        return True
 
-        logging.info("[send_echo] sending interrupt  conversation_id=%s", self.last_conversation_id)
+    def _send_interrupt(self, tag: str) -> None:
+        logging.info("[%s] sending interrupt  conversation_id=%s", tag, self.last_conversation_id)
         try:
             self.call_client.send_app_message(
                 {
@@ -65,32 +71,77 @@ class TavusEventHandler(EventHandler):
                     "conversation_id": self.last_conversation_id,
                 }
             )
-            logging.info("[send_echo] interrupt sent OK")
+            logging.info("[%s] interrupt sent OK", tag)
         except Exception:
-            logging.exception("[send_echo] FAILED to send conversation.interrupt")
-
-        if emotion_tag:
-            body = f'<emotion value="{emotion_tag}"/> {text}'
-        else:
-            body = text
-
-        logging.info("[send_echo] sending echo  conversation_id=%s  text=%r", self.last_conversation_id, body[:80])
+            logging.exception("[%s] FAILED to send conversation.interrupt", tag)
+
+    def _send_echo_event(self, tag: str, text: str, done: bool, inference_id: str | None = None) -> None:
+        properties: dict[str, Any] = {"modality": "text", "text": text, "done": done}
+        if inference_id:
+            properties["inference_id"] = inference_id
+        logging.info("[%s] sending echo  conversation_id=%s  done=%s  text=%r",
+                     tag, self.last_conversation_id, done, text[:80])
         try:
             self.call_client.send_app_message(
                 {
                     "message_type": "conversation",
                     "event_type": "conversation.echo",
                     "conversation_id": self.last_conversation_id,
-                    "properties": {
-                        "modality": "text",
-                        "text": body,
-                        "done": True,
-                    },
+                    "properties": properties,
                 }
             )
-            logging.info("[send_echo] echo sent OK — avatar should speak now")
+            logging.info("[%s] echo sent OK — avatar should speak now", tag)
         except Exception:
-            logging.exception("[send_echo] FAILED to send conversation.echo")
+            logging.exception("[%s] FAILED to send conversation.echo", tag)
+
+    def send_echo(self, text: str, emotion_tag: str | None = None, turn_id: str | None = None) -> None:
+        """Echo a complete ORACLE reply.
+
+        ``turn_id`` is the streamed turn the reply completes (oracle_speech
+        carries it).  If it matches the open chunked echo and the reply starts
+        with the chunks already spoken, only the rest is sent; otherwise that
+        turn was abandoned, so the avatar is interrupted and says this reply
+        from the start.
+        """
+        if not self._ready("send_echo"):
+            return
+        if self._echo_turn is not None:
+            open_turn, sent = self._echo_turn, self._echo_sent
+            self._echo_turn, self._echo_sent = None, []
+            rest = _unsent_tail(text, sent) if turn_id == open_turn else None
+            if rest is not None:
+                self._send_echo_event("send_echo", rest, done=True, inference_id=open_turn)
+                return
+            logging.warning(
+                "[send_echo] streamed turn %s abandoned — echoing reply from the start", open_turn
+            )
+
+        self._send_interrupt("send_echo")
+        if emotion_tag:
+            body = f'<emotion value="{emotion_tag}"/> {text}'
+        else:
+            body = text
+        self._send_echo_event("send_echo", body, done=True)
+
+    def send_echo_chunk(self, turn_id: str, seq: int, text: str, emotion_tag: str | None = None) -> None:
+        """Echo one sentence of a reply still being generated (done: False).
+
+        The first chunk of a new turn interrupts whatever the avatar is
+        saying; send_echo() sends the rest of the reply with done: True.
+        """
+        if not self._ready("send_echo_chunk"):
+            return
+        body = text
+        if turn_id != self._echo_turn:
+            self._send_interrupt("send_echo_chunk")
+            self._echo_turn, self._echo_sent = turn_id, []
+            if emotion_tag:
+                body = f'<emotion value="{emotion_tag}"/> {text}'
+        elif seq < len(self._echo_sent):
+            logging.debug("[send_echo_chunk] duplicate chunk  turn=%s  seq=%d", turn_id, seq)
+            return
+        self._send_echo_event("send_echo_chunk", body, done=False, inference_id=turn_id)
+        self._echo_sent.append(text)
 
     def on_app_message(self, message: Any, sender: str = "") -> None:
         payload = message
@@ -146,7 +197,7 @@ class TavusEventHandler(EventHandler):
                 except Exception:
                     loop = None
                 if loop is not None:
-                    loop.create_task(self.ws_client.send_emotion_data(contract1))
+                    loop.create_task(self.ws_client.queue_emotion_data(contract1))
                     if player_speech:
                         loop.create_task(self.ws_client.send_player_speech(player_speech))
             elif self.ws_client is not None and not is_user:
@@ -158,6 +209,22 @@ class TavusEventHandler(EventHandler):
                 )
 
 
+def _unsent_tail(text: str, sent: list[str]) -> str | None:
+    """The part of ``text`` after the chunks already echoed.
+
+    None if ``text`` does not start with those chunks, in order (whitespace
+    between them is ignored) — it is not the reply they came from.
+    """
+    pos = 0
+    for chunk in sent:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if not text.startswith(chunk, pos):
+            return None
+        pos += len(chunk)
+    return text[pos:].strip()
+
+
 def _safe_json(payload: Any) -> str:
     try:
         return json.dumps(payload, ensure_ascii=True)
@@ -197,6 +264,25 @@ def parse_args() -> argparse.Namespace:
         default=os.getenv("SESSION_ID"),
         help="Session ID for backend WS (env: SESSION_ID)",
     )
+    parser.add_argument(
+        "--ws-encoding",
+        choices=["json", "msgpack"],
+        default=os.getenv("BACKEND_WS_ENCODING", "json"),
+        help="Backend WS frame encoding; msgpack needs `pip install msgpack` (env: BACKEND_WS_ENCODING)",
+    )
+    parser.add_argument(
+        "--emotion-batch-ms",
+        type=int,
+        default=int(os.getenv("EMOTION_BATCH_MS", "0")),
+        help="Hold emotion frames up to this long and send them as one emotion_batch; 0 = send each (env: EMOTION_BATCH_MS)",
+    )
+    parser.add_argument(
+        "--echo-mode",
+        choices=["chunked", "full"],
+        default=os.getenv("ECHO_MODE", "chunked"),
+        help="chunked: echo oracle_speech_partial sentences as they stream (backend ORACLE_STREAMING); "
+             "full: echo only complete oracle_speech replies (env: ECHO_MODE)",
+    )
     return parser.parse_args()
 
 
@@ -216,7 +302,12 @@ def main() -> int:
 
     ws_client = None
     if args.backend_ws and args.session_id:
-        ws_client = BackendWSClient(args.backend_ws, args.session_id)
+        ws_client = BackendWSClient(
+            args.backend_ws,
+            args.session_id,
+            encoding=args.ws_encoding,
+            emotion_batch_delay=args.emotion_batch_ms / 1000,
+        )
 
     handler = TavusEventHandler(log_all=args.log_all, ws_client=ws_client)
     client = CallClient(event_handler=handler)
@@ -227,18 +318,26 @@ def main() -> int:
         logging.info("Connecting backend WS: %s", ws_client.ws_url)
         loop = Daily.get_event_loop()
 
-        def _on_backend_message(raw: str) -> None:
+        def _on_backend_message(raw: str | bytes) -> None:
             # Checkpoint 4: echo backend speech to Tavus replica
             try:
-                msg = json.loads(raw)
+                msg = ws_client.decode(raw)
             except Exception:
-                logging.error("[ECHO PHASE 1/3] bad JSON from backend: %r", raw[:200])
+                logging.error("[ECHO PHASE 1/3] bad frame from backend: %r", raw[:200])
                 return
 
             msg_type = msg.get("type", "unknown")
             logging.info("[ECHO PHASE 1/3] backend_ws received  type=%s  payload=%s", msg_type, raw[:200])
 
-            if isinstance(msg, dict) and msg_type == "oracle_speech":
+            if isinstance(msg, dict) and msg_type == "oracle_speech_partial":
+                text = msg.get("text") or ""
+                logging.info("[ECHO PHASE 2/3] oracle_speech_partial matched  turn=%s  seq=%s  text=%r",
+                             msg.get("turn_id"), msg.get("seq"), text[:80])
+                if not text or not handler.last_conversation_id:
+                    logging.warning("[ECHO PHASE 2/3] SKIPPED partial — empty text or no conversation_id")
+                    return
+                handler.send_echo_chunk(str(msg.get("turn_id")), int(msg.get("seq", 0)), text)
+            elif isinstance(msg, dict) and msg_type == "oracle_speech":
                 text = msg.get("text") or ""
                 logging.info("[ECHO PHASE 2/3] oracle_speech matched  text=%r  conversation_id=%s",
                              text[:80], handler.last_conversation_id)
@@ -252,13 +351,18 @@ def main() -> int:
                     )
                     return
                 logging.info("[ECHO PHASE 3/3] calling send_echo → conversation.echo to Tavus")
-                handler.send_echo(text)
+                handler.send_echo(text, turn_id=msg.get("turn_id"))
                 logging.info("[ECHO PHASE 3/3] send_echo returned (avatar should speak now)")
             else:
                 logging.debug("[ECHO PHASE 1/3] ignoring non-oracle_speech message  type=%s", msg_type)
 
         async def _ws_task() -> None:
             await ws_client.connect()
+            # Only ORACLE speech is echoed; skip the emotion/UI/timer fan-out.
+            echoed = ["oracle_speech"]
+            if args.echo_mode == "chunked":
+                echoed.append("oracle_speech_partial")
+            await ws_client.subscribe(echoed)
             await ws_client.recv_loop_with_handler(_on_backend_message)
 
         loop.create_task(_ws_task())
@@ -0,0 +1,122 @@
+"""Test harness for chunked echo (oracle_speech_partial → conversation.echo).
+
+Runs the listener's echo logic against a fake CallClient; no Daily room or
+backend needed (daily-python must be installed, as for daily_listener.py).
+
+Usage:
+  python emotion-pipeline/test_echo.py
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from daily_listener import TavusEventHandler, _unsent_tail
+
+
+class FakeCallClient:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+
+    def send_app_message(self, message: dict[str, Any]) -> None:
+        self.sent.append(message)
+
+    def events(self) -> list[tuple]:
+        """(event, text, done, inference_id) per message; interrupts as ("interrupt",)."""
+        out: list[tuple] = []
+        for m in self.sent:
+            if m["event_type"] == "conversation.interrupt":
+                out.append(("interrupt",))
+            else:
+                p = m["properties"]
+                out.append(("echo", p["text"], p["done"], p.get("inference_id")))
+        return out
+
+
+def make_handler() -> tuple[TavusEventHandler, FakeCallClient]:
+    client = FakeCallClient()
+    handler = TavusEventHandler(log_all=False, ws_client=None)
+    handler.set_call_client(client)
+    handler.last_conversation_id = "conv-1"
+    return handler, client
+
+
+REPLY = "Good instinct. Node A is weak. Trace it now."
+
+
+def test_unsent_tail() -> None:
+    assert _unsent_tail(REPLY, []) == REPLY
+    assert _unsent_tail(REPLY, ["Good instinct."]) == "Node A is weak. Trace it now."
+    assert _unsent_tail(REPLY, ["Good instinct.", "Node A is weak.", "Trace it now."]) == ""
+    # Chunks must be the start of the reply, in order
+    assert _unsent_tail(REPLY, ["Node A is weak."]) is None
+    assert _unsent_tail(REPLY, ["Node A is weak.", "Good instinct."]) is None
+    assert _unsent_tail("Something else entirely.", ["Good instinct."]) is None
+
+
+def test_chunks_then_matching_reply_sends_only_the_tail() -> None:
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo_chunk("t1", 1, "Node A is weak.")
+    handler.send_echo(REPLY, turn_id="t1")
+    assert client.events() == [
+        ("interrupt",),
+        ("echo", "Good instinct.", False, "t1"),
+        ("echo", "Node A is weak.", False, "t1"),
+        ("echo", "Trace it now.", True, "t1"),
+    ]
+    assert handler._echo_turn is None
+
+
+def test_duplicate_seq_is_sent_once() -> None:
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo_chunk("t1", 1, "Node A is weak.")
+    handler.send_echo_chunk("t1", 1, "Node A is weak.")
+    assert [e[1] for e in client.events() if e[0] == "echo"] == ["Good instinct.", "Node A is weak."]
+
+
+def test_new_turn_interrupts_the_open_one() -> None:
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo_chunk("t2", 0, "Hold on.")
+    assert client.events()[-2:] == [("interrupt",), ("echo", "Hold on.", False, "t2")]
+    assert handler._echo_sent == ["Hold on."]
+
+
+def test_abandoned_turn_reply_is_echoed_from_the_start() -> None:
+    # The stream failed after a partial: the fallback reply has no turn_id
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo("The link dropped. Try again.", turn_id=None)
+    assert client.events()[-2:] == [("interrupt",), ("echo", "The link dropped. Try again.", True, None)]
+    assert handler._echo_turn is None
+
+
+def test_same_turn_but_different_text_is_echoed_from_the_start() -> None:
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.")
+    handler.send_echo("Node A is weak.", turn_id="t1")
+    assert client.events()[-2:] == [("interrupt",), ("echo", "Node A is weak.", True, None)]
+
+
+def test_emotion_tag_is_not_part_of_the_matched_chunks() -> None:
+    handler, client = make_handler()
+    handler.send_echo_chunk("t1", 0, "Good instinct.", emotion_tag="calm")
+    handler.send_echo(REPLY, turn_id="t1")
+    assert client.events()[1] == ("echo", '<emotion value="calm"/> Good instinct.', False, "t1")
+    assert client.events()[-1] == ("echo", "Node A is weak. Trace it now.", True, "t1")
+
+
+def main() -> int:
+    tests = [(name, fn) for name, fn in globals().items() if name.startswith("test_") and callable(fn)]
+    for name, fn in tests:
+        fn()
+        print(f"ok  {name}")
+    print(f"\n{len(tests)} passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Test harness for emotion frame micro-batching in ws_client.
+
+Runs BackendWSClient against a fake socket; no backend needed.
+
+Usage:
+  python emotion-pipeline/test_ws_batch.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import websockets
+
+from ws_client import BackendWSClient
+
+
+class FakeWS:
+    subprotocol = None
+
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.closed = False
+        self.broken = False
+
+    async def send(self, frame: str) -> None:
+        if self.broken:
+            raise websockets.ConnectionClosed(None, None)
+        self.sent.append(json.loads(frame))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def make_client(delay: float, max_frames: int = 20) -> tuple[BackendWSClient, FakeWS]:
+    client = BackendWSClient("ws://test", "s1", emotion_batch_delay=delay, emotion_batch_max=max_frames)
+    ws = FakeWS()
+    client.ws = ws  # type: ignore[assignment]
+    client._connected = True
+    return client, ws
+
+
+def frame(ts: int) -> dict[str, Any]:
+    return {"timestamp": ts, "dominant": "neutral"}
+
+
+def types(ws: FakeWS) -> list[str]:
+    return [m["type"] for m in ws.sent]
+
+
+async def wait_for(condition, timeout: float = 1.0) -> None:
+    for _ in range(int(timeout / 0.005)):
+        if condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition never met")
+
+
+async def check_no_delay_sends_each_frame() -> None:
+    client, ws = make_client(delay=0)
+    await client.queue_emotion_data(frame(1))
+    await client.queue_emotion_data(frame(2))
+    assert types(ws) == ["emotion_data", "emotion_data"]
+
+
+async def check_size_cap_sends_at_once() -> None:
+    client, ws = make_client(delay=10, max_frames=3)
+    for ts in range(3):
+        await client.queue_emotion_data(frame(ts))
+    assert ws.sent == [{"type": "emotion_batch", "frames": [frame(0), frame(1), frame(2)]}]
+    assert client._flush_task is None and client._pending_frames == []
+
+
+async def check_delay_flushes_held_frames() -> None:
+    client, ws = make_client(delay=0.02)
+    await client.queue_emotion_data(frame(1))
+    await client.queue_emotion_data(frame(2))
+    assert ws.sent == []
+    await wait_for(lambda: ws.sent)
+    assert ws.sent == [{"type": "emotion_batch", "frames": [frame(1), frame(2)]}]
+    assert client._flush_task is None
+
+
+async def check_single_held_frame_is_plain_emotion_data() -> None:
+    client, ws = make_client(delay=0.01)
+    await client.queue_emotion_data(frame(1))
+    await wait_for(lambda: ws.sent)
+    assert ws.sent == [{"type": "emotion_data", "data": frame(1)}]
+
+
+async def check_player_speech_flushes_first() -> None:
+    client, ws = make_client(delay=10)
+    await client.queue_emotion_data(frame(1))
+    await client.queue_emotion_data(frame(2))
+    await client.send_player_speech("node A")
+    assert types(ws) == ["emotion_batch", "player_speech"]
+    assert client._flush_task is None
+
+
+async def check_socket_closed_while_frames_held_is_logged() -> None:
+    errors: list[dict[str, Any]] = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+    for lose in ("broken", "disconnected"):
+        client, ws = make_client(delay=0.01)
+        await client.queue_emotion_data(frame(1))
+        task = client._flush_task
+        if lose == "broken":
+            ws.broken = True  # send raises ConnectionClosed
+        else:
+            client._connected = False  # send raises RuntimeError
+        await wait_for(task.done)
+        assert task.exception() is None, lose
+        assert ws.sent == [] and client._pending_frames == []
+    assert errors == []
+
+
+async def check_close_drops_frames_of_a_lost_connection() -> None:
+    client, ws = make_client(delay=10)
+    await client.queue_emotion_data(frame(1))
+    task = client._flush_task
+    client._connected = False
+    await client.close()
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert ws.sent == [] and ws.closed
+    assert client._pending_frames == [] and client._flush_task is None
+
+
+async def check_close_sends_held_frames() -> None:
+    client, ws = make_client(delay=10)
+    await client.queue_emotion_data(frame(1))
+    await client.close()
+    assert types(ws) == ["emotion_data"] and ws.closed
+
+
+def main() -> int:
+    checks = [(name, fn) for name, fn in globals().items() if name.startswith("check_") and callable(fn)]
+    for name, fn in checks:
+        asyncio.run(fn())
+        print(f"ok  {name}")
+    print(f"\n{len(checks)} passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
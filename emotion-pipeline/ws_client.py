@@ -1,39 +1,81 @@
 """WebSocket client for SPECTRA backend (Checkpoint 3).
 
 Sends:
-  - emotion_data (Contract 1)
+  - emotion_data (Contract 1), or emotion_batch when micro-batching
   - player_speech
+  - subscribe (which backend messages this client wants)
+
+encoding="msgpack" offers the spectra.msgpack.v1 subprotocol (binary frames
+both ways); if the backend does not accept it the client stays on JSON.
+
+emotion_batch_delay > 0 turns queue_emotion_data() into a micro-batching
+sender: frames are held for at most that many seconds (or until
+emotion_batch_max are pending) and sent as one emotion_batch message.
+Frames still held when the socket closes are dropped (and logged), never
+sent on a later connection.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any, Callable, Optional
+import logging
+from typing import Any, AsyncIterator, Callable, Optional
 
 import websockets
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK_SUBPROTOCOL = "spectra.msgpack.v1"
+
 
 class BackendWSClient:
-    def __init__(self, base_url: str, session_id: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        session_id: str,
+        encoding: str = "json",
+        emotion_batch_delay: float = 0.0,
+        emotion_batch_max: int = 20,
+    ) -> None:
+        if encoding not in ("json", "msgpack"):
+            raise ValueError(f"unknown encoding {encoding!r}")
+        if encoding == "msgpack" and msgpack is None:
+            raise RuntimeError("encoding='msgpack' requires: pip install msgpack")
         self.base_url = base_url.rstrip("/")
         self.session_id = session_id
+        self.encoding = encoding
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self._connected = False
+        self._binary = False
+        self.emotion_batch_delay = emotion_batch_delay
+        self.emotion_batch_max = emotion_batch_max
+        self._pending_frames: list[dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
     @property
     def ws_url(self) -> str:
         return f"{self.base_url}/ws/session/{self.session_id}"
 
     async def connect(self) -> None:
-        self.ws = await websockets.connect(self.ws_url)
+        subprotocols = [MSGPACK_SUBPROTOCOL] if self.encoding == "msgpack" else None
+        self.ws = await websockets.connect(self.ws_url, subprotocols=subprotocols)
+        self._binary = self.ws.subprotocol == MSGPACK_SUBPROTOCOL
         self._connected = True
 
     async def close(self) -> None:
-        if self.ws is not None:
-            await self.ws.close()
-            self.ws = None
-        self._connected = False
+        try:
+            if self.is_connected:
+                await self.flush_emotion_data()
+        finally:
+            self._drop_pending_frames()
+            if self.ws is not None:
+                await self.ws.close()
+                self.ws = None
+            self._connected = False
 
     @property
     def is_connected(self) -> bool:
@@ -42,21 +84,84 @@ class BackendWSClient:
     async def send(self, payload: dict[str, Any]) -> None:
         if self.ws is None or not self._connected:
             raise RuntimeError("WebSocket not connected")
-        await self.ws.send(json.dumps(payload))
+        if self._binary:
+            await self.ws.send(msgpack.packb(payload, use_bin_type=True))
+        else:
+            await self.ws.send(json.dumps(payload))
 
     async def send_emotion_data(self, contract1: dict[str, Any]) -> None:
         await self.send({"type": "emotion_data", "data": contract1})
 
+    async def queue_emotion_data(self, contract1: dict[str, Any]) -> None:
+        """Micro-batched send_emotion_data (immediate when emotion_batch_delay is 0)."""
+        if self.emotion_batch_delay <= 0:
+            await self.send_emotion_data(contract1)
+            return
+        self._pending_frames.append(contract1)
+        if len(self._pending_frames) >= self.emotion_batch_max:
+            await self.flush_emotion_data()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.emotion_batch_delay)
+        self._flush_task = None
+        # Nobody awaits this task, so a socket that closed while frames were
+        # held must not surface as "Task exception was never retrieved".
+        try:
+            await self.flush_emotion_data()
+        except (RuntimeError, websockets.ConnectionClosed) as exc:
+            logging.warning("[ws_client] held emotion frames dropped: %s", exc)
+
+    async def flush_emotion_data(self) -> None:
+        """Send any frames held by queue_emotion_data now."""
+        self._cancel_flush()
+        frames, self._pending_frames = self._pending_frames, []
+        if len(frames) == 1:
+            await self.send_emotion_data(frames[0])
+        elif frames:
+            await self.send({"type": "emotion_batch", "frames": frames})
+
+    def _cancel_flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def _drop_pending_frames(self) -> None:
+        self._cancel_flush()
+        if self._pending_frames:
+            logging.warning("[ws_client] %d held emotion frames dropped on close", len(self._pending_frames))
+            self._pending_frames = []
+
     async def send_player_speech(self, text: str) -> None:
+        # The backend reads the emotion window for this turn — send held frames first.
+        await self.flush_emotion_data()
         await self.send({"type": "player_speech", "text": text})
 
+    async def subscribe(self, types: Optional[list[str]]) -> None:
+        """Only receive these backend message types (None = all)."""
+        await self.send({"type": "subscribe", "types": types})
+
+    @staticmethod
+    def decode(frame: str | bytes) -> Any:
+        if isinstance(frame, bytes):
+            return msgpack.unpackb(frame, raw=False)
+        return json.loads(frame)
+
+    async def messages(self) -> AsyncIterator[Any]:
+        """Decoded backend messages (JSON or msgpack frames)."""
+        if self.ws is None:
+            raise RuntimeError("WebSocket not connected")
+        async for frame in self.ws:
+            yield self.decode(frame)
+
     async def recv_loop(self) -> None:
         if self.ws is None:
             raise RuntimeError("WebSocket not connected")
         async for msg in self.ws:
             print(msg)
 
-    async def recv_loop_with_handler(self, handler: Callable[[str], None]) -> None:
+    async def recv_loop_with_handler(self, handler: Callable[[str | bytes], None]) -> None:
         if self.ws is None:
             raise RuntimeError("WebSocket not connected")
         async for msg in self.ws:
@@ -69,9 +174,10 @@ async def _smoke_test() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base-url", default="ws://localhost:8000")
     parser.add_argument("--session-id", required=True)
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json")
     args = parser.parse_args()
 
-    client = BackendWSClient(args.base_url, args.session_id)
+    client = BackendWSClient(args.base_url, args.session_id, encoding=args.encoding)
     await client.connect()
     await client.send_player_speech("Hello from emotion-pipeline")
     await client.close()
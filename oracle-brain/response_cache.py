@@ -0,0 +1,207 @@
+"""
+Response cache for ORACLE turns (opt-in: ORACLE_RESPONSE_CACHE=true).
+
+Many turns are near-identical — same phase, same option picked, similar
+emotional state — and each would otherwise cost a multi-second Claude call.
+Contract 3 responses are cached under a key built from Contract 2:
+
+    phase, normalized player input, emotion bucket (stress / focus quantized
+    to STRESS_STEP / FOCUS_STEP, plus trend), decisions_made // DECISIONS_STEP
+
+A hit stands in for a fresh Claude call on a new turn, so replaying a
+decision's score_delta is what Claude would do anyway. Replies that advance
+the phase or queue a next_prompt are not stored (see cacheable()): those
+belong to one point in the game, not to the input that produced them.
+
+Eviction is LRU (max_entries) plus a TTL per entry. Two lookup strategies:
+
+    exact    normalized input must match exactly
+    jaccard  within the same phase / emotion / decisions bucket, the entry
+             whose input word set is most similar (Jaccard >= threshold)
+
+stats() reports hits (exact / similar), misses, hit rate, evictions and
+replies skipped as uncacheable.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+EXACT = "exact"
+JACCARD = "jaccard"
+STRATEGIES = (EXACT, JACCARD)
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+Bucket = tuple[str, int, int, str, int]
+
+
+def normalize_input(text: str) -> str:
+    """Lower-case, drop punctuation, collapse whitespace."""
+    return _SPACE.sub(" ", _NON_WORD.sub(" ", (text or "").lower())).strip()
+
+
+def cacheable(response: dict) -> bool:
+    """False for replies that advance the phase or queue a next_prompt."""
+    update = response.get("game_update") or {}
+    return not (update.get("advance_phase") or update.get("next_prompt"))
+
+
+def _quantize(value: float, step: float) -> int:
+    return int(min(max(value, 0.0), 1.0) / step) if step > 0 else 0
+
+
+@dataclass
+class _Entry:
+    response: dict
+    words: frozenset[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU + TTL cache of Contract 3 responses keyed on Contract 2."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 600.0,
+        strategy: str = EXACT,
+        threshold: float = 0.8,
+        stress_step: float = 0.25,
+        focus_step: float = 0.25,
+        decisions_step: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown cache strategy {strategy!r} (expected one of {STRATEGIES})")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.strategy = strategy
+        self.threshold = threshold
+        self.stress_step = stress_step
+        self.focus_step = focus_step
+        self.decisions_step = max(decisions_step, 1)
+        self._clock = clock
+        self._entries: OrderedDict[tuple[Bucket, str], _Entry] = OrderedDict()
+        # bucket → normalized inputs cached in it (jaccard candidates)
+        self._by_bucket: dict[Bucket, set[str]] = {}
+        self._stats = {
+            "exact_hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "uncacheable": 0,
+        }
+
+    def bucket(self, contract2: dict) -> Bucket:
+        """Everything in the key except the player input."""
+        game = contract2.get("game_state") or {}
+        snapshot = contract2.get("emotion_snapshot") or {}
+        emotions = (snapshot.get("current") or {}).get("emotions") or {}
+        return (
+            str(game.get("phase", "")),
+            _quantize(float(emotions.get("stress", 0.0)), self.stress_step),
+            _quantize(float(emotions.get("focus", 0.0)), self.focus_step),
+            str(snapshot.get("trend", "")),
+            int(game.get("decisions_made", 0)) // self.decisions_step,
+        )
+
+    def get(self, contract2: dict) -> Optional[dict]:
+        """Cached Contract 3 for this turn (a copy), or None."""
+        bucket = self.bucket(contract2)
+        text = normalize_input(contract2.get("player_input", ""))
+        key = (bucket, text)
+        entry = self._live(key)
+        if entry is not None:
+            self._stats["exact_hits"] += 1
+        elif self.strategy == JACCARD and text:
+            key = self._most_similar(bucket, text)
+            entry = self._live(key) if key else None
+            if entry is not None:
+                self._stats["similar_hits"] += 1
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry.response)
+
+    def put(self, contract2: dict, response: dict) -> None:
+        """Store a reply for this turn (skipped if it is not cacheable())."""
+        if not cacheable(response):
+            self._stats["uncacheable"] += 1
+            return
+        bucket = self.bucket(contract2)
+        text = normalize_input(contract2.get("player_input", ""))
+        key = (bucket, text)
+        self._entries[key] = _Entry(
+            response=copy.deepcopy(response),
+            words=frozenset(text.split()),
+            expires_at=self._clock() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+        self._by_bucket.setdefault(bucket, set()).add(text)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_bucket.clear()
+
+    def stats(self) -> dict:
+        hits = self._stats["exact_hits"] + self._stats["similar_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            "strategy": self.strategy,
+            "entries": len(self._entries),
+            "hits": hits,
+            **self._stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- internals -----------------------------------------------------------
+
+    def _live(self, key: tuple[Bucket, str]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return None
+        return entry
+
+    def _most_similar(self, bucket: Bucket, text: str) -> Optional[tuple[Bucket, str]]:
+        """Best live candidate in the bucket; expired ones are dropped on the way."""
+        words = frozenset(text.split())
+        best, best_score = None, self.threshold
+        now, expired = self._clock(), []
+        for candidate in self._by_bucket.get(bucket, ()):
+            entry = self._entries[(bucket, candidate)]
+            if entry.expires_at <= now:
+                expired.append((bucket, candidate))
+                continue
+            union = len(words | entry.words)
+            score = len(words & entry.words) / union if union else 0.0
+            if score >= best_score:
+                best, best_score = (bucket, candidate), score
+        for key in expired:
+            self._remove(key)
+        self._stats["expirations"] += len(expired)
+        return best
+
+    def _remove(self, key: tuple[Bucket, str]) -> None:
+        del self._entries[key]
+        texts = self._by_bucket.get(key[0])
+        if texts is not None:
+            texts.discard(key[1])
+            if not texts:
+                del self._by_bucket[key[0]]
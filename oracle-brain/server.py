@@ -3,6 +3,14 @@ oracle-brain — REST API server (FastAPI)
 
 Exposes POST /api/oracle/respond for Component D to call.
 Accepts Contract 2 JSON, returns Contract 3 JSON via Claude.
+POST /api/oracle/respond/stream takes the same body and streams Claude's raw
+output (the Contract 3 JSON text) as it is generated.
+
+One AsyncAnthropic client (keep-alive connection pool) lives for the app's
+lifespan, and the system prompt is sent with prompt-cache control so repeat
+turns read it from cache; every call logs cache read / write token counts.
+With ORACLE_RESPONSE_CACHE=true, near-identical turns are answered from
+response_cache.ResponseCache without calling Claude at all.
 
 Usage:
     python run.py                    # live mode (calls Claude API)
@@ -14,15 +22,21 @@ import logging
 import os
 import re
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator
 
 import anthropic
+import httpx
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from dotenv import load_dotenv
 
+from response_cache import ResponseCache
+
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 # ── Config ────────────────────────────────────────────────────────────────────
@@ -38,6 +52,25 @@ MOCK_MODE = os.environ.get("MOCK_MODE", "false").lower() in ("true", "1", "yes")
 HOST = os.environ.get("HOST", "0.0.0.0")
 PORT = int(os.environ.get("ORACLE_PORT", "8001"))
 MODEL = os.environ.get("ORACLE_MODEL", "claude-sonnet-4-6")
+PROMPT_CACHE = os.environ.get("ORACLE_PROMPT_CACHE", "true").lower() in ("true", "1", "yes")
+# Idle connections are kept this long; turns are seconds apart, so the
+# httpx default (5 s) would redo the TLS handshake on most calls.
+KEEPALIVE_EXPIRY = float(os.environ.get("ORACLE_KEEPALIVE_S", "120"))
+
+# Response cache (opt-in): Contract 3 reused for near-identical turns
+RESPONSE_CACHE = os.environ.get("ORACLE_RESPONSE_CACHE", "false").lower() in ("true", "1", "yes")
+CACHE_MAX_ENTRIES = int(os.environ.get("ORACLE_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_S = float(os.environ.get("ORACLE_CACHE_TTL_S", "600"))
+CACHE_STRATEGY = os.environ.get("ORACLE_CACHE_STRATEGY", "exact")
+CACHE_SIMILARITY = float(os.environ.get("ORACLE_CACHE_SIMILARITY", "0.8"))
+
+# The system prompt as a cacheable block: the ~17 KB prompt is identical on
+# every call, so after the first turn it is read from the prompt cache.
+SYSTEM: Any = (
+    [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+    if PROMPT_CACHE
+    else SYSTEM_PROMPT
+)
 
 # ── Logging ───────────────────────────────────────────────────────────────────
 
@@ -60,20 +93,81 @@ def _extract_json(text: str) -> dict:
     return json.loads(text)
 
 
+# ── Claude client ─────────────────────────────────────────────────────────────
+
+_client: anthropic.AsyncAnthropic | None = None
+
+# Cumulative prompt-cache usage, reported on /health
+_usage = {
+    "calls": 0,
+    "cache_hits": 0,
+    "input_tokens": 0,
+    "cache_read_input_tokens": 0,
+    "cache_creation_input_tokens": 0,
+    "output_tokens": 0,
+}
+
+
+def get_client() -> anthropic.AsyncAnthropic:
+    """The shared AsyncAnthropic client (created on first use if the lifespan hasn't)."""
+    global _client
+    if _client is None:
+        logger.info("[claude] creating AsyncAnthropic client (model=%s, keep-alive %.0fs)", MODEL, KEEPALIVE_EXPIRY)
+        _client = anthropic.AsyncAnthropic(
+            api_key=os.environ["ANTHROPIC_API_KEY"],
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+        logger.info("[claude] AsyncAnthropic client closed")
+
+
+def _log_usage(usage: Any, started: float, first_token: float | None = None) -> None:
+    """Log one call's token usage (cache read / write) and add it to _usage."""
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    _usage["calls"] += 1
+    _usage["cache_hits"] += cache_read > 0
+    _usage["input_tokens"] += usage.input_tokens
+    _usage["cache_read_input_tokens"] += cache_read
+    _usage["cache_creation_input_tokens"] += cache_write
+    _usage["output_tokens"] += usage.output_tokens
+    ttft = f"  ttft={(first_token - started) * 1000:.0f}ms" if first_token else ""
+    logger.info(
+        "[claude] usage  cache=%s  cache_read=%d  cache_write=%d  input=%d  output=%d  total=%.0fms%s",
+        "hit" if cache_read else ("write" if cache_write else "miss"),
+        cache_read, cache_write, usage.input_tokens, usage.output_tokens,
+        (time.monotonic() - started) * 1000, ttft,
+    )
+
+
 # ── Claude call ───────────────────────────────────────────────────────────────
 
 async def call_claude(contract2: dict) -> dict:
     """Send Contract 2 to Claude and parse Contract 3 response (async, non-blocking)."""
-    logger.info("[claude] creating new AsyncAnthropic client (model=%s)", MODEL)
-    client = anthropic.AsyncAnthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    client = get_client()
     payload_str = json.dumps(contract2)
     logger.debug("[claude] → sending %d chars to Claude:\n%s", len(payload_str), payload_str[:500])
+    started = time.monotonic()
     result = await client.messages.create(
         model=MODEL,
         max_tokens=1024,
-        system=SYSTEM_PROMPT,
+        system=SYSTEM,
         messages=[{"role": "user", "content": payload_str}],
     )
+    _log_usage(result.usage, started)
     raw_text = result.content[0].text
     logger.info("[claude] ← raw response (%d chars): %s", len(raw_text), raw_text[:300])
     parsed = _extract_json(raw_text)
@@ -87,14 +181,85 @@ async def call_claude(contract2: dict) -> dict:
     return parsed
 
 
+async def stream_claude(contract2: dict) -> AsyncIterator[str]:
+    """Stream Claude's Contract 3 JSON text as it is generated."""
+    client = get_client()
+    payload_str = json.dumps(contract2)
+    logger.debug("[claude] → streaming %d chars to Claude:\n%s", len(payload_str), payload_str[:500])
+    started = time.monotonic()
+    first_token: float | None = None
+    async with client.messages.stream(
+        model=MODEL,
+        max_tokens=1024,
+        system=SYSTEM,
+        messages=[{"role": "user", "content": payload_str}],
+    ) as stream:
+        async for text in stream.text_stream:
+            if first_token is None:
+                first_token = time.monotonic()
+            yield text
+        final = await stream.get_final_message()
+    _log_usage(final.usage, started, first_token)
+
+
+async def _stream_response(response: dict, chunk_size: int = 24) -> AsyncIterator[str]:
+    """A ready Contract 3 (mock or cached), chunked like a token stream."""
+    text = json.dumps(response)
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+
+# ── Response cache ────────────────────────────────────────────────────────────
+
+response_cache: ResponseCache | None = (
+    ResponseCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        ttl=CACHE_TTL_S,
+        strategy=CACHE_STRATEGY,
+        threshold=CACHE_SIMILARITY,
+    )
+    if RESPONSE_CACHE
+    else None
+)
+
+
+def _cached(contract2: dict) -> dict | None:
+    if response_cache is None:
+        return None
+    started = time.monotonic()
+    response = response_cache.get(contract2)
+    if response is not None:
+        logger.info("[cache] hit in %.2fms  hit_rate=%.2f",
+                    (time.monotonic() - started) * 1000, response_cache.stats()["hit_rate"])
+    return response
+
+
 # ── FastAPI app ───────────────────────────────────────────────────────────────
 
-app = FastAPI(title="SPECTRA — Oracle Brain (Component B)", version="1.0.0")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if not MOCK_MODE:
+        try:
+            get_client()
+        except KeyError:
+            logger.warning("[claude] ANTHROPIC_API_KEY not set — Claude calls will fall back to mock")
+    yield
+    await close_client()
+
+
+app = FastAPI(title="SPECTRA — Oracle Brain (Component B)", version="1.0.0", lifespan=lifespan)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "mock_mode": MOCK_MODE, "model": MODEL}
+    return {
+        "status": "ok",
+        "mock_mode": MOCK_MODE,
+        "model": MODEL,
+        "prompt_cache": PROMPT_CACHE,
+        "usage": _usage,
+        "response_cache": response_cache.stats() if response_cache is not None else None,
+    }
 
 
 @app.post("/api/oracle/respond")
@@ -109,9 +274,13 @@ async def oracle_respond(request: Request):
     if MOCK_MODE:
         response = MOCK_RESPONSE
         logger.info("[out] MOCK mode — returning canned response")
+    elif (cached := _cached(contract2)) is not None:
+        response = cached
     else:
         try:
             response = await call_claude(contract2)
+            if response_cache is not None:
+                response_cache.put(contract2, response)
         except Exception as e:
             logger.warning("[warn] Claude call failed (%s), returning mock response", e)
             response = MOCK_RESPONSE
@@ -125,3 +294,50 @@ async def oracle_respond(request: Request):
     )
 
     return JSONResponse(content=response)
+
+
+@app.post("/api/oracle/respond/stream")
+async def oracle_respond_stream(request: Request):
+    """Receive Contract 2, stream Contract 3 JSON text as Claude writes it.
+
+    If Claude fails before the first chunk the canned response is streamed
+    instead; a failure mid-stream ends the body early (the caller's final
+    parse fails and it falls back).
+    """
+    contract2 = await request.json()
+
+    phase = contract2.get("game_state", {}).get("phase", "?")
+    player_input = contract2.get("player_input", "")
+    logger.info("[in]  stream  phase=%s  player=%r", phase, player_input)
+
+    async def body() -> AsyncIterator[str]:
+        if MOCK_MODE:
+            logger.info("[out] MOCK mode — streaming canned response")
+            async for chunk in _stream_response(MOCK_RESPONSE):
+                yield chunk
+            return
+        cached = _cached(contract2)
+        if cached is not None:
+            async for chunk in _stream_response(cached):
+                yield chunk
+            return
+        sent: list[str] = []
+        try:
+            async for chunk in stream_claude(contract2):
+                sent.append(chunk)
+                yield chunk
+        except Exception as e:
+            if sent:
+                logger.warning("[warn] Claude stream failed mid-response (%s)", e)
+                return
+            logger.warning("[warn] Claude stream failed (%s), streaming mock response", e)
+            async for chunk in _stream_response(MOCK_RESPONSE):
+                yield chunk
+            return
+        if response_cache is not None:
+            try:
+                response_cache.put(contract2, _extract_json("".join(sent)))
+            except ValueError:
+                logger.warning("[cache] streamed response is not valid JSON — not cached")
+
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
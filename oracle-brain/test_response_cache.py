@@ -0,0 +1,166 @@
+"""
+Unit tests for response_cache.py (keying, LRU + TTL eviction, similarity
+strategies, hit-rate metrics)
+
+Run:  python3 -m pytest test_response_cache.py -v
+"""
+
+import copy
+import json
+import unittest
+from pathlib import Path
+
+from response_cache import ResponseCache, cacheable, normalize_input
+
+# ── Load shared fixtures once ─────────────────────────────────────────────────
+
+MOCK_DIR = Path(__file__).parent.parent / "mock-data"
+CONTRACT2 = json.loads((MOCK_DIR / "context_payload.json").read_text())
+CONTRACT3 = json.loads((MOCK_DIR / "oracle_response.json").read_text())
+# The fixture scores points, so it is never cached; this reply changes nothing
+REPLY = CONTRACT3  # a scored decision (score_delta 10): cacheable
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def turn(player_input=None, phase=None, stress=None, trend=None, decisions=None) -> dict:
+    """A copy of the Contract 2 fixture with some fields overridden."""
+    c2 = copy.deepcopy(CONTRACT2)
+    if player_input is not None:
+        c2["player_input"] = player_input
+    if phase is not None:
+        c2["game_state"]["phase"] = phase
+    if stress is not None:
+        c2["emotion_snapshot"]["current"]["emotions"]["stress"] = stress
+    if trend is not None:
+        c2["emotion_snapshot"]["trend"] = trend
+    if decisions is not None:
+        c2["game_state"]["decisions_made"] = decisions
+    return c2
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ── Keying ────────────────────────────────────────────────────────────────────
+
+class TestKeying(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.cache.put(turn(), REPLY)
+
+    def test_normalized_input_and_nearby_state_hit(self):
+        self.assertEqual(normalize_input("  I think NODE A looks weakest!! "), "i think node a looks weakest")
+        # stress 0.72 and 0.70 share a 0.25 bucket; decisions 3 and 5 share a range of 3
+        hit = self.cache.get(turn(player_input="I think node A, looks weakest.", stress=0.70, decisions=5))
+        self.assertEqual(hit, REPLY)
+
+    def test_different_phase_emotion_trend_or_progress_miss(self):
+        for c2 in (
+            turn(phase="escape"),
+            turn(stress=0.2),
+            turn(trend="stable"),
+            turn(decisions=6),
+            turn(player_input="I think node B looks weakest"),
+        ):
+            self.assertIsNone(self.cache.get(c2))
+        self.assertEqual(self.cache.stats()["misses"], 5)
+
+    def test_hits_are_copies(self):
+        hit = self.cache.get(turn())
+        hit["oracle_response"]["text"] = "changed"
+        self.assertEqual(self.cache.get(turn()), REPLY)
+
+    def test_phase_advances_and_next_prompts_are_not_stored(self):
+        cache = ResponseCache()
+        for update in ({"advance_phase": True}, {"next_prompt": "Now pick a node."}):
+            with self.subTest(update=update):
+                reply = {**REPLY, "game_update": {**REPLY["game_update"], **update}}
+                self.assertFalse(cacheable(reply))
+                cache.put(turn(), reply)
+                self.assertIsNone(cache.get(turn()))
+        self.assertEqual(cache.stats()["uncacheable"], 2)
+        self.assertTrue(cacheable(REPLY))
+        self.assertTrue(cacheable({**REPLY, "game_update": {}}))
+
+    def test_unknown_strategy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ResponseCache(strategy="cosine")
+
+
+# ── Eviction ──────────────────────────────────────────────────────────────────
+
+class TestEviction(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put(turn("a"), {"n": "a"})
+        cache.put(turn("b"), {"n": "b"})
+        cache.get(turn("a"))
+        cache.put(turn("c"), {"n": "c"})
+        self.assertIsNone(cache.get(turn("b")))
+        self.assertEqual(cache.get(turn("a")), {"n": "a"})
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttl=60, clock=clock)
+        cache.put(turn(), REPLY)
+        clock.now = 59
+        self.assertIsNotNone(cache.get(turn()))
+        clock.now = 60
+        self.assertIsNone(cache.get(turn()))
+        self.assertEqual(cache.stats()["expirations"], 1)
+        self.assertEqual(len(cache), 0)
+
+
+# ── Similarity strategies ─────────────────────────────────────────────────────
+
+class TestSimilarity(unittest.TestCase):
+
+    def test_jaccard_matches_similar_input_in_the_same_bucket(self):
+        cache = ResponseCache(strategy="jaccard", threshold=0.6)
+        cache.put(turn("I think node A looks weakest"), REPLY)
+        self.assertEqual(cache.get(turn("i think node A looks the weakest")), REPLY)
+        self.assertIsNone(cache.get(turn("trace node C now")))
+        self.assertIsNone(cache.get(turn("i think node A looks the weakest", phase="escape")))
+        stats = cache.stats()
+        self.assertEqual((stats["similar_hits"], stats["misses"]), (1, 2))
+
+    def test_expired_candidates_are_skipped(self):
+        clock = FakeClock()
+        cache = ResponseCache(strategy="jaccard", threshold=0.5, ttl=60, clock=clock)
+        cache.put(turn("i think node A looks the weakest"), {"n": "closest"})
+        clock.now = 30
+        cache.put(turn("i think node A looks weak"), {"n": "live"})
+        clock.now = 61
+        self.assertEqual(cache.get(turn("i think node A looks weakest")), {"n": "live"})
+        self.assertEqual(cache.stats()["expirations"], 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_exact_strategy_ignores_similar_input(self):
+        cache = ResponseCache(strategy="exact")
+        cache.put(turn("I think node A looks weakest"), REPLY)
+        self.assertIsNone(cache.get(turn("i think node A looks the weakest")))
+
+    def test_hit_rate(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+        cache.get(turn())
+        cache.put(turn(), REPLY)
+        cache.get(turn())
+        cache.get(turn())
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["exact_hits"], stats["misses"]), (2, 2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
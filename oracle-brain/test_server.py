@@ -0,0 +1,144 @@
+"""
+Unit tests for server.py (REST API: shared Claude client, prompt caching,
+usage logging, streaming endpoint, response cache)
+
+Run:  python3 -m pytest test_server.py -v
+"""
+
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+import server
+
+# ── Load shared fixtures once ─────────────────────────────────────────────────
+
+MOCK_DIR = Path(__file__).parent.parent / "mock-data"
+CONTRACT2 = json.loads((MOCK_DIR / "context_payload.json").read_text())
+CONTRACT3 = json.loads((MOCK_DIR / "oracle_response.json").read_text())
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def make_usage(cache_read: int = 0, cache_write: int = 0):
+    return MagicMock(
+        input_tokens=120,
+        output_tokens=90,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=cache_write,
+    )
+
+
+def make_anthropic_response(text: str, usage=None):
+    """Build a minimal fake anthropic Message object."""
+    block = MagicMock()
+    block.text = text
+    msg = MagicMock()
+    msg.content = [block]
+    msg.usage = usage or make_usage()
+    return msg
+
+
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        patches = [
+            patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}),
+            patch.dict(server._usage, {k: 0 for k in server._usage}),
+            patch.object(server, "_client", None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        anthropic_patch = patch("server.anthropic.AsyncAnthropic")
+        self.MockAnthropic = anthropic_patch.start()
+        self.addCleanup(anthropic_patch.stop)
+        self.create = self.MockAnthropic.return_value.messages.create = AsyncMock(
+            return_value=make_anthropic_response(json.dumps(CONTRACT3))
+        )
+        self.MockAnthropic.return_value.close = AsyncMock()
+
+
+# ── call_claude ───────────────────────────────────────────────────────────────
+
+class TestCallClaude(ServerTestCase):
+
+    async def test_client_is_created_once_and_reused(self):
+        await server.call_claude(CONTRACT2)
+        await server.call_claude(CONTRACT2)
+        self.assertEqual(self.MockAnthropic.call_count, 1)
+        self.assertEqual(self.create.await_count, 2)
+
+    async def test_system_prompt_is_sent_with_cache_control(self):
+        result = await server.call_claude(CONTRACT2)
+        self.assertEqual(result, CONTRACT3)
+        system = self.create.call_args.kwargs["system"]
+        self.assertEqual(system[0]["text"], server.SYSTEM_PROMPT)
+        self.assertEqual(system[0]["cache_control"], {"type": "ephemeral"})
+
+    async def test_cache_usage_is_counted(self):
+        self.create.side_effect = [
+            make_anthropic_response(json.dumps(CONTRACT3), make_usage(cache_write=4000)),
+            make_anthropic_response(json.dumps(CONTRACT3), make_usage(cache_read=4000)),
+        ]
+        with self.assertLogs("oracle-brain", "INFO") as logs:
+            await server.call_claude(CONTRACT2)
+            await server.call_claude(CONTRACT2)
+        usage_lines = [line for line in logs.output if "usage" in line]
+        self.assertIn("cache=write", usage_lines[0])
+        self.assertIn("cache=hit", usage_lines[1])
+        self.assertEqual(server._usage["calls"], 2)
+        self.assertEqual(server._usage["cache_hits"], 1)
+        self.assertEqual(server._usage["cache_read_input_tokens"], 4000)
+        self.assertEqual(server._usage["cache_creation_input_tokens"], 4000)
+
+
+# ── App lifespan / endpoints ──────────────────────────────────────────────────
+
+class TestApp(ServerTestCase):
+
+    def test_lifespan_creates_and_closes_the_client(self):
+        with patch.object(server, "MOCK_MODE", False):
+            with TestClient(server.app) as client:
+                self.assertEqual(self.MockAnthropic.call_count, 1)
+                resp = client.post("/api/oracle/respond", json=CONTRACT2)
+                self.assertEqual(resp.json(), CONTRACT3)
+                self.assertEqual(client.get("/health").json()["usage"]["calls"], 1)
+        self.MockAnthropic.return_value.close.assert_awaited_once()
+        self.assertIsNone(server._client)
+
+    def test_stream_endpoint_in_mock_mode_returns_the_canned_response(self):
+        with patch.object(server, "MOCK_MODE", True):
+            with TestClient(server.app) as client:
+                resp = client.post("/api/oracle/respond/stream", json=CONTRACT2)
+        self.assertEqual(json.loads(resp.text), server.MOCK_RESPONSE)
+        self.MockAnthropic.assert_not_called()
+
+    def test_response_cache_hit_skips_claude(self):
+        cache = server.ResponseCache()
+        with patch.object(server, "MOCK_MODE", False), patch.object(server, "response_cache", cache):
+            with TestClient(server.app) as client:
+                first = client.post("/api/oracle/respond", json=CONTRACT2).json()
+                again = client.post("/api/oracle/respond/stream", json=CONTRACT2)
+                stats = client.get("/health").json()["response_cache"]
+        self.assertEqual(json.loads(again.text), first)
+        self.assertEqual(self.create.await_count, 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_phase_advancing_reply_is_not_cached(self):
+        reply = {**CONTRACT3, "game_update": {**CONTRACT3["game_update"], "advance_phase": True}}
+        self.create.return_value = make_anthropic_response(json.dumps(reply))
+        cache = server.ResponseCache()
+        with patch.object(server, "MOCK_MODE", False), patch.object(server, "response_cache", cache):
+            with TestClient(server.app) as client:
+                client.post("/api/oracle/respond", json=CONTRACT2)
+                client.post("/api/oracle/respond", json=CONTRACT2)
+        self.assertEqual(self.create.await_count, 2)
+        self.assertEqual(cache.stats()["uncacheable"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
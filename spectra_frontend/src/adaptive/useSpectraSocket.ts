@@ -5,7 +5,7 @@ type Dispatch = (msg: any) => void;
 
 // ===== WS message shapes (frontend expects these) =====
 export type WsInbound =
-  | { type: "ui_update"; data: UiCommands }
+  | { type: "ui_update"; data: UiCommands; version?: number }
   | { type: "timer_tick"; time_remaining: number }
   | { type: "phase_change"; phase: Phase }
   | { type: "oracle_said"; text: string; voice_style: OracleResponse["voice_style"] }
@@ -15,7 +15,11 @@ export type WsInbound =
   // optional: backend can push timeline points live too
   | { type: "timeline_point"; data: { t: number; phase: Phase; stress: number; focus: number; adaptation?: string | null } };
 
+// delta-encoded ui_update (only when VITE_WS_UI_DELTA=true); applied here, not in the reducer
+type WsUiDelta = { type: "ui_delta"; version: number; base_version: number; changes: Partial<UiCommands> };
+
 type WsOutbound =
+  | { type: "ui_sync"; version: number }
   | { type: "player_speech"; text: string }
   | { type: "emotion_data"; data: EmotionContract1 }
   | { type: "client_event"; name: string; payload?: any };
@@ -28,6 +32,11 @@ function getWsBaseUrl() {
   return env ?? "ws://localhost:8000";
 }
 
+function uiDeltaEnabled() {
+  // VITE_WS_UI_DELTA=true → backend sends only changed ui fields (ui_delta)
+  return (import.meta as any).env?.VITE_WS_UI_DELTA === "true";
+}
+
 // ===== type guards =====
 function isObject(v: unknown): v is Record<string, any> {
   return !!v && typeof v === "object";
@@ -68,6 +77,8 @@ export function useSpectraSocket(opts: {
   const wsRef = useRef<WebSocket | null>(null);
   const retryRef = useRef<number>(0);
   const closedByUsRef = useRef(false);
+  // last UI as sent by the backend (reducer ui also moves with emotion_update)
+  const serverUiRef = useRef<{ version: number; ui: UiCommands | null }>({ version: 0, ui: null });
 
   const wsUrl = useMemo(() => {
     const base = getWsBaseUrl();
@@ -90,6 +101,10 @@ export function useSpectraSocket(opts: {
         retryRef.current = 0;
         console.log("[WS] connected →", wsUrl);
         dispatch({ type: "connected" });
+        if (uiDeltaEnabled()) {
+          // opt in; backend answers with a full ui_update if we are behind
+          ws.send(JSON.stringify({ type: "ui_sync", version: serverUiRef.current.version }));
+        }
       };
 
       ws.onclose = () => {
@@ -116,9 +131,14 @@ export function useSpectraSocket(opts: {
         try {
           const raw = JSON.parse(evt.data);
           console.log("[WS ← backend]", raw);
-          if (raw?.type === "oracle_speech") {
+          if (raw?.type === "ui_delta") {
+            applyUiDelta(ws, raw as WsUiDelta);
+          } else if (raw?.type === "oracle_speech") {
             dispatch({ type: "oracle_said", text: raw.text, voice_style: raw.voice_style ?? "neutral" });
           } else if (isWsInbound(raw)) {
+            if (raw.type === "ui_update" && typeof raw.version === "number") {
+              serverUiRef.current = { version: raw.version, ui: raw.data };
+            }
             dispatch(raw);
           } else {
             console.warn("[WS ← backend] unknown message type:", raw?.type, raw);
@@ -129,6 +149,18 @@ export function useSpectraSocket(opts: {
       };
     };
 
+    const applyUiDelta = (ws: WebSocket, msg: WsUiDelta) => {
+      const cur = serverUiRef.current;
+      if (msg.base_version !== cur.version || (cur.ui === null && msg.base_version !== 0)) {
+        console.warn("[WS ← backend] ui_delta version mismatch, resyncing:", cur.version, msg);
+        ws.send(JSON.stringify({ type: "ui_sync", version: cur.version }));
+        return;
+      }
+      const ui = { ...(cur.ui ?? {}), ...msg.changes } as UiCommands;
+      serverUiRef.current = { version: msg.version, ui };
+      dispatch({ type: "ui_update", data: ui });
+    };
+
     connect();
 
     return () => {
@@ -21,7 +21,9 @@ export function Debrief() {
 
     async function fetchTimeline() {
       try {
-        const res = await fetch(`${API_BASE}/api/timeline/${sessionId}`);
+        // min-max downsampling keeps the stress / focus peaks and every
+        // adaptation point the summary below relies on.
+        const res = await fetch(`${API_BASE}/api/timeline/${sessionId}?max_points=600&method=minmax`);
         if (res.ok) {
           const data = await res.json();
           if (!cancelled && Array.isArray(data) && data.length > 0) {